@@ -4,8 +4,15 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from app.routes import search, works
+from fastapi.responses import JSONResponse
+
+from app.routes import metrics, search, works
+from app.services.chroma_client import get_chroma_executor
+from app.services.embeddings import close_embedding_service
+from app.services.exa_client import close_http_client, get_cache
+from app.services.metrics import TimedJSONResponse
+from app.services.warmup import get_warmup
+from app.services.work_texts import close_text_store
 from app.settings import get_settings
 
 # Configure logging
@@ -25,6 +32,7 @@ def create_app() -> FastAPI:
         title="Aozora RAG Search API",
         description="Search API for Aozora Bunko RAG system",
         version="0.1.0",
+        default_response_class=TimedJSONResponse,
     )
 
     # Configure CORS
@@ -39,16 +47,40 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(search.router)
     app.include_router(works.router)
+    app.include_router(metrics.router)
 
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
         return {"status": "healthy"}
 
+    @app.get("/ready")
+    async def readiness_check():
+        """Readiness endpoint: 503 until the startup warmup has finished."""
+        warmup = get_warmup()
+        return JSONResponse(warmup.report(), status_code=200 if warmup.ready else 503)
+
     @app.on_event("startup")
     async def startup_event():
         logger.info("Starting Aozora RAG Search API")
         logger.info(f"ChromaDB path: {settings.chroma_path}")
+        logger.info(f"Vector backend: {settings.vector_backend}")
+
+        # Load the vector index, works catalog and BM25 index in the background
+        # instead of on first request; /ready reports when this is done
+        get_warmup().start()
+
+        # Expire old web search results in the background
+        get_cache().start_purger(settings.exa_cache_purge_interval_seconds)
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        get_warmup().stop()
+        get_chroma_executor().shutdown()
+        await close_http_client()
+        await close_embedding_service()
+        get_cache().close()
+        close_text_store()
 
     return app
 
@@ -0,0 +1,62 @@
+"""Prometheus metrics route."""
+
+from typing import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from app.services.chroma_client import get_chroma_executor
+from app.services.embeddings import get_embedding_service
+from app.services.exa_client import get_cache
+from app.services.metrics import REGISTRY
+from app.services.search_orchestrator import get_search_cache
+from app.services.text_cache import get_text_cache
+
+router = APIRouter(tags=["metrics"])
+
+
+class ServiceStatsCollector(Collector):
+    """Reports the cache and executor counters kept by the services at scrape time."""
+
+    def collect(self) -> Iterable[Metric]:
+        hits = CounterMetricFamily("aozora_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("aozora_cache_misses", "Cache misses", labels=["cache"])
+        embeddings = get_embedding_service()
+        caches = {
+            "search": get_search_cache().stats(),
+            "exa": get_cache().stats(),
+            "work_text": get_text_cache().stats(),
+            "embedding": embeddings.stats() if embeddings else None,
+        }
+        for cache, stats in caches.items():
+            if stats is not None:
+                hits.add_metric([cache], stats["hits"])
+                misses.add_metric([cache], stats["misses"])
+
+        executor = get_chroma_executor()
+        stats = executor.stats()
+        queued = GaugeMetricFamily(
+            "aozora_executor_queued", "Calls waiting for a worker", labels=["executor"]
+        )
+        queued.add_metric([executor.name], stats["queued"])
+        active = GaugeMetricFamily(
+            "aozora_executor_active", "Calls running on a worker", labels=["executor"]
+        )
+        active.add_metric([executor.name], stats["active"])
+        rejected = CounterMetricFamily(
+            "aozora_executor_rejected", "Calls rejected by a full queue", labels=["executor"]
+        )
+        rejected.add_metric([executor.name], stats["rejected"])
+        return [hits, misses, queued, active, rejected]
+
+
+REGISTRY.register(ServiceStatsCollector())
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics() -> Response:
+    """Metrics in the Prometheus text exposition format."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,9 +1,30 @@
 """Search API route."""
 
+import asyncio
+import time
+from typing import AsyncIterator
+
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
-from app.schemas import SearchRequest, SearchResponse
-from app.services.search_orchestrator import run_parallel_search
+from app.schemas import SearchBatchRequest, SearchBatchResponse, SearchRequest, SearchResponse
+from app.services.chroma_client import get_chroma_executor
+from app.services.context_packing import pack_results
+from app.services.embeddings import get_embedding_service
+from app.services.lexical_index import get_lexical_index
+from app.services.metrics import SERIALIZATION_SECONDS
+from app.services.search_orchestrator import (
+    get_search_cache,
+    iter_cached_source_results,
+    run_batch_search,
+    run_cached_search,
+)
+from app.services.search_scope import SearchScope
+from app.services.slow_query_log import get_slow_query_log
+from app.services.timings import RequestTimings, count_results, stage, start_timings
+from app.services.work_texts import attach_context, attach_context_batch
+from app.utils.query import normalize_query
 
 router = APIRouter(prefix="/api", tags=["search"])
 
@@ -15,18 +36,191 @@ async def search(request: SearchRequest) -> SearchResponse:
 
     Returns combined results with internal sources prioritized.
     """
-    results = await run_parallel_search(
+    timings = start_timings()
+    results = await run_cached_search(
         query=request.query,
         k_internal=request.k_internal,
         k_web=request.k_web,
         include_web=request.include_web,
         timeout_ms=request.timeout_ms,
+        search_mode=request.search_mode,
+        scope=SearchScope.create(request.authors, request.work_ids),
     )
 
-    return SearchResponse(
-        query=request.query,
-        aozora_results=results.aozora_results,
-        web_results=results.web_results,
-        timing_ms=results.timing_ms,
-        errors=results.errors,
+    count_results("aozora", len(results.aozora_results))
+    count_results("web", len(results.web_results))
+
+    packed_context = None
+    if request.context_token_budget:
+        with stage("context_packing"):
+            packed_context = await pack_results(
+                results.aozora_results, request.context_token_budget, request.include_context
+            )
+    with stage("context_attach"):
+        aozora_results = await attach_context(results.aozora_results, request.include_context)
+
+    with stage("response_build"):
+        response = SearchResponse(
+            query=request.query,
+            aozora_results=aozora_results,
+            web_results=results.web_results,
+            timing_ms=results.timing_ms,
+            errors=results.errors,
+            packed_context=packed_context,
+        )
+    await _log_if_slow("search", request, timings, results.errors)
+    if request.debug_timings:
+        response.debug_timings = timings.report()
+    return response
+
+
+@router.post("/search/stream")
+async def search_stream(request: SearchRequest) -> StreamingResponse:
+    """
+    Search both sources, streaming each source's results as NDJSON.
+
+    Emits one {"event": "aozora" | "web", ...} line per source as soon as it
+    finishes (followed by a {"event": "context", ...} line with the packed
+    Aozora context when context_token_budget is set), then a final
+    {"event": "done", ...} line, carrying debug_timings if requested.
+    Sources that miss the deadline are reported in errors without
+    discarding the others, and outstanding searches are cancelled if the
+    client disconnects.
+    """
+    return StreamingResponse(
+        _stream_search_events(request),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_search_events(request: SearchRequest) -> AsyncIterator[bytes]:
+    """Produce the NDJSON lines for a streaming search."""
+    start_time = time.time()
+    timings = start_timings()
+    errors: list[str] = []
+
+    async for outcome in iter_cached_source_results(
+        request.query,
+        k_internal=request.k_internal,
+        k_web=request.k_web,
+        include_web=request.include_web,
+        timeout_ms=request.timeout_ms,
+        search_mode=request.search_mode,
+        scope=SearchScope.create(request.authors, request.work_ids),
+    ):
+        if outcome.error:
+            errors.append(outcome.error)
+        count_results(outcome.source, len(outcome.results))
+        results = outcome.results
+        if outcome.source == "aozora":
+            with stage("context_attach"):
+                results = await attach_context(outcome.results, request.include_context)
+        yield _event(
+            outcome.source,
+            results=results,
+            timing_ms=outcome.elapsed_ms,
+            error=outcome.error,
+        )
+        if outcome.source == "aozora" and request.context_token_budget:
+            with stage("context_packing"):
+                packed = await pack_results(
+                    outcome.results, request.context_token_budget, request.include_context
+                )
+            yield _event("context", **packed.model_dump(mode="json"))
+
+    timing_ms = int((time.time() - start_time) * 1000)
+    await _log_if_slow("stream", request, timings, errors)
+    debug = {"debug_timings": timings.report().model_dump()} if request.debug_timings else {}
+    yield _event("done", query=request.query, timing_ms=timing_ms, errors=errors, **debug)
+
+
+async def _log_if_slow(
+    endpoint: str, request: SearchRequest, timings: RequestTimings, errors: list[str]
+) -> None:
+    """Append the search to the slow query log if it took longer than the threshold."""
+    log = get_slow_query_log()
+    if log is None or not log.is_slow(timings.elapsed_ms):
+        return
+    entry = {
+        "endpoint": endpoint,
+        "query": normalize_query(request.query),
+        "params": request.model_dump(mode="json", exclude={"query", "debug_timings"}),
+        **timings.report().model_dump(),
+        "errors": errors,
+    }
+    await asyncio.to_thread(log.record, entry)
+
+
+def _event(event: str, **fields) -> bytes:
+    """Serialize one NDJSON event line."""
+    with SERIALIZATION_SECONDS.labels(kind="stream").time():
+        if "results" in fields:
+            fields["results"] = [item.model_dump(mode="json") for item in fields["results"]]
+        return orjson.dumps({"event": event, **fields}) + b"\n"
+
+
+@router.post("/search/batch", response_model=SearchBatchResponse)
+async def search_batch(request: SearchBatchRequest) -> SearchBatchResponse:
+    """
+    Run many searches at once.
+
+    All queries are embedded together and sent to Chroma as one request,
+    with web searches running concurrently.
+    """
+    start_time = time.time()
+    results = await run_batch_search(
+        queries=request.queries,
+        k_internal=request.k_internal,
+        k_web=request.k_web,
+        include_web=request.include_web,
+        timeout_ms=request.timeout_ms,
+        search_mode=request.search_mode,
+        scope=SearchScope.create(request.authors, request.work_ids),
+    )
+    aozora_results = await attach_context_batch(
+        [r.aozora_results for r in results], request.include_context
+    )
+    packed_contexts = [None] * len(results)
+    budget = request.context_token_budget
+    if budget:
+        packed_contexts = await asyncio.gather(
+            *(pack_results(r.aozora_results, budget, request.include_context) for r in results)
+        )
+
+    return SearchBatchResponse(
+        results=[
+            SearchResponse(
+                query=query,
+                aozora_results=aozora,
+                web_results=r.web_results,
+                timing_ms=r.timing_ms,
+                errors=r.errors,
+                packed_context=packed,
+            )
+            for query, r, aozora, packed in zip(
+                request.queries, results, aozora_results, packed_contexts
+            )
+        ],
+        timing_ms=int((time.time() - start_time) * 1000),
     )
+
+
+@router.get("/search/stats")
+async def search_stats() -> dict:
+    """Get queue-depth and cache counters for the search backends."""
+    embeddings = get_embedding_service()
+    return {
+        "chroma_executor": get_chroma_executor().stats(),
+        "embeddings": embeddings.stats() if embeddings else None,
+        "search_cache": get_search_cache().stats(),
+        "lexical_index": _lexical_stats(),
+    }
+
+
+def _lexical_stats() -> dict:
+    """Get the lexical index size, or its build state."""
+    index = get_lexical_index().index
+    if index is None:
+        return {"ready": False}
+    return {"ready": True, "chunks": len(index), "size_bytes": index.size_bytes}
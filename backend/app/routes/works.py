@@ -1,13 +1,22 @@
 """Works API route for retrieving work list and text content."""
 
+import asyncio
 import logging
-import re
-from functools import lru_cache
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from app.schemas import (
+    WorkItem,
+    WorkListResponse,
+    WorkSuggestion,
+    WorkSuggestResponse,
+    WorkTextRangeResponse,
+    WorkTextResponse,
+)
+from app.services.metrics import CLEANING_SECONDS, WORK_TEXT_READ_SECONDS
+from app.services.text_cache import CachedText, get_text_cache
+from app.services.works_catalog import CatalogEntry, WorksCatalog, get_catalog
 from app.settings import get_settings
 from app.utils.aozora import (
     clean_aozora_text,
@@ -19,121 +28,80 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/works", tags=["works"])
 
 
-class WorkItem(BaseModel):
-    """A single work item."""
-
-    work_id: str
-    title: str
-    author: str
-    source_path: str
-
-
-class WorkListResponse(BaseModel):
-    """Response for work list."""
-
-    works: list[WorkItem]
-    total: int
-
-
-class WorkTextResponse(BaseModel):
-    """Response for work full text."""
-
-    work_id: str
-    title: str
-    author: str
-    text: str
-
-
 def get_aozora_repo_path() -> Path:
     """Get path to aozora repository."""
     settings = get_settings()
     return Path(settings.aozora_repo_path).resolve()
 
 
-def extract_work_info(filepath: Path) -> dict | None:
-    """Extract work metadata from filepath and content."""
-    parts = filepath.parts
-    try:
-        # Find cards index
-        parts.index("cards")
-
-        # Extract work_id from filename (e.g., "1234_ruby_12345.txt")
-        filename = filepath.stem
-        match = re.match(r"(\d+)", filename)
-        if not match:
-            return None
-        work_id = match.group(1)
-
-        # Read file to get title/author
-        try:
-            content = read_aozora_file(filepath)
-            title, author = extract_title_author(content)
-
-            if title == "不明":
-                return None  # Skip files without proper title
-
-        except Exception:
-            # Skip files that can't be read (corrupted ZIP, XML, etc.)
-            return None
-
-        return {
-            "work_id": work_id,
-            "title": title,
-            "author": author,
-            "source_path": str(filepath),
-        }
-
-    except (ValueError, IndexError):
-        return None
-
-
-def find_text_files(repo_path: Path) -> list[Path]:
-    """Find all text/zip files in the Aozora repository."""
-    cards_dir = repo_path / "cards"
-    if not cards_dir.exists():
-        return []
-
-    text_files = []
-
-    # Find both .txt and .zip files
-    for pattern in ["**/files/*.txt", "**/files/*_ruby*.zip", "**/files/*_txt*.zip"]:
-        for file in cards_dir.glob(pattern):
-            # Skip certain patterns
-            filename = file.name.lower()
-            if any(skip in filename for skip in ["readme", "index", "copyright"]):
-                continue
-            text_files.append(file)
-
-    return text_files
-
+async def get_loaded_catalog() -> WorksCatalog:
+    """
+    Get the works catalog without blocking on its initial build.
 
-@lru_cache(maxsize=1)
-def get_all_works() -> list[WorkItem]:
-    """Get all works with caching and deduplication."""
-    repo_path = get_aozora_repo_path()
-    if not repo_path.exists():
-        return []
-
-    text_files = find_text_files(repo_path)
-    logger.info(f"Found {len(text_files)} text files, extracting metadata...")
-
-    # Use dict to deduplicate by work_id
-    works_map: dict[str, WorkItem] = {}
-    for i, filepath in enumerate(text_files):
-        if i % 1000 == 0 and i > 0:
-            logger.info(f"Processed {i}/{len(text_files)} files...")
-        info = extract_work_info(filepath)
-        if info:
-            work_id = info["work_id"]
-            # Keep first occurrence (prefer _ruby over _txt)
-            if work_id not in works_map:
-                works_map[work_id] = WorkItem(**info)
-
-    works = list(works_map.values())
-    # Sort by title
-    works.sort(key=lambda w: w.title)
-    logger.info(f"Loaded {len(works)} unique works")
-    return works
+    The catalog is built by a background warmup started at app startup.
+    Until it finishes, the previously persisted listing is served; with no
+    persisted listing a 503 tells the client to retry.
+    """
+    catalog = get_catalog()
+    if not catalog.ready:
+        catalog.start_warmup()
+        if not catalog.works:
+            raise HTTPException(
+                status_code=503,
+                detail="Works catalog is warming up",
+                headers={"Retry-After": "5"},
+            )
+    elif catalog.needs_revalidation():
+        await asyncio.to_thread(catalog.revalidate)
+    return catalog
+
+
+def to_work_item(catalog: WorksCatalog, entry: CatalogEntry) -> WorkItem:
+    """Convert a catalog entry to an API work item."""
+    return WorkItem(
+        work_id=entry.work_id,
+        title=entry.title,
+        author=entry.author,
+        source_path=str(catalog.absolute_path(entry)),
+    )
+
+
+def make_etag(entry: CatalogEntry) -> str:
+    """Build an ETag from the source file's identity, size and mtime."""
+    return f'"{entry.work_id}-{entry.rank}-{entry.size:x}-{entry.mtime_ns:x}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def load_cleaned_text(catalog: WorksCatalog, entry: CatalogEntry) -> CachedText:
+    """Read and clean a work's text, going through the text cache."""
+    cache = get_text_cache()
+    key = (entry.path, entry.size, entry.mtime_ns)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    with WORK_TEXT_READ_SECONDS.labels(source="file").time():
+        raw_text = read_aozora_file(catalog.absolute_path(entry), encoding=entry.encoding)
+    title, author = extract_title_author(raw_text)
+    with CLEANING_SECONDS.time():
+        text = clean_aozora_text(raw_text)
+    cached = CachedText(
+        work_id=entry.work_id,
+        title=title or f"Work {entry.work_id}",
+        author=author or "Unknown",
+        text=text,
+        etag=make_etag(entry),
+    )
+    cache.put(key, cached)
+    return cached
 
 
 @router.get("", response_model=WorkListResponse)
@@ -143,62 +111,163 @@ async def list_works(
     q: str | None = Query(None, description="Search query for title or author"),
 ) -> WorkListResponse:
     """
-    Get list of all works from the filesystem.
+    Get list of all works from the works catalog.
     Supports optional search query to filter by title or author.
     """
-    works = get_all_works()
+    catalog = await get_loaded_catalog()
+    works, index = catalog.listing()
     if not works:
         raise HTTPException(status_code=503, detail="No works available")
 
     # Filter by search query if provided
     if q:
-        q_lower = q.lower()
-        works = [
-            w
-            for w in works
-            if q_lower in w.title.lower() or q_lower in w.author.lower()
-        ]
-
-    total = len(works)
-    paginated = works[offset : offset + limit]
+        positions = index.search(q)
+        total = len(positions)
+        paginated = [to_work_item(catalog, works[p]) for p in positions[offset : offset + limit]]
+    else:
+        total = len(works)
+        paginated = [to_work_item(catalog, w) for w in works[offset : offset + limit]]
 
     return WorkListResponse(works=paginated, total=total)
 
 
-@router.get("/{work_id}/text", response_model=WorkTextResponse)
-async def get_work_text(work_id: str) -> WorkTextResponse:
-    """Get the full text of a work by work_id."""
+@router.get("/suggest", response_model=WorkSuggestResponse)
+async def suggest_works(
+    q: str = Query(..., min_length=1, description="Title or author prefix"),
+    limit: int = Query(10, ge=1, le=50),
+) -> WorkSuggestResponse:
+    """Autocomplete titles and authors by prefix."""
+    catalog = await get_loaded_catalog()
+    works, index = catalog.listing()
+    suggestions = [
+        WorkSuggestion(
+            text=s.text,
+            kind=s.kind,
+            work_count=s.work_count,
+            work_id=works[s.position].work_id if s.work_count == 1 else None,
+        )
+        for s in index.suggest(q, limit=limit)
+    ]
+    return WorkSuggestResponse(query=q, suggestions=suggestions)
+
+
+@router.get("/cache/stats")
+async def text_cache_stats() -> dict:
+    """Get cleaned-text cache counters."""
+    return get_text_cache().stats()
+
+
+async def resolve_entry(work_id: str) -> tuple[WorksCatalog, CatalogEntry]:
+    """Resolve a work_id to its catalog entry or raise an HTTP error."""
     repo_path = get_aozora_repo_path()
     if not repo_path.exists():
         raise HTTPException(status_code=503, detail="Aozora repository not found")
 
-    # Find the file matching this work_id
-    text_files = find_text_files(repo_path)
-    target_file = None
-
-    for filepath in text_files:
-        filename = filepath.stem
-        match = re.match(r"(\d+)", filename)
-        if match and match.group(1) == work_id:
-            target_file = filepath
-            break
-
-    if not target_file:
+    catalog = await get_loaded_catalog()
+    entry = catalog.get(work_id)
+    if not entry:
+        if not catalog.ready:
+            raise HTTPException(
+                status_code=503,
+                detail="Works catalog is warming up",
+                headers={"Retry-After": "5"},
+            )
         raise HTTPException(status_code=404, detail=f"Work {work_id} not found")
+    return catalog, entry
 
-    try:
-        raw_text = read_aozora_file(target_file)
-        clean_text = clean_aozora_text(raw_text)
-        title, author = extract_title_author(raw_text)
-
-        return WorkTextResponse(
-            work_id=work_id,
-            title=title or f"Work {work_id}",
-            author=author or "Unknown",
-            text=clean_text,
-        )
 
+async def read_cleaned_text(
+    catalog: WorksCatalog, entry: CatalogEntry, work_id: str
+) -> CachedText:
+    """Load a work's cleaned text off the event loop, mapping errors to HTTP errors."""
+    try:
+        try:
+            return await asyncio.to_thread(load_cleaned_text, catalog, entry)
+        except FileNotFoundError:
+            # The repository changed under us; rescan and resolve again
+            await asyncio.to_thread(catalog.revalidate, True)
+            entry = catalog.get(work_id)
+            if not entry:
+                raise HTTPException(status_code=404, detail=f"Work {work_id} not found")
+            return await asyncio.to_thread(load_cleaned_text, catalog, entry)
+
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading work: {e}")
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 response for an unchanged text."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@router.get("/{work_id}/text", response_model=WorkTextResponse)
+async def get_work_text(work_id: str, request: Request, response: Response):
+    """
+    Get the full text of a work by work_id.
+
+    Responses carry an ETag derived from the source file's size and mtime;
+    a matching If-None-Match is answered with 304 without reading the file.
+    """
+    catalog, entry = await resolve_entry(work_id)
+    if etag_matches(request.headers.get("if-none-match"), make_etag(entry)):
+        return not_modified(make_etag(entry))
+
+    cached = await read_cleaned_text(catalog, entry, work_id)
+
+    response.headers["ETag"] = cached.etag
+    response.headers["Cache-Control"] = "no-cache"
+    return WorkTextResponse(
+        work_id=work_id,
+        title=cached.title,
+        author=cached.author,
+        text=cached.text,
+    )
+
+
+@router.get("/{work_id}/text/range", response_model=WorkTextRangeResponse)
+async def get_work_text_range(
+    work_id: str,
+    request: Request,
+    response: Response,
+    start: int = Query(..., ge=0, description="Start offset in cleaned text"),
+    end: int = Query(..., ge=0, description="End offset in cleaned text"),
+    padding: int = Query(
+        0, ge=0, le=20000, description="Characters of context on each side, snapped to sentences"
+    ),
+):
+    """
+    Get a slice of a work's cleaned text around a search hit.
+
+    Offsets use the same coordinates as offset_start/offset_end of search
+    results, so citation previews don't need to download the whole work.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must be greater than or equal to start")
+
+    catalog, entry = await resolve_entry(work_id)
+    if etag_matches(request.headers.get("if-none-match"), make_etag(entry)):
+        return not_modified(make_etag(entry))
+
+    cached = await read_cleaned_text(catalog, entry, work_id)
+    index = cached.sentences
+    offset_start = min(start, index.length)
+    offset_end = min(max(end, offset_start), index.length)
+    window_start, window_end = index.window(offset_start, offset_end, padding)
+
+    response.headers["ETag"] = cached.etag
+    response.headers["Cache-Control"] = "no-cache"
+    return WorkTextRangeResponse(
+        work_id=work_id,
+        title=cached.title,
+        author=cached.author,
+        text=cached.text[window_start:window_end],
+        window_start=window_start,
+        window_end=window_end,
+        offset_start=offset_start,
+        offset_end=offset_end,
+        total_length=index.length,
+    )
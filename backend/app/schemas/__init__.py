@@ -1,15 +1,43 @@
 """API Schemas."""
 
 from .search import (
+    ContextPassage,
+    DebugTimings,
+    PackedContext,
+    SearchBatchRequest,
+    SearchBatchResponse,
+    SearchMode,
     SearchRequest,
     SearchResponse,
     SearchResultItem,
     SourceType,
+    StageTiming,
+)
+from .works import (
+    WorkItem,
+    WorkListResponse,
+    WorkSuggestion,
+    WorkSuggestResponse,
+    WorkTextRangeResponse,
+    WorkTextResponse,
 )
 
 __all__ = [
+    "ContextPassage",
+    "DebugTimings",
+    "PackedContext",
+    "SearchBatchRequest",
+    "SearchBatchResponse",
+    "SearchMode",
     "SearchRequest",
     "SearchResponse",
     "SearchResultItem",
     "SourceType",
+    "StageTiming",
+    "WorkItem",
+    "WorkListResponse",
+    "WorkSuggestion",
+    "WorkSuggestResponse",
+    "WorkTextRangeResponse",
+    "WorkTextResponse",
 ]
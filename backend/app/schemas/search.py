@@ -1,7 +1,7 @@
 """Search API schemas."""
 
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +13,14 @@ class SourceType(str, Enum):
     WEB = "web"
 
 
+class SearchMode(str, Enum):
+    """Retrieval mode for Aozora results."""
+
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
+
+
 class SearchResultItem(BaseModel):
     """A single search result item."""
 
@@ -27,7 +35,9 @@ class SearchResultItem(BaseModel):
     work_id: Optional[str] = Field(None, description="Work ID (for aozora)")
     offset_start: Optional[int] = Field(None, description="Start offset in text")
     offset_end: Optional[int] = Field(None, description="End offset in text")
-    context_text: Optional[str] = Field(None, description="Expanded context (2000 tokens)")
+    context_text: Optional[str] = Field(
+        None, description="Expanded context (2000 tokens), rebuilt from the work text store"
+    )
 
     # Web-specific fields
     url: Optional[str] = Field(None, description="URL (for web)")
@@ -42,6 +52,99 @@ class SearchRequest(BaseModel):
     k_web: int = Field(3, description="Number of web results", ge=0, le=10)
     include_web: bool = Field(True, description="Include web search results")
     timeout_ms: Optional[int] = Field(None, description="Custom timeout in milliseconds")
+    search_mode: SearchMode = Field(
+        SearchMode.HYBRID, description="Vector, lexical (BM25) or hybrid retrieval"
+    )
+    include_context: bool = Field(True, description="Include context_text for Aozora results")
+    authors: Optional[list[str]] = Field(
+        None, description="Only search works by these authors", max_length=100
+    )
+    work_ids: Optional[list[str]] = Field(
+        None, description="Only search these works", max_length=100
+    )
+    context_token_budget: Optional[int] = Field(
+        None,
+        description="Pack Aozora hits into a context of at most this many tokens",
+        ge=100,
+        le=100000,
+    )
+    debug_timings: bool = Field(
+        False, description="Include a per-stage timing breakdown in the response"
+    )
+
+
+class SearchBatchRequest(BaseModel):
+    """Batch search request payload."""
+
+    queries: list[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(
+        ..., description="Search queries", min_length=1, max_length=256
+    )
+    k_internal: int = Field(5, description="Number of internal results per query", ge=1, le=20)
+    k_web: int = Field(3, description="Number of web results per query", ge=0, le=10)
+    include_web: bool = Field(True, description="Include web search results")
+    timeout_ms: Optional[int] = Field(None, description="Custom timeout in milliseconds")
+    search_mode: SearchMode = Field(
+        SearchMode.HYBRID, description="Vector, lexical (BM25) or hybrid retrieval"
+    )
+    include_context: bool = Field(True, description="Include context_text for Aozora results")
+    authors: Optional[list[str]] = Field(
+        None, description="Only search works by these authors", max_length=100
+    )
+    work_ids: Optional[list[str]] = Field(
+        None, description="Only search these works", max_length=100
+    )
+    context_token_budget: Optional[int] = Field(
+        None,
+        description="Pack Aozora hits into a context of at most this many tokens",
+        ge=100,
+        le=100000,
+    )
+
+
+class ContextPassage(BaseModel):
+    """A contiguous passage of one work in a packed context."""
+
+    work_id: str = Field(..., description="Work ID")
+    title: str = Field(..., description="Work title")
+    author: str = Field(..., description="Author name")
+    offset_start: int = Field(..., description="Start offset in text")
+    offset_end: int = Field(..., description="End offset in text")
+    text: str = Field(..., description="Passage text")
+    score: float = Field(..., description="Best score among the merged hits")
+    token_count: int = Field(..., description="Estimated tokens, including the heading")
+    chunk_ids: list[str] = Field(default_factory=list, description="Hits merged into it")
+
+
+class PackedContext(BaseModel):
+    """Aozora hits merged into non-overlapping passages within a token budget."""
+
+    text: str = Field(..., description="Ready-to-use context text")
+    passages: list[ContextPassage] = Field(
+        default_factory=list, description="Passages in the order of their best-ranked hit"
+    )
+    token_count: int = Field(..., description="Estimated tokens of text")
+    token_budget: int = Field(..., description="Requested token budget")
+
+
+class StageTiming(BaseModel):
+    """Time spent in one search stage."""
+
+    ms: float = Field(..., description="Summed duration in milliseconds")
+    calls: int = Field(..., description="Number of times the stage ran")
+
+
+class DebugTimings(BaseModel):
+    """Per-stage breakdown of one search."""
+
+    total_ms: int = Field(..., description="Time until the response was built")
+    stages: dict[str, StageTiming] = Field(
+        default_factory=dict,
+        description="Durations by stage; parallel stages (Aozora and web) overlap",
+    )
+    result_counts: dict[str, int] = Field(
+        default_factory=dict, description="Results per source and retriever"
+    )
+    search_cache: Optional[str] = Field(None, description="Result cache outcome: hit or miss")
 
 
 class SearchResponse(BaseModel):
@@ -56,3 +159,18 @@ class SearchResponse(BaseModel):
     )
     timing_ms: int = Field(..., description="Total search time in milliseconds")
     errors: list[str] = Field(default_factory=list, description="Any errors encountered")
+    packed_context: Optional[PackedContext] = Field(
+        None, description="Packed Aozora context, when context_token_budget was set"
+    )
+    debug_timings: Optional[DebugTimings] = Field(
+        None, description="Stage timings, when debug_timings was requested"
+    )
+
+
+class SearchBatchResponse(BaseModel):
+    """Batch search response payload."""
+
+    results: list[SearchResponse] = Field(
+        default_factory=list, description="Per-query results, in request order"
+    )
+    timing_ms: int = Field(..., description="Total batch time in milliseconds")
@@ -0,0 +1,60 @@
+"""Works API schemas."""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class WorkItem(BaseModel):
+    """A single work item."""
+
+    work_id: str
+    title: str
+    author: str
+    source_path: str
+
+
+class WorkListResponse(BaseModel):
+    """Response for work list."""
+
+    works: list[WorkItem]
+    total: int
+
+
+class WorkSuggestion(BaseModel):
+    """A single title/author autocomplete suggestion."""
+
+    text: str
+    kind: Literal["title", "author"]
+    work_count: int = Field(..., description="Number of works with this title/author")
+    work_id: Optional[str] = Field(None, description="Work ID when the suggestion is unique")
+
+
+class WorkSuggestResponse(BaseModel):
+    """Response for work autocomplete."""
+
+    query: str
+    suggestions: list[WorkSuggestion]
+
+
+class WorkTextResponse(BaseModel):
+    """Response for work full text."""
+
+    work_id: str
+    title: str
+    author: str
+    text: str
+
+
+class WorkTextRangeResponse(BaseModel):
+    """Response for a slice of a work's cleaned text."""
+
+    work_id: str
+    title: str
+    author: str
+    text: str
+    window_start: int = Field(..., description="Start offset of the returned text")
+    window_end: int = Field(..., description="End offset of the returned text")
+    offset_start: int = Field(..., description="Requested start offset (clamped)")
+    offset_end: int = Field(..., description="Requested end offset (clamped)")
+    total_length: int = Field(..., description="Length of the full cleaned text")
@@ -1,13 +1,26 @@
-"""ChromaDB client for vector search."""
+"""
+ChromaDB client for vector search.
+
+With VECTOR_BACKEND=memmap, queries go to the exported memory-mapped
+VectorStore instead, behind the same query_similar interface.
+"""
 
 import logging
+import threading
 from functools import lru_cache
 from typing import Optional
 
 import chromadb
+import numpy as np
 from chromadb.api.models.Collection import Collection
 
 from app.schemas import SearchResultItem, SourceType
+from app.services.embeddings import get_embedding_service
+from app.services.executor import BoundedExecutor
+from app.services.metrics import VECTOR_QUERY_SECONDS
+from app.services.scoped_vectors import ScopedVectorCache
+from app.services.timings import stage
+from app.services.vector_store import get_vector_store
 from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -20,16 +33,55 @@ def get_chroma_client() -> chromadb.PersistentClient:
     return chromadb.PersistentClient(path=str(settings.chroma_path))
 
 
+_collection: Optional[Collection] = None
+_collection_lock = threading.Lock()
+
+
 def get_collection() -> Optional[Collection]:
-    """Get the Aozora chunks collection."""
+    """Get the Aozora chunks collection, caching the handle once it exists."""
+    global _collection
+    if _collection is not None:
+        return _collection
+
     settings = get_settings()
-    client = get_chroma_client()
+    with _collection_lock:
+        if _collection is None:
+            client = get_chroma_client()
+            try:
+                _collection = client.get_collection(name=settings.chroma_collection)
+            except Exception as e:
+                logger.warning(f"Collection not found: {e}")
+                return None
+    return _collection
 
-    try:
-        return client.get_collection(name=settings.chroma_collection)
-    except Exception as e:
-        logger.warning(f"Collection not found: {e}")
-        return None
+
+def reset_collection() -> None:
+    """Drop the cached collection handle (e.g. after it was recreated)."""
+    global _collection
+    _collection = None
+    get_scoped_vectors().clear()
+
+
+@lru_cache
+def get_scoped_vectors() -> ScopedVectorCache:
+    """Get the cache of small scopes searched by brute force."""
+    settings = get_settings()
+    return ScopedVectorCache(
+        max_chunks=settings.scoped_bruteforce_max_chunks,
+        max_scopes=settings.scoped_cache_entries,
+        ttl_seconds=settings.scoped_cache_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_chroma_executor() -> BoundedExecutor:
+    """Get the dedicated thread pool for Chroma queries."""
+    settings = get_settings()
+    return BoundedExecutor(
+        name="chroma",
+        max_workers=settings.chroma_query_workers,
+        max_queue=settings.chroma_max_queue,
+    )
 
 
 async def query_similar(
@@ -40,6 +92,10 @@ async def query_similar(
     """
     Query ChromaDB for similar documents.
 
+    The query is embedded with the same model used at ingest (falling back
+    to Chroma's default embedding function if none is configured), then run
+    on the dedicated Chroma thread pool so it doesn't block the event loop.
+
     Args:
         query_text: The search query
         k: Number of results to return
@@ -47,53 +103,178 @@ async def query_similar(
 
     Returns:
         List of SearchResultItem
+
+    Raises:
+        RuntimeError: If the vector index isn't available; query errors
+            are re-raised, so callers can tell an outage from no matches
+    """
+    return (await query_similar_batch([query_text], k=k, where_filter=where_filter))[0]
+
+
+async def query_similar_batch(
+    query_texts: list[str],
+    k: int = 5,
+    where_filter: Optional[dict] = None,
+) -> list[list[SearchResultItem]]:
+    """
+    Query ChromaDB for several queries in one request.
+
+    All queries are embedded in one embedding call and sent to Chroma as a
+    single multi-query request.
+
+    Args:
+        query_texts: The search queries
+        k: Number of results to return per query
+        where_filter: Optional metadata filter applied to every query
+
+    Returns:
+        One list of SearchResultItem per query, in order
     """
+    embeddings = get_embedding_service()
+    query_embeddings = await embeddings.embed_queries(query_texts) if embeddings else None
+    if get_settings().vector_backend == "memmap":
+        if query_embeddings is None:
+            raise RuntimeError("The memmap vector backend needs a query embedding provider")
+        return await get_chroma_executor().run(
+            _query_vector_store_sync, query_embeddings, k, where_filter
+        )
+    return await get_chroma_executor().run(
+        _query_similar_sync, query_texts, k, where_filter, query_embeddings
+    )
+
+
+def _query_vector_store_sync(
+    query_embeddings: list[list[float]],
+    k: int,
+    where_filter: Optional[dict],
+) -> list[list[SearchResultItem]]:
+    """Blocking part of query_similar_batch for the memmap backend."""
+    store = get_vector_store()
+    if store is None:
+        raise RuntimeError("Vector store not available")
+
+    settings = get_settings()
+    rerank = None
+    if settings.vector_index == "int8" and store.codes is not None:
+        rerank = settings.vector_rerank_factor
+
+    try:
+        with stage("vector_search"), VECTOR_QUERY_SECONDS.labels(backend="memmap").time():
+            positions = np.flatnonzero(store.mask(where_filter)) if where_filter else None
+            matches = store.search(query_embeddings, k, positions, rerank)
+        with stage("metadata_fetch"):
+            return [
+                _to_items(
+                    [store.ids[i] for i in rows],
+                    [store.documents[i] for i in rows],
+                    [store.metadata(i) for i in rows],
+                    distances.tolist(),
+                )
+                for rows, distances in matches
+            ]
+    except Exception as e:
+        logger.error(f"Vector store query failed: {e}")
+        raise
+
+
+def _query_similar_sync(
+    query_texts: list[str],
+    k: int,
+    where_filter: Optional[dict],
+    query_embeddings: Optional[list[list[float]]] = None,
+) -> list[list[SearchResultItem]]:
+    """Blocking part of query_similar_batch."""
+    no_results: list[list[SearchResultItem]] = [[] for _ in query_texts]
     collection = get_collection()
     if collection is None:
-        logger.error("ChromaDB collection not available")
-        return []
+        raise RuntimeError("ChromaDB collection not available")
 
     try:
-        results = collection.query(
-            query_texts=[query_text],
-            n_results=k,
-            where=where_filter,
-            include=["documents", "metadatas", "distances"],
-        )
-
-        items = []
-        if results and results["ids"] and results["ids"][0]:
-            ids = results["ids"][0]
-            documents = results["documents"][0] if results["documents"] else []
-            metadatas = results["metadatas"][0] if results["metadatas"] else []
-            distances = results["distances"][0] if results["distances"] else []
-
-            for i, doc_id in enumerate(ids):
-                doc = documents[i] if i < len(documents) else ""
-                meta = metadatas[i] if i < len(metadatas) else {}
-                distance = distances[i] if i < len(distances) else 1.0
-
-                # Convert distance to similarity score (0-1)
-                # ChromaDB returns L2 distance, smaller = more similar
-                score = max(0.0, 1.0 - (distance / 2.0))
-
-                items.append(
-                    SearchResultItem(
-                        id=doc_id,
-                        source=SourceType.AOZORA,
-                        text=doc,
-                        score=score,
-                        title=meta.get("title"),
-                        author=meta.get("author"),
-                        work_id=meta.get("work_id"),
-                        offset_start=meta.get("offset_start"),
-                        offset_end=meta.get("offset_end"),
-                        context_text=meta.get("context_text"),
+        # Small scopes (e.g. one work) are searched exactly instead of
+        # through a filtered HNSW traversal
+        if where_filter is not None and query_embeddings is not None:
+            with stage("scope_load"):
+                scoped = get_scoped_vectors().get(collection, where_filter)
+            if scoped is not None:
+                results = []
+                timer = VECTOR_QUERY_SECONDS.labels(backend="scoped")
+                for embedding in query_embeddings:
+                    with stage("vector_search"), timer.time():
+                        positions, distances = scoped.search(embedding, k)
+                    results.append(
+                        _to_items(
+                            [scoped.ids[i] for i in positions],
+                            [scoped.documents[i] for i in positions],
+                            [scoped.metadatas[i] for i in positions],
+                            distances,
+                        )
                     )
-                )
+                return results
+
+        if query_embeddings is not None:
+            query = {"query_embeddings": query_embeddings}
+        else:
+            query = {"query_texts": query_texts}
+        # Chroma returns documents and metadata with the neighbours, so
+        # vector_search includes the metadata fetch for this backend
+        with stage("vector_search"), VECTOR_QUERY_SECONDS.labels(backend="chroma").time():
+            results = collection.query(
+                **query,
+                n_results=k,
+                where=where_filter,
+                include=["documents", "metadatas", "distances"],
+            )
 
-        return items
+        if not results or not results["ids"]:
+            return no_results
+        return [
+            _to_items(
+                ids,
+                results["documents"][q] if results["documents"] else [],
+                results["metadatas"][q] if results["metadatas"] else [],
+                results["distances"][q] if results["distances"] else [],
+            )
+            for q, ids in enumerate(results["ids"])
+        ]
 
     except Exception as e:
         logger.error(f"ChromaDB query failed: {e}")
-        return []
+        reset_collection()
+        raise
+
+
+def _to_items(
+    ids: list[str],
+    documents: list[str],
+    metadatas: list[dict],
+    distances: list[float],
+) -> list[SearchResultItem]:
+    """Convert one query's Chroma results into SearchResultItems."""
+    items = []
+    for i, doc_id in enumerate(ids):
+        doc = documents[i] if i < len(documents) else ""
+        meta = metadatas[i] if i < len(metadatas) else {}
+        distance = distances[i] if i < len(distances) else 1.0
+
+        # Convert distance to similarity score (0-1)
+        # ChromaDB returns L2 distance, smaller = more similar
+        score = max(0.0, 1.0 - (distance / 2.0))
+
+        items.append(chunk_to_item(doc_id, doc, meta, score))
+    return items
+
+
+def chunk_to_item(doc_id: str, document: str, meta: dict, score: float) -> SearchResultItem:
+    """Build a SearchResultItem from a stored chunk and its metadata."""
+    return SearchResultItem(
+        id=doc_id,
+        source=SourceType.AOZORA,
+        text=document,
+        score=score,
+        title=meta.get("title"),
+        author=meta.get("author"),
+        work_id=meta.get("work_id"),
+        offset_start=meta.get("offset_start"),
+        offset_end=meta.get("offset_end"),
+        context_text=meta.get("context_text"),
+    )
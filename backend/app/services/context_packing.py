@@ -0,0 +1,197 @@
+"""Pack retrieved chunks into a compact, token-budgeted LLM context."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.schemas import ContextPassage, PackedContext, SearchResultItem, SourceType
+from app.services.work_texts import context_span, get_text_store
+from app.settings import get_settings
+from app.utils.aozora import TextStore, estimate_tokens
+
+# Don't start a truncated passage with less budget than this
+MIN_PASSAGE_TOKENS = 50
+
+
+@dataclass
+class _Span:
+    """A contiguous span of one work covering one or more hits."""
+
+    work_id: str
+    title: str
+    author: str
+    start: int
+    end: int
+    rank: int  # Best (lowest) position of its hits in the results
+    score: float
+    core_start: int  # Union of the hits' own chunk offsets
+    core_end: int
+    chunk_ids: list[str] = field(default_factory=list)
+    text: Optional[str] = None  # Stitched from chunk texts when not read from the store
+
+
+def _hit_spans(
+    items: list[SearchResultItem], store: Optional[TextStore], context_tokens: int
+) -> list[_Span]:
+    """
+    One span per Aozora hit: its context window if the store has it, else the chunk.
+
+    The window is only used if the stored text at the hit's offsets is the
+    hit's text; otherwise the offsets are from an older ingest and the
+    hit's own text stands in.
+    """
+    spans = []
+    for rank, item in enumerate(items):
+        if (
+            item.source != SourceType.AOZORA
+            or not item.work_id
+            or item.offset_start is None
+            or item.offset_end is None
+        ):
+            continue
+        start, end, text = item.offset_start, item.offset_end, item.text
+        window = None
+        if store is not None:
+            window = context_span(store, item.work_id, start, end, context_tokens, item.text)
+        if window is not None:
+            start, end, text = window[0], window[1], None
+        spans.append(
+            _Span(
+                work_id=item.work_id,
+                title=item.title or "",
+                author=item.author or "",
+                start=start,
+                end=end,
+                rank=rank,
+                score=item.score,
+                core_start=item.offset_start,
+                core_end=item.offset_end,
+                chunk_ids=[item.id],
+                text=text,
+            )
+        )
+    return spans
+
+
+def _merge(spans: list[_Span]) -> list[_Span]:
+    """
+    Coalesce spans of the same work whose ranges overlap or touch.
+
+    Spans read from the store and spans of chunk text are kept apart, since
+    only the former are known to share coordinates.
+    """
+    merged: list[_Span] = []
+    spans = sorted(spans, key=lambda s: (s.work_id, s.text is None, s.start, -s.end))
+    for span in spans:
+        last = merged[-1] if merged else None
+        if (
+            last is None
+            or last.work_id != span.work_id
+            or (last.text is None) != (span.text is None)
+            or span.start > last.end
+        ):
+            merged.append(span)
+            continue
+        # Extend the previous span; drop the part both cover
+        if span.end > last.end:
+            if last.text is not None:
+                last.text += span.text[last.end - span.start :]
+            last.end = span.end
+        last.rank = min(last.rank, span.rank)
+        last.score = max(last.score, span.score)
+        last.core_start = min(last.core_start, span.core_start)
+        last.core_end = max(last.core_end, span.core_end)
+        last.chunk_ids.extend(span.chunk_ids)
+    return merged
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, preferring to end on a sentence."""
+    cut = text[: int(max_tokens * 1.5)]
+    boundary = max(cut.rfind("。"), cut.rfind("\n"))
+    return cut[: boundary + 1] if boundary > len(cut) // 2 else cut
+
+
+def _format(title: str, author: str, text: str) -> str:
+    """Render one passage the way the chat prompt lists sources."""
+    return f"### {title} ({author})\n{text}"
+
+
+def pack_context(
+    items: list[SearchResultItem],
+    token_budget: int,
+    use_context: bool = True,
+) -> PackedContext:
+    """
+    Merge hits into non-overlapping passages and fill a token budget by rank.
+
+    Hits from the same work whose spans (context windows when the text store
+    is available, otherwise the chunks themselves) overlap or touch become
+    one passage, so shared text appears once. Passages are added in the
+    order of their best-ranked hit, since scores from different retrievers
+    aren't comparable; one that doesn't fit is shrunk to just its hits'
+    chunks, then truncated.
+
+    Args:
+        items: Ranked search results, best first
+        token_budget: Maximum estimated tokens of the packed text
+        use_context: Expand hits to their context windows
+
+    Returns:
+        PackedContext with the passages and the ready-to-use text
+    """
+    store = get_text_store() if use_context else None
+    spans = _merge(_hit_spans(items, store, get_settings().context_window_tokens))
+    spans.sort(key=lambda s: s.rank)
+
+    passages: list[ContextPassage] = []
+    blocks: list[str] = []
+    used = 0
+    for span in spans:
+        remaining = token_budget - used
+        heading_tokens = estimate_tokens(_format(span.title, span.author, ""))
+        if remaining - heading_tokens < MIN_PASSAGE_TOKENS:
+            break
+
+        start, end = span.start, span.end
+        text = span.text if span.text is not None else store.get_range(span.work_id, start, end)
+        if text is None:
+            continue
+        if heading_tokens + estimate_tokens(text) > remaining and span.text is None:
+            start, end = span.core_start, span.core_end
+            text = store.get_range(span.work_id, start, end) or ""
+        if heading_tokens + estimate_tokens(text) > remaining:
+            text = _truncate(text, remaining - heading_tokens)
+            end = start + len(text)
+
+        block = _format(span.title, span.author, text)
+        tokens = estimate_tokens(block)
+        used += tokens
+        blocks.append(block)
+        passages.append(
+            ContextPassage(
+                work_id=span.work_id,
+                title=span.title,
+                author=span.author,
+                offset_start=start,
+                offset_end=end,
+                text=text,
+                score=span.score,
+                token_count=tokens,
+                chunk_ids=span.chunk_ids,
+            )
+        )
+
+    return PackedContext(
+        text="\n\n".join(blocks),
+        passages=passages,
+        token_count=used,
+        token_budget=token_budget,
+    )
+
+
+async def pack_results(
+    items: list[SearchResultItem], token_budget: int, use_context: bool = True
+) -> PackedContext:
+    """Run pack_context off the event loop."""
+    return await asyncio.to_thread(pack_context, items, token_budget, use_context)
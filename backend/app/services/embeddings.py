@@ -0,0 +1,269 @@
+"""Query embedding service with an LRU cache and request batching."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol
+
+import httpx
+
+from app.services.metrics import EMBEDDING_REQUEST_SECONDS
+from app.services.timings import stage
+from app.settings import Settings, get_settings
+from app.utils.query import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbedder(Protocol):
+    """A backend that turns a batch of texts into embedding vectors."""
+
+    model: str
+
+    async def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+    async def aclose(self) -> None: ...
+
+
+class OpenAIEmbedder:
+    """
+    OpenAI embeddings over a pooled HTTP client.
+
+    Uses the same model as the ingest pipeline so query vectors live in the
+    same space as the stored chunk vectors.
+    """
+
+    def __init__(self, api_key: str, model: str, base_url: str, timeout_seconds: float):
+        self.model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout_seconds,
+        )
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts in one API call."""
+        response = await self._client.post(
+            "/embeddings",
+            json={"model": self.model, "input": texts},
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
+
+
+def _create_openai_embedder(settings: Settings) -> Optional[QueryEmbedder]:
+    """Create the OpenAI embedder if an API key is configured."""
+    if not settings.openai_api_key:
+        return None
+    return OpenAIEmbedder(
+        api_key=settings.openai_api_key,
+        model=settings.embedding_model,
+        base_url=settings.openai_base_url,
+        timeout_seconds=settings.embedding_timeout_seconds,
+    )
+
+
+# Embedding providers by name (settings.embedding_provider)
+EMBEDDERS: dict[str, Callable[[Settings], Optional[QueryEmbedder]]] = {
+    "openai": _create_openai_embedder,
+}
+
+
+class EmbeddingService:
+    """
+    Cached, batching front end for a QueryEmbedder.
+
+    Queries are cached by their normalized text. Cache misses arriving
+    within batch_window_ms of each other are sent as one embedding call, and
+    concurrent requests for the same query share a single in-flight result.
+    """
+
+    def __init__(
+        self,
+        embedder: QueryEmbedder,
+        cache_size: int = 1024,
+        batch_window_ms: float = 5.0,
+        max_batch: int = 64,
+    ):
+        self.embedder = embedder
+        self.cache_size = cache_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._futures: dict[str, asyncio.Future] = {}
+        self._batch: list[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    @property
+    def model(self) -> str:
+        """Name of the embedding model."""
+        return self.embedder.model
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a single query."""
+        return (await self.embed_queries([query]))[0]
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed several queries, serving repeats from the cache.
+
+        Args:
+            queries: Raw query texts
+
+        Returns:
+            One embedding per query, in order
+        """
+        keys = [normalize_query(q) for q in queries]
+        vectors: dict[str, list[float]] = {}
+        waiting: dict[str, asyncio.Future] = {}
+
+        for key in keys:
+            if key in vectors or key in waiting:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                vectors[key] = cached
+                continue
+            self.misses += 1
+            waiting[key] = self._enqueue(key)
+
+        if waiting:
+            # Shield the shared futures so one cancelled caller doesn't fail
+            # everyone else waiting on the same batch
+            with stage("embedding"):
+                results = await asyncio.gather(*(asyncio.shield(f) for f in waiting.values()))
+            vectors.update(zip(waiting, results))
+
+        return [vectors[key] for key in keys]
+
+    def _enqueue(self, key: str) -> asyncio.Future:
+        """Get the pending result for a key, adding it to the next batch."""
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        self._batch.append(key)
+
+        if len(self._batch) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Send the current batch to the embedder."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: list[str]) -> None:
+        """Embed a batch and resolve its waiting futures."""
+        self.batches += 1
+        self.batched_texts += len(keys)
+        try:
+            with EMBEDDING_REQUEST_SECONDS.time():
+                embeddings = await self.embedder.embed(keys)
+            if len(embeddings) != len(keys):
+                raise ValueError(f"Expected {len(keys)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            logger.error(f"Query embedding failed: {e}")
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, embedding in zip(keys, embeddings):
+            self._put(key, embedding)
+            future = self._futures.pop(key)
+            if not future.done():
+                future.set_result(embedding)
+
+    def _put(self, key: str, embedding: list[float]) -> None:
+        """Cache an embedding, evicting the least recently used entries."""
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Get cache and batching counters."""
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "entries": len(self._cache),
+            "max_entries": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        """Close the underlying embedder."""
+        await self.embedder.aclose()
+
+
+# Global service instance; stays None when no embedder is configured
+_service: Optional[EmbeddingService] = None
+_service_checked = False
+
+
+def get_embedding_service() -> Optional[EmbeddingService]:
+    """
+    Get or create the query embedding service.
+
+    Returns None when the configured provider has no credentials, in which
+    case Chroma falls back to embedding query texts itself.
+    """
+    global _service, _service_checked
+    if not _service_checked:
+        _service_checked = True
+        settings = get_settings()
+        factory = EMBEDDERS.get(settings.embedding_provider)
+        if factory is None:
+            logger.error(f"Unknown embedding provider: {settings.embedding_provider}")
+            return None
+        embedder = factory(settings)
+        if embedder is None:
+            logger.warning(
+                "Query embedder not configured; Chroma will embed queries with its "
+                "default model, which may not match the ingest model"
+            )
+            return None
+        _service = EmbeddingService(
+            embedder,
+            cache_size=settings.embedding_cache_size,
+            batch_window_ms=settings.embedding_batch_window_ms,
+            max_batch=settings.embedding_max_batch,
+        )
+    return _service
+
+
+async def close_embedding_service() -> None:
+    """Close the embedder's HTTP client."""
+    global _service, _service_checked
+    if _service is not None:
+        service, _service = _service, None
+        await service.aclose()
+    _service_checked = False
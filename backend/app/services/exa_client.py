@@ -1,77 +1,258 @@
 """Exa API client for web search with caching."""
 
+import asyncio
 import hashlib
 import json
 import logging
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
-from exa_py import Exa
+import httpx
 
 from app.schemas import SearchResultItem, SourceType
+from app.services.metrics import (
+    EXA_CACHE_LOOKUP_SECONDS,
+    EXA_REQUEST_SECONDS,
+    EXA_REQUESTS_TOTAL,
+)
+from app.services.timings import stage
 from app.settings import get_settings
+from app.utils.query import normalize_query
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted per statement by purge; the lock is released between batches
+PURGE_BATCH_ROWS = 500
+
 
 class ExaCache:
-    """Simple SQLite-based cache for Exa results."""
+    """
+    SQLite-backed cache for Exa results with an in-memory L1.
+
+    Uses one long-lived WAL-mode connection. Entries are keyed by normalized
+    query only; each stores the k it was fetched with, so a cached k=5 result
+    also answers k=3. Expired rows are purged periodically and the table is
+    capped at max_rows, dropping the oldest entries first.
+
+    Async code uses aget() and aset(), which answer L1 hits on the event
+    loop and run SQLite reads and writes in a worker thread. The L1 has its
+    own lock, so an L1 hit never waits for a query or a purge batch.
+    """
 
-    def __init__(self, cache_path: str = "../data/exa_cache.sqlite"):
+    def __init__(
+        self,
+        cache_path: str = "../data/exa_cache.sqlite",
+        ttl_seconds: float = 7 * 86400,
+        max_rows: int = 50000,
+        l1_entries: int = 256,
+    ):
         self.cache_path = Path(cache_path).resolve()
         self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.l1_entries = l1_entries
+        self._l1: OrderedDict[str, tuple[float, int, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()  # Guards the connection
+        self._l1_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._purger: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(
+            self.cache_path, check_same_thread=False, isolation_level=None
+        )
         self._init_db()
 
     def _init_db(self) -> None:
         """Initialize the cache database."""
-        with sqlite3.connect(self.cache_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache (
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Superseded by exa_results. Its keys hash the raw query with k,
+            # so entries can't be re-keyed; they would expire within the TTL
+            legacy = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cache'"
+            ).fetchone()
+            if legacy:
+                rows = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                logger.info(f"Dropping {rows} entries of the old Exa cache table")
+                self._conn.execute("DROP TABLE cache")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS exa_results (
                     key TEXT PRIMARY KEY,
+                    k INTEGER NOT NULL,
                     value TEXT NOT NULL,
-                    created_at TEXT NOT NULL
+                    created_at REAL NOT NULL
                 )
             """)
-            conn.commit()
-
-    def _make_key(self, query: str, k: int) -> str:
-        """Create a cache key from query parameters."""
-        content = f"{query}:{k}"
-        return hashlib.sha256(content.encode()).hexdigest()
-
-    def get(self, query: str, k: int, ttl_days: int = 7) -> Optional[list[dict]]:
-        """Get cached results if available and not expired."""
-        key = self._make_key(query, k)
-
-        with sqlite3.connect(self.cache_path) as conn:
-            cursor = conn.execute(
-                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS exa_results_created_at ON exa_results (created_at)"
             )
-            row = cursor.fetchone()
 
-            if row:
-                value, created_at = row
-                created = datetime.fromisoformat(created_at)
-                if datetime.now() - created < timedelta(days=ttl_days):
-                    return json.loads(value)
-
-        return None
+    def _make_key(self, query: str) -> str:
+        """Create a cache key from the normalized query."""
+        return hashlib.sha256(normalize_query(query).encode()).hexdigest()
+
+    def get(self, query: str, k: int) -> Optional[list[dict]]:
+        """Get the first k cached results if a fresh entry with at least k exists."""
+        key = self._make_key(query)
+        entry = self._l1_get(key)
+        if entry is None:
+            entry = self._load(key)
+        return self._answer(entry, k)
+
+    async def aget(self, query: str, k: int) -> Optional[list[dict]]:
+        """get() that reads SQLite in a worker thread on an L1 miss."""
+        key = self._make_key(query)
+        entry = self._l1_get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, key)
+        return self._answer(entry, k)
+
+    def _l1_get(self, key: str) -> Optional[tuple[float, int, list[dict]]]:
+        """Get an L1 entry and mark it recently used."""
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                self._l1.move_to_end(key)
+        return entry
+
+    def _load(self, key: str) -> Optional[tuple[float, int, list[dict]]]:
+        """Read an entry from SQLite into the L1."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, k, value FROM exa_results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = (row[0], row[1], json.loads(row[2]))
+        with self._l1_lock:
+            self._remember(key, entry)
+        return entry
+
+    def _answer(
+        self, entry: Optional[tuple[float, int, list[dict]]], k: int
+    ) -> Optional[list[dict]]:
+        """The first k results of entry if it is fresh and has at least k, counting the lookup."""
+        if entry is None or entry[0] < time.time() - self.ttl_seconds or entry[1] < k:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[2][:k]
 
     def set(self, query: str, k: int, results: list[dict]) -> None:
-        """Cache the results."""
-        key = self._make_key(query, k)
+        """Cache results, unless a fresh entry with a larger k already exists."""
+        key = self._make_key(query)
+        now = time.time()
 
-        with sqlite3.connect(self.cache_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """
-                INSERT OR REPLACE INTO cache (key, value, created_at)
-                VALUES (?, ?, ?)
+                INSERT INTO exa_results (key, k, value, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    k = excluded.k, value = excluded.value, created_at = excluded.created_at
+                WHERE excluded.k >= exa_results.k OR exa_results.created_at < ?
                 """,
-                (key, json.dumps(results), datetime.now().isoformat()),
+                (key, k, json.dumps(results), now, now - self.ttl_seconds),
             )
-            conn.commit()
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None or k >= entry[1] or entry[0] < now - self.ttl_seconds:
+                self._remember(key, (now, k, results))
+
+    async def aset(self, query: str, k: int, results: list[dict]) -> None:
+        """set() in a worker thread."""
+        await asyncio.to_thread(self.set, query, k, results)
+
+    def stats(self) -> dict:
+        """Get cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "l1_entries": len(self._l1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, entry: tuple[float, int, list[dict]]) -> None:
+        """Put an entry in the L1, evicting the least recently used ones (holding _l1_lock)."""
+        self._l1[key] = entry
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_entries:
+            self._l1.popitem(last=False)
+
+    def purge(self) -> int:
+        """
+        Delete expired rows and trim the table to max_rows.
+
+        Rows are deleted PURGE_BATCH_ROWS at a time, releasing the lock in
+        between, so lookups on the event loop wait for one small batch at
+        most rather than for the whole purge.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = time.time() - self.ttl_seconds
+        deleted = self._delete_batches(
+            "SELECT key FROM exa_results WHERE created_at < ? LIMIT ?",
+            (cutoff, PURGE_BATCH_ROWS),
+        )
+        deleted += self._delete_batches(
+            "SELECT key FROM exa_results ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (PURGE_BATCH_ROWS, self.max_rows),
+        )
+        with self._l1_lock:
+            for key in [key for key, entry in self._l1.items() if entry[0] < cutoff]:
+                del self._l1[key]
+        return deleted
+
+    def _delete_batches(self, select: str, params: tuple) -> int:
+        """Delete the rows whose keys select returns until it returns fewer than a batch."""
+        deleted = 0
+        while True:
+            with self._lock:
+                count = self._conn.execute(
+                    f"DELETE FROM exa_results WHERE key IN ({select})", params
+                ).rowcount
+            deleted += count
+            if count < PURGE_BATCH_ROWS:
+                return deleted
+            # Let a waiting lookup take the lock before the next batch
+            time.sleep(0)
+
+    def start_purger(self, interval_seconds: float) -> None:
+        """Purge expired rows now and then periodically in a background thread."""
+        if self._purger is not None:
+            return
+        self._purger = threading.Thread(
+            target=self._purge_loop, args=(interval_seconds,), name="exa-cache-purge", daemon=True
+        )
+        self._purger.start()
+
+    def _purge_loop(self, interval_seconds: float) -> None:
+        """Run purge every interval until closed."""
+        while True:
+            try:
+                deleted = self.purge()
+                if deleted:
+                    logger.info(f"Purged {deleted} Exa cache entries")
+            except sqlite3.Error as e:
+                logger.warning(f"Exa cache purge failed: {e}")
+            if self._stop.wait(interval_seconds):
+                return
+
+    def close(self) -> None:
+        """Stop the purger and close the connection."""
+        self._stop.set()
+        if self._purger is not None:
+            self._purger.join()
+        with self._lock:
+            self._conn.close()
 
 
 # Global cache instance
@@ -82,17 +263,61 @@ def get_cache() -> ExaCache:
     """Get or create the cache instance."""
     global _cache
     if _cache is None:
-        _cache = ExaCache()
+        settings = get_settings()
+        _cache = ExaCache(
+            cache_path=settings.exa_cache_path,
+            ttl_seconds=settings.exa_cache_ttl_days * 86400,
+            max_rows=settings.exa_cache_max_rows,
+            l1_entries=settings.exa_cache_l1_entries,
+        )
     return _cache
 
 
-def get_exa_client() -> Optional[Exa]:
-    """Get Exa client if API key is configured."""
-    settings = get_settings()
-    if not settings.exa_api_key:
-        logger.warning("Exa API key not configured")
-        return None
-    return Exa(api_key=settings.exa_api_key)
+# Shared HTTP client, created lazily so it binds to the running event loop
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled keep-alive client for the Exa API."""
+    global _http_client
+    if _http_client is None:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            base_url=settings.exa_base_url,
+            headers={"x-api-key": settings.exa_api_key},
+            limits=httpx.Limits(
+                max_connections=settings.exa_max_connections,
+                max_keepalive_connections=settings.exa_max_connections,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+def parse_results(results: list[dict]) -> list[SearchResultItem]:
+    """Convert raw Exa result objects into SearchResultItems."""
+    items = []
+    for i, result in enumerate(results):
+        url = result.get("url") or ""
+        text = result.get("text") or ""
+        item = SearchResultItem(
+            id=f"web_{i}_{hashlib.md5(url.encode()).hexdigest()[:8]}",
+            source=SourceType.WEB,
+            text=text,
+            score=0.8 - (i * 0.05),  # Decreasing score by position
+            url=url,
+            title=result.get("title"),
+            snippet=text[:200] if text else None,
+        )
+        items.append(item)
+    return items
 
 
 async def search_web(
@@ -103,6 +328,10 @@ async def search_web(
     """
     Search the web using Exa API.
 
+    The whole request, including connecting and reading the body, is bounded
+    by timeout_seconds. Cancellation from the caller propagates, closing the
+    in-flight request instead of leaving it running in the background.
+
     Args:
         query: Search query
         k: Number of results
@@ -110,49 +339,51 @@ async def search_web(
 
     Returns:
         List of SearchResultItem
+
+    Raises:
+        TimeoutError: If the request took longer than timeout_seconds
+        httpx.HTTPError: If the request failed, so the failure isn't cached
+            as an empty result
     """
     settings = get_settings()
     cache = get_cache()
 
     # Check cache first
-    cached = cache.get(query, k, ttl_days=settings.exa_cache_ttl_days)
+    with stage("exa_cache"), EXA_CACHE_LOOKUP_SECONDS.time():
+        cached = await cache.aget(query, k)
     if cached is not None:
         logger.info(f"Cache hit for query: {query[:50]}...")
         return [SearchResultItem(**item) for item in cached]
 
-    # Get client
-    client = get_exa_client()
-    if client is None:
+    if not settings.exa_api_key:
+        logger.warning("Exa API key not configured")
         return []
 
-    try:
-        # Search with Exa
-        response = client.search_and_contents(
-            query=query,
-            num_results=k,
-            type="auto",
-            text={"max_characters": 500},
-            use_autoprompt=True,
-        )
-
-        items = []
-        for i, result in enumerate(response.results):
-            item = SearchResultItem(
-                id=f"web_{i}_{hashlib.md5(result.url.encode()).hexdigest()[:8]}",
-                source=SourceType.WEB,
-                text=result.text if hasattr(result, "text") and result.text else "",
-                score=0.8 - (i * 0.05),  # Decreasing score by position
-                url=result.url,
-                title=result.title if hasattr(result, "title") else None,
-                snippet=result.text[:200] if hasattr(result, "text") and result.text else None,
-            )
-            items.append(item)
+    payload = {
+        "query": query,
+        "numResults": k,
+        "type": "auto",
+        "useAutoprompt": True,
+        "contents": {"text": {"maxCharacters": 500}},
+    }
 
-        # Cache the results
-        cache.set(query, k, [item.model_dump() for item in items])
-
-        return items
-
-    except Exception as e:
-        logger.error(f"Exa search failed: {e}")
-        return []
+    try:
+        with stage("exa_request"), EXA_REQUEST_SECONDS.time():
+            async with asyncio.timeout(timeout_seconds):
+                response = await get_http_client().post("/search", json=payload)
+                response.raise_for_status()
+                data = response.json()
+    except TimeoutError:
+        EXA_REQUESTS_TOTAL.labels(outcome="timeout").inc()
+        raise TimeoutError(f"Exa search timed out after {timeout_seconds}s") from None
+    except Exception:
+        EXA_REQUESTS_TOTAL.labels(outcome="error").inc()
+        raise
+    EXA_REQUESTS_TOTAL.labels(outcome="ok").inc()
+
+    items = parse_results(data.get("results") or [])
+
+    # Cache the results
+    await cache.aset(query, k, [item.model_dump() for item in items])
+
+    return items
@@ -0,0 +1,97 @@
+"""Bounded thread pool for running blocking calls off the event loop."""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.services.timings import current_timings
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when too many calls are already waiting for a worker."""
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool with a queue cap and queue-depth metrics.
+
+    At most max_workers calls run concurrently; at most max_queue more may
+    wait for a worker, beyond which calls fail fast instead of piling up.
+    Calls run in the caller's context, like asyncio.to_thread, so request
+    stage timings include work done on the pool.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int = 0):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queued = 0
+        self.total_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function on the pool and await its result."""
+        with self._lock:
+            if self.max_queue and self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(f"{self.name} executor queue is full")
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        submitted = time.perf_counter()
+        context = contextvars.copy_context()
+
+        def call() -> T:
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.total_wait_seconds += wait
+            timings = context.run(current_timings)
+            if timings is not None:
+                timings.add(f"{self.name}_queue_wait", wait)
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        future = self._executor.submit(call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        """Account for calls cancelled before a worker picked them up."""
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def stats(self) -> dict:
+        """Get queue-depth and throughput counters."""
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "max_queued": self.max_queued,
+                "avg_wait_ms": self.total_wait_seconds / started * 1000 if started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,386 @@
+"""BM25 lexical index over character bigrams of the stored chunks."""
+
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from chromadb.api.models.Collection import Collection
+
+from app.schemas import SearchResultItem
+from app.services.chroma_client import chunk_to_item, get_collection
+from app.services.search_scope import SearchScope
+from app.services.timings import stage
+from app.services.vector_store import get_vector_store
+from app.settings import get_settings
+from app.utils.aozora import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Chunks fetched from Chroma per page while building
+_PAGE_SIZE = 5000
+
+# Scopes whose chunk positions are kept
+_MAX_SCOPES = 64
+
+# Seconds between checks that the indexed chunks haven't changed
+CHECK_SECONDS = 5.0
+
+_WHITESPACE = np.array([ord(c) for c in " \t\r\n　"], dtype=np.int64)
+
+
+def bigram_codes(text: str) -> np.ndarray:
+    """
+    Encode the character bigrams of a text as int64 codes.
+
+    Each bigram packs two code points (21 bits each) into one integer, so
+    no vocabulary dictionary is needed. Bigrams spanning whitespace are
+    dropped.
+    """
+    chars = np.frombuffer(
+        unicodedata.normalize("NFKC", text).lower().encode("utf-32-le"), dtype=np.uint32
+    ).astype(np.int64)
+    if len(chars) < 2:
+        return np.empty(0, dtype=np.int64)
+    codes = (chars[:-1] << 21) | chars[1:]
+    space = np.isin(chars, _WHITESPACE)
+    return codes[~(space[:-1] | space[1:])]
+
+
+class StoreChunks:
+    """Chunks of an exported VectorStore, read by position."""
+
+    def __init__(self, store: VectorStore):
+        self.store = store
+
+    def fetch(self, positions: list[int]) -> list[tuple[int, str, str, dict]]:
+        """(position, id, document, metadata) of each chunk."""
+        store = self.store
+        return [(i, store.ids[i], store.documents[i], store.metadata(i)) for i in positions]
+
+    def is_current(self) -> bool:
+        """Whether the store is still the exported one (see get_vector_store)."""
+        return get_vector_store() is self.store
+
+
+class ChromaChunks:
+    """Chunks of a Chroma collection, fetched by id."""
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+        self.ids: list[str] = []  # Filled while the index is built
+        self.count = 0
+
+    def fetch(self, positions: list[int]) -> list[tuple[int, str, str, dict]]:
+        """(position, id, document, metadata) of each chunk still in the collection."""
+        page = self.collection.get(
+            ids=[self.ids[i] for i in positions], include=["documents", "metadatas"]
+        )
+        found = {
+            doc_id: (doc or "", meta or {})
+            for doc_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"])
+        }
+        return [(i, self.ids[i], *found[self.ids[i]]) for i in positions if self.ids[i] in found]
+
+    def is_current(self) -> bool:
+        """Whether the collection still exists and has as many chunks as at build time."""
+        collection = get_collection()
+        try:
+            return collection is not None and collection.count() == self.count
+        except Exception:
+            # E.g. the collection was deleted and recreated by ingest
+            return False
+
+
+class LexicalIndex:
+    """
+    Compact BM25 inverted index keyed by character bigram.
+
+    Postings are stored as flat numpy arrays in CSR layout (sorted term
+    codes, offsets, document ids and term frequencies), which keeps the
+    index small and lets a query touch only its own terms' postings.
+    Chunk text and metadata aren't kept: hits are fetched from the chunk
+    source, and scopes are matched against int32 codes of each chunk's
+    author and work.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[tuple[str, dict]],
+        source: StoreChunks | ChromaChunks,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """chunks yields (document, metadata) in the source's position order."""
+        self.source = source
+        self.k1 = k1
+        self._scopes: OrderedDict[SearchScope, np.ndarray] = OrderedDict()
+        self._scopes_lock = threading.Lock()
+
+        terms, doc_ids, freqs, lengths = [], [], [], []
+        authors: dict[str, int] = {}
+        work_ids: dict[str, int] = {}
+        author_codes, work_codes = [], []
+        for doc_id, (document, meta) in enumerate(chunks):
+            codes = bigram_codes(document)
+            lengths.append(len(codes))
+            unique, counts = np.unique(codes, return_counts=True)
+            terms.append(unique)
+            doc_ids.append(np.full(len(unique), doc_id, dtype=np.int32))
+            freqs.append(counts.astype(np.uint16))
+            author_codes.append(_code(authors, meta.get("author")))
+            work_codes.append(_code(work_ids, meta.get("work_id")))
+
+        self._count = len(lengths)
+        self._authors, self._work_ids = authors, work_ids
+        self._author_codes = np.array(author_codes, dtype=np.int32)
+        self._work_codes = np.array(work_codes, dtype=np.int32)
+
+        lengths = np.array(lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        # Per-document part of the BM25 denominator
+        self._doc_norm = (k1 * (1 - b + b * lengths / avg_length)).astype(np.float32)
+
+        all_terms = np.concatenate(terms) if terms else np.empty(0, dtype=np.int64)
+        order = np.argsort(all_terms, kind="stable")
+        all_terms = all_terms[order]
+        self._doc_ids = np.concatenate(doc_ids)[order] if doc_ids else np.empty(0, np.int32)
+        self._freqs = np.concatenate(freqs)[order] if freqs else np.empty(0, np.uint16)
+
+        self._terms, starts = np.unique(all_terms, return_index=True)
+        self._offsets = np.append(starts, len(all_terms)).astype(np.int64)
+        df = np.diff(self._offsets).astype(np.float32)
+        n = self._count
+        self._idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the posting and scope arrays."""
+        arrays = (
+            self._terms,
+            self._offsets,
+            self._doc_ids,
+            self._freqs,
+            self._idf,
+            self._doc_norm,
+            self._author_codes,
+            self._work_codes,
+        )
+        return sum(a.nbytes for a in arrays)
+
+    def scope_positions(self, scope: SearchScope) -> np.ndarray:
+        """Positions of the chunks inside a scope."""
+        with self._scopes_lock:
+            positions = self._scopes.get(scope)
+            if positions is not None:
+                self._scopes.move_to_end(scope)
+                return positions
+
+        mask = np.ones(self._count, dtype=bool)
+        if scope.authors:
+            codes = [self._authors[a] for a in scope.authors if a in self._authors]
+            mask &= np.isin(self._author_codes, codes)
+        if scope.work_ids:
+            codes = [self._work_ids[w] for w in scope.work_ids if w in self._work_ids]
+            mask &= np.isin(self._work_codes, codes)
+        positions = np.flatnonzero(mask)
+
+        with self._scopes_lock:
+            self._scopes[scope] = positions
+            while len(self._scopes) > _MAX_SCOPES:
+                self._scopes.popitem(last=False)
+        return positions
+
+    def search(
+        self, query: str, k: int = 5, scope: Optional[SearchScope] = None
+    ) -> list[tuple[int, float]]:
+        """
+        Score chunks against the query's bigrams with BM25.
+
+        Args:
+            query: Search query
+            k: Number of results
+            scope: Only return chunks inside this scope
+
+        Returns:
+            List of (chunk position, score), best first
+        """
+        codes = np.unique(bigram_codes(query))
+        if not len(codes) or not len(self._terms):
+            return []
+
+        slots = np.searchsorted(self._terms, codes)
+        in_range = slots < len(self._terms)
+        slots, codes = slots[in_range], codes[in_range]
+        slots = slots[self._terms[slots] == codes]
+        if not len(slots):
+            return []
+
+        scores = np.zeros(self._count, dtype=np.float32)
+        for slot in slots:
+            start, end = self._offsets[slot], self._offsets[slot + 1]
+            docs = self._doc_ids[start:end]
+            tf = self._freqs[start:end].astype(np.float32)
+            scores[docs] += self._idf[slot] * tf * (self.k1 + 1) / (tf + self._doc_norm[docs])
+
+        if scope is not None:
+            positions = self.scope_positions(scope)
+            candidates = positions[scores[positions] > 0]
+        else:
+            candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in candidates]
+
+    def query(
+        self, query: str, k: int = 5, scope: Optional[SearchScope] = None
+    ) -> list[SearchResultItem]:
+        """
+        Search and fetch the hits as SearchResultItems.
+
+        Scores are scaled so the best hit is 1.0.
+        """
+        with stage("lexical_search"):
+            hits = self.search(query, k, scope)
+        if not hits:
+            return []
+        top = hits[0][1]
+        scores = dict(hits)
+        with stage("lexical_fetch"):
+            chunks = self.source.fetch([i for i, _ in hits])
+        return [
+            chunk_to_item(doc_id, document, meta, scores[i] / top)
+            for i, doc_id, document, meta in chunks
+        ]
+
+
+def _code(codes: dict[str, int], value: Optional[str]) -> int:
+    """Category code of a metadata value (-1 if missing), adding new values."""
+    if value is None:
+        return -1
+    return codes.setdefault(value, len(codes))
+
+
+class LexicalIndexHolder:
+    """
+    Builds the lexical index from the stored chunks (at warmup) and holds it.
+
+    current() checks the chunk source at most every CHECK_SECONDS, in a
+    background thread. When the chunks have changed (a new export, or a
+    re-ingested collection), the stale index is dropped, so hybrid search
+    runs on vectors alone instead of fusing outdated ids, and a new one is
+    built.
+    """
+
+    def __init__(self):
+        self.index: Optional[LexicalIndex] = None
+        self._build_lock = threading.Lock()
+        self._built = False
+        self._checked_at = time.monotonic()
+        self._refreshing = False
+
+    def build(self) -> None:
+        """Build the index in the calling thread, unless it has been built."""
+        with self._build_lock:
+            if self.index is None:
+                self._build()
+
+    def current(self) -> Optional[LexicalIndex]:
+        """The index, starting a check for changed chunks if one is due."""
+        now = time.monotonic()
+        if self._built and not self._refreshing and now - self._checked_at >= CHECK_SECONDS:
+            self._checked_at = now
+            self._refreshing = True
+            threading.Thread(target=self._refresh, name="lexical-refresh", daemon=True).start()
+        return self.index
+
+    def _refresh(self) -> None:
+        """Rebuild the index if its chunks changed or a rebuild failed."""
+        try:
+            with self._build_lock:
+                index = self.index
+                if index is not None:
+                    if index.source.is_current():
+                        return
+                    logger.info("Stored chunks changed; rebuilding the lexical index")
+                    self.index = None
+                self._build()
+        except Exception:
+            logger.exception("Lexical index check failed")
+        finally:
+            self._refreshing = False
+
+    def _build(self) -> None:
+        """Build body; a failure allows a later retry."""
+        start = time.perf_counter()
+        try:
+            self.index = build_lexical_index()
+            if self.index is not None:
+                self._built = True
+                logger.info(
+                    f"Lexical index ready: {len(self.index)} chunks, "
+                    f"{self.index.size_bytes / 1e6:.1f} MB in {time.perf_counter() - start:.2f}s"
+                )
+        except Exception:
+            logger.exception("Lexical index build failed")
+
+
+def build_lexical_index() -> Optional[LexicalIndex]:
+    """Build a LexicalIndex over the chunks of the configured vector backend."""
+    if get_settings().vector_backend == "memmap":
+        return build_from_vector_store()
+    return build_from_chroma()
+
+
+def build_from_vector_store() -> Optional[LexicalIndex]:
+    """Build a LexicalIndex over every chunk in the exported vector store."""
+    store = get_vector_store()
+    if store is None:
+        return None
+    chunks = ((store.documents[i], store.metadata(i)) for i in range(len(store)))
+    return LexicalIndex(chunks, StoreChunks(store))
+
+
+def build_from_chroma() -> Optional[LexicalIndex]:
+    """Build a LexicalIndex over every chunk in the Chroma collection, page by page."""
+    collection = get_collection()
+    if collection is None:
+        return None
+
+    source = ChromaChunks(collection)
+
+    def pages() -> Iterator[tuple[str, dict]]:
+        offset = 0
+        while True:
+            page = collection.get(
+                include=["documents", "metadatas"], limit=_PAGE_SIZE, offset=offset
+            )
+            if not page["ids"]:
+                return
+            source.ids.extend(page["ids"])
+            for doc, meta in zip(page["documents"], page["metadatas"]):
+                yield doc or "", meta or {}
+            offset += len(page["ids"])
+
+    index = LexicalIndex(pages(), source)
+    source.count = len(source.ids)
+    return index
+
+
+# Global holder instance
+_holder: Optional[LexicalIndexHolder] = None
+
+
+def get_lexical_index() -> LexicalIndexHolder:
+    """Get or create the lexical index holder."""
+    global _holder
+    if _holder is None:
+        _holder = LexicalIndexHolder()
+    return _holder
@@ -0,0 +1,108 @@
+"""
+Process-wide Prometheus metrics.
+
+Metrics live in their own registry, which /metrics renders together with
+the cache and executor stats the services keep themselves.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+# Latency buckets in seconds, from cache hits to slow web calls
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+REGISTRY = CollectorRegistry()
+
+# Hot-path latencies
+VECTOR_QUERY_SECONDS = Histogram(
+    "aozora_vector_query_seconds",
+    "Vector index query latency",
+    ("backend",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EMBEDDING_REQUEST_SECONDS = Histogram(
+    "aozora_embedding_request_seconds",
+    "Query embedding API call latency",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EXA_REQUEST_SECONDS = Histogram(
+    "aozora_exa_request_seconds",
+    "Exa search API call latency",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EXA_CACHE_LOOKUP_SECONDS = Histogram(
+    "aozora_exa_cache_lookup_seconds",
+    "Exa result cache lookup latency",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+WORK_TEXT_READ_SECONDS = Histogram(
+    "aozora_work_text_read_seconds",
+    "Work text read latency (file: repository file, store: cleaned-text store)",
+    ("source",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+CLEANING_SECONDS = Histogram(
+    "aozora_cleaning_seconds",
+    "Aozora text cleaning latency",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+SERIALIZATION_SECONDS = Histogram(
+    "aozora_json_serialization_seconds",
+    "JSON encoding latency of response bodies and stream events",
+    ("kind",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+SEARCH_SOURCE_SECONDS = Histogram(
+    "aozora_search_source_seconds",
+    "Search latency per source",
+    ("source",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+# Outcomes
+SEARCH_SOURCE_TOTAL = Counter(
+    "aozora_search_source_total",
+    "Searches per source by outcome (ok, error, timeout)",
+    ("source", "outcome"),
+    registry=REGISTRY,
+)
+EXA_REQUESTS_TOTAL = Counter(
+    "aozora_exa_requests_total",
+    "Exa API calls by outcome (ok, error, timeout)",
+    ("outcome",),
+    registry=REGISTRY,
+)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records how long encoding the body took."""
+
+    def render(self, content: Any) -> bytes:
+        with SERIALIZATION_SECONDS.labels(kind="response").time():
+            return super().render(content)
@@ -0,0 +1,135 @@
+"""Exact vector search over the chunks of a small metadata scope."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from chromadb.api.models.Collection import Collection
+
+
+@dataclass
+class ScopedChunks:
+    """All chunks matching a metadata filter, with their vectors in memory."""
+
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict]
+    vectors: np.ndarray  # (n, dim) float32
+    space: str  # Chroma distance function: "l2", "cosine" or "ip"
+
+    def __post_init__(self) -> None:
+        self._sq_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+
+    def distances(self, query: np.ndarray) -> np.ndarray:
+        """Distances from one query vector to every chunk, as Chroma computes them."""
+        dots = self.vectors @ query
+        if self.space == "cosine":
+            norms = np.sqrt(self._sq_norms) * np.linalg.norm(query)
+            return 1.0 - dots / np.maximum(norms, 1e-12)
+        if self.space == "ip":
+            return 1.0 - dots
+        # Chroma's l2 is the squared euclidean distance
+        return np.maximum(self._sq_norms - 2 * dots + query @ query, 0.0)
+
+    def search(self, query: list[float], k: int) -> tuple[list[int], list[float]]:
+        """
+        Exact k nearest chunks to a query vector.
+
+        Returns:
+            Tuple of (chunk positions, distances), nearest first
+        """
+        if not self.ids:
+            return [], []
+        distances = self.distances(np.asarray(query, dtype=np.float32))
+        if len(distances) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+        else:
+            top = np.arange(len(distances))
+        top = top[np.argsort(distances[top], kind="stable")]
+        return top.tolist(), distances[top].tolist()
+
+
+def distance_space(collection: Collection) -> str:
+    """Get the distance function a collection's HNSW index was built with."""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+class ScopedVectorCache:
+    """
+    LRU of scopes loaded for brute-force search.
+
+    Scopes with more than max_chunks chunks are remembered as too large,
+    so later queries go straight to the HNSW index without recounting.
+    Entries expire after ttl_seconds, and all are dropped when the
+    collection's chunk count changes, so re-ingested works are reloaded.
+    """
+
+    def __init__(self, max_chunks: int, max_scopes: int, ttl_seconds: float = 300.0):
+        self.max_chunks = max_chunks
+        self.max_scopes = max_scopes
+        self.ttl_seconds = ttl_seconds
+        # Key -> (expires_at, chunks or None if too large)
+        self._entries: OrderedDict[str, tuple[float, Optional[ScopedChunks]]] = OrderedDict()
+        self._count: Optional[int] = None  # Collection size the entries were loaded at
+        self._lock = threading.Lock()
+
+    def get(self, collection: Collection, where: dict) -> Optional[ScopedChunks]:
+        """
+        Get the chunks for a filter, loading them if the scope is small.
+
+        Returns:
+            ScopedChunks, or None if the scope is too large for brute force
+        """
+        key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+        count = collection.count()
+        with self._lock:
+            if count != self._count:
+                self._entries.clear()
+                self._count = count
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        scoped = self._load(collection, where)
+        with self._lock:
+            # Not stored if the collection changed while loading
+            if self._count == count:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, scoped)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_scopes:
+                    self._entries.popitem(last=False)
+        return scoped
+
+    def _load(self, collection: Collection, where: dict) -> Optional[ScopedChunks]:
+        """Fetch a scope's ids, then its vectors if it is small enough."""
+        ids = collection.get(where=where, include=[], limit=self.max_chunks + 1)["ids"]
+        if len(ids) > self.max_chunks:
+            return None
+        if not ids:
+            return ScopedChunks([], [], [], np.zeros((0, 0), dtype=np.float32), "l2")
+
+        data = collection.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+        embeddings = data["embeddings"]
+        vectors = np.asarray(embeddings if embeddings is not None else [], dtype=np.float32)
+        return ScopedChunks(
+            ids=data["ids"],
+            documents=[doc or "" for doc in data["documents"]],
+            metadatas=[meta or {} for meta in data["metadatas"]],
+            vectors=vectors.reshape(len(data["ids"]), -1),
+            space=distance_space(collection),
+        )
+
+    def clear(self) -> None:
+        """Forget all loaded scopes."""
+        with self._lock:
+            self._entries.clear()
+            self._count = None
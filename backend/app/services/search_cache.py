@@ -0,0 +1,132 @@
+"""TTL result cache with in-flight request coalescing for searches."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from app.services.timings import RequestTimings, current_timings, start_timings
+
+T = TypeVar("T")
+
+
+class SearchResultCache(Generic[T]):
+    """
+    LRU cache of search results with a time-to-live and singleflight.
+
+    Concurrent lookups for a key that isn't cached yet share one call to the
+    loader instead of each running their own search. The shared call collects
+    its own stage timings, which every caller waiting on it adds to theirs.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._inflight: dict[tuple[Hashable, Hashable], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """Get a cached value if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def lookup(self, key: Hashable) -> Optional[T]:
+        """Get a cached value, counting the lookup as a hit or miss."""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key: Hashable, value: T) -> None:
+        """Cache a value, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool] = lambda value: True,
+        group: Hashable = None,
+    ) -> tuple[T, bool]:
+        """
+        Get a cached value, or load it once for all concurrent callers.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value on a miss
+            cacheable: Predicate deciding whether a loaded value is stored
+            group: Other loader inputs (e.g. the deadline); only callers with
+                the same group share a load, but a stored value answers all
+
+        Returns:
+            Tuple of (value, whether it came from the cache)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, True
+
+        flight = (key, group)
+        task = self._inflight.get(flight)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(flight, loader, cacheable))
+            self._inflight[flight] = task
+
+        # A caller going away (e.g. client disconnect) must not cancel the
+        # search other callers are waiting on
+        value, load_timings = await asyncio.shield(task)
+        timings = current_timings()
+        if timings is not None:
+            timings.merge(load_timings)
+        return value, False
+
+    async def _load(
+        self,
+        flight: tuple[Hashable, Hashable],
+        loader: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool],
+    ) -> tuple[T, RequestTimings]:
+        """Run the loader with its own timings (in this task's context) and store its result."""
+        timings = start_timings()
+        try:
+            value = await loader()
+            if cacheable(value):
+                self.put(flight[0], value)
+            return value, timings
+        finally:
+            del self._inflight[flight]
+
+    def stats(self) -> dict:
+        """Get cache and coalescing counters."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -3,12 +3,20 @@
 import asyncio
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import AsyncIterator
 
-from app.schemas import SearchResultItem
-from app.services.chroma_client import query_similar
+from app.schemas import SearchMode, SearchResultItem
+from app.services.chroma_client import query_similar, query_similar_batch
 from app.services.exa_client import search_web
+from app.services.lexical_index import LexicalIndex, get_lexical_index
+from app.services.metrics import SEARCH_SOURCE_SECONDS, SEARCH_SOURCE_TOTAL
+from app.services.search_cache import SearchResultCache
+from app.services.search_scope import SearchScope
+from app.services.timings import count_results, current_timings
 from app.settings import get_settings
+from app.utils.query import normalize_query
 
 logger = logging.getLogger(__name__)
 
@@ -23,74 +31,513 @@ class SearchResults:
     errors: list[str]
 
 
+@dataclass
+class SourceResult:
+    """Results from one search source, reported as soon as it finishes."""
+
+    source: str  # "aozora" or "web"
+    results: list[SearchResultItem]
+    elapsed_ms: int
+    error: str | None = None
+
+
+# Reciprocal rank fusion constant; damps the weight of the very top ranks
+RRF_K = 60
+
+
+def fuse_results(result_lists: list[list[SearchResultItem]], k: int) -> list[SearchResultItem]:
+    """
+    Merge ranked result lists with reciprocal rank fusion.
+
+    The retrievers' own scores aren't comparable (cosine similarity vs BM25
+    relative to the top hit), so each fused item's score is its RRF value,
+    scaled so that ranking first in every list is 1.0.
+
+    Args:
+        result_lists: Ranked results from each retriever
+        k: Number of results to return
+
+    Returns:
+        Top k fused results, by descending score
+    """
+    fused: dict[str, float] = {}
+    items: dict[str, SearchResultItem] = {}
+    for results in result_lists:
+        for rank, item in enumerate(results):
+            fused[item.id] = fused.get(item.id, 0.0) + 1.0 / (RRF_K + rank + 1)
+            items.setdefault(item.id, item)
+    best = len(result_lists) / (RRF_K + 1)
+    ranked = sorted(fused, key=lambda item_id: -fused[item_id])
+    return [
+        items[item_id].model_copy(update={"score": fused[item_id] / best})
+        for item_id in ranked[:k]
+    ]
+
+
+def _lexical_index(search_mode: SearchMode) -> LexicalIndex | None:
+    """Get the lexical index for a mode that uses it, if it is built."""
+    if search_mode == SearchMode.VECTOR or not get_settings().lexical_index_enabled:
+        return None
+    index = get_lexical_index().current()
+    if index is None and search_mode == SearchMode.LEXICAL:
+        raise RuntimeError("Lexical index is not available")
+    return index
+
+
+async def search_aozora(
+    query: str,
+    k: int,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+    degraded: list[str] | None = None,
+) -> list[SearchResultItem]:
+    """
+    Retrieve Aozora chunks by vector search, BM25 or both fused.
+
+    Hybrid mode degrades to whichever retriever is available: vector only
+    while the lexical index is (re)building, lexical only if vector search
+    fails.
+
+    Args:
+        query: Search query
+        k: Number of results
+        search_mode: Retrieval mode
+        scope: Optional author/work restriction
+        degraded: If given, a reason is appended when hybrid search falls
+            back to lexical results
+
+    Returns:
+        List of SearchResultItem
+    """
+    where_filter = scope.where() if scope else None
+    index = _lexical_index(search_mode)
+    if index is None:
+        return await query_similar(query, k=k, where_filter=where_filter)
+    if search_mode == SearchMode.LEXICAL:
+        return await asyncio.to_thread(index.query, query, k, scope)
+
+    vector, lexical = await asyncio.gather(
+        query_similar(query, k=k * 2, where_filter=where_filter),
+        asyncio.to_thread(index.query, query, k * 2, scope),
+        return_exceptions=True,
+    )
+    if isinstance(lexical, BaseException):
+        raise lexical
+    count_results("lexical", len(lexical))
+    if isinstance(vector, BaseException):
+        logger.warning(f"Vector search failed, using lexical results only: {vector}")
+        if degraded is not None:
+            degraded.append(f"vector search failed ({vector}), lexical results only")
+        return lexical[:k]
+    count_results("vector", len(vector))
+    return fuse_results([vector, lexical], k)
+
+
+async def search_aozora_batch(
+    queries: list[str],
+    k: int,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+    degraded: list[str] | None = None,
+) -> list[list[SearchResultItem]]:
+    """Batch form of search_aozora, with one embedding and one Chroma call."""
+    where_filter = scope.where() if scope else None
+    index = _lexical_index(search_mode)
+    if index is None:
+        return await query_similar_batch(queries, k=k, where_filter=where_filter)
+
+    def lexical_batch(fetch: int) -> list[list[SearchResultItem]]:
+        return [index.query(q, fetch, scope) for q in queries]
+
+    if search_mode == SearchMode.LEXICAL:
+        return await asyncio.to_thread(lexical_batch, k)
+
+    vector, lexical = await asyncio.gather(
+        query_similar_batch(queries, k=k * 2, where_filter=where_filter),
+        asyncio.to_thread(lexical_batch, k * 2),
+        return_exceptions=True,
+    )
+    if isinstance(lexical, BaseException):
+        raise lexical
+    if isinstance(vector, BaseException):
+        logger.warning(f"Vector search failed, using lexical results only: {vector}")
+        if degraded is not None:
+            degraded.append(f"vector search failed ({vector}), lexical results only")
+        return [results[:k] for results in lexical]
+    return [fuse_results([v, lex], k) for v, lex in zip(vector, lexical)]
+
+
+_SOURCE_LABELS = {"aozora": "Internal search", "web": "Web search"}
+
+
+def _record_source(source: str, outcome: str, seconds: float) -> None:
+    """Count a source's outcome (ok, error or timeout) and observe its latency."""
+    SEARCH_SOURCE_TOTAL.labels(source=source, outcome=outcome).inc()
+    SEARCH_SOURCE_SECONDS.labels(source=source).observe(seconds)
+    timings = current_timings()
+    if timings is not None:
+        timings.add(f"{source}_source", seconds)
+
+
+async def iter_source_results(
+    query: str,
+    k_internal: int = 5,
+    k_web: int = 3,
+    include_web: bool = True,
+    timeout_ms: int | None = None,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+) -> AsyncIterator[SourceResult]:
+    """
+    Search all sources in parallel, yielding each one's results as it completes.
+
+    Sources still running at the deadline are cancelled and reported with a
+    timeout error; results that already finished are kept. Hybrid Aozora
+    results that fell back to one retriever are reported with an error too.
+    Closing the iterator early (e.g. on client disconnect) cancels
+    outstanding work.
+
+    Args:
+        query: Search query
+        k_internal: Number of internal results
+        k_web: Number of web results
+        include_web: Whether to include web search
+        timeout_ms: Custom timeout in milliseconds
+        search_mode: Vector, lexical or hybrid retrieval for Aozora results
+        scope: Optional author/work restriction for Aozora results
+
+    Yields:
+        SourceResult per source, in completion order
+    """
+    settings = get_settings()
+    timeout = (timeout_ms or settings.search_timeout_ms) / 1000.0
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+
+    degraded: list[str] = []
+    aozora = search_aozora(query, k_internal, search_mode, scope, degraded)
+    sources = {asyncio.ensure_future(aozora): "aozora"}
+    if include_web and k_web > 0:
+        web = search_web(query, k=k_web, timeout_seconds=min(timeout, 2.0))
+        sources[asyncio.ensure_future(web)] = "web"
+
+    pending = set(sources)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                source = sources[task]
+                elapsed = loop.time() - start
+                elapsed_ms = int(elapsed * 1000)
+                if task.exception() is not None:
+                    _record_source(source, "error", elapsed)
+                    message = f"{_SOURCE_LABELS[source]} error: {task.exception()}"
+                    logger.error(message)
+                    yield SourceResult(source, [], elapsed_ms, message)
+                else:
+                    _record_source(source, "ok", elapsed)
+                    message = None
+                    if source == "aozora" and degraded:
+                        message = f"{_SOURCE_LABELS[source]} degraded: {'; '.join(degraded)}"
+                    yield SourceResult(source, task.result(), elapsed_ms, message)
+
+        if pending:
+            logger.warning(f"Search timeout after {timeout}s")
+        for task in pending:
+            task.cancel()
+        for task in sorted(pending, key=lambda t: sources[t]):
+            _record_source(sources[task], "timeout", timeout)
+            message = f"{_SOURCE_LABELS[sources[task]]} timeout - partial results returned"
+            yield SourceResult(sources[task], [], int(timeout * 1000), message)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 async def run_parallel_search(
     query: str,
     k_internal: int = 5,
     k_web: int = 3,
     include_web: bool = True,
     timeout_ms: int | None = None,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
 ) -> SearchResults:
     """
     Run parallel search across internal (ChromaDB) and external (Exa) sources.
 
+    A source that misses the deadline doesn't discard the others' results.
+
     Args:
         query: Search query
         k_internal: Number of internal results
         k_web: Number of web results
         include_web: Whether to include web search
         timeout_ms: Custom timeout in milliseconds
+        search_mode: Vector, lexical or hybrid retrieval for Aozora results
+        scope: Optional author/work restriction for Aozora results
 
     Returns:
         SearchResults with combined results
     """
+    start_time = time.time()
+    results: dict[str, list[SearchResultItem]] = {"aozora": [], "web": []}
+    errors: list[str] = []
+
+    async for outcome in iter_source_results(
+        query, k_internal, k_web, include_web, timeout_ms, search_mode, scope
+    ):
+        results[outcome.source] = outcome.results
+        if outcome.error:
+            errors.append(outcome.error)
+
+    elapsed_ms = int((time.time() - start_time) * 1000)
+
+    return SearchResults(
+        aozora_results=results["aozora"],
+        web_results=results["web"],
+        timing_ms=elapsed_ms,
+        errors=errors,
+    )
+
+
+async def run_batch_search(
+    queries: list[str],
+    k_internal: int = 5,
+    k_web: int = 3,
+    include_web: bool = True,
+    timeout_ms: int | None = None,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+) -> list[SearchResults]:
+    """
+    Run many searches with one embedding call and one Chroma request.
+
+    Web searches for all queries run concurrently. On timeout, whatever has
+    finished is kept and the rest is reported as an error per query.
+
+    Args:
+        queries: Search queries
+        k_internal: Number of internal results per query
+        k_web: Number of web results per query
+        include_web: Whether to include web search
+        timeout_ms: Custom timeout in milliseconds for the whole batch
+        search_mode: Vector, lexical or hybrid retrieval for Aozora results
+        scope: Optional author/work restriction for Aozora results
+
+    Returns:
+        One SearchResults per query, in order; timing_ms is the time until
+        that query's results were complete
+    """
     settings = get_settings()
     timeout = (timeout_ms or settings.search_timeout_ms) / 1000.0
-    errors: list[str] = []
+    normalized = [normalize_query(q) for q in queries]
 
     start_time = time.time()
+    finished_at: dict[asyncio.Task, float] = {}
 
-    # Prepare tasks
-    tasks = [query_similar(query, k=k_internal)]
+    def track(task: asyncio.Task) -> asyncio.Task:
+        task.add_done_callback(lambda t: finished_at.setdefault(t, time.time()))
+        return task
 
+    degraded: list[str] = []
+    internal_task = track(
+        asyncio.ensure_future(
+            search_aozora_batch(normalized, k_internal, search_mode, scope, degraded)
+        )
+    )
+    # One web search per distinct query
+    web_by_query: dict[str, asyncio.Task] = {}
     if include_web and k_web > 0:
-        tasks.append(search_web(query, k=k_web, timeout_seconds=min(timeout, 2.0)))
+        for q in dict.fromkeys(normalized):
+            web_by_query[q] = track(
+                asyncio.ensure_future(search_web(q, k=k_web, timeout_seconds=min(timeout, 2.0)))
+            )
+    web_tasks = [web_by_query.get(q) for q in normalized]
 
-    # Run in parallel with timeout
-    try:
-        results = await asyncio.wait_for(
-            asyncio.gather(*tasks, return_exceptions=True),
-            timeout=timeout,
+    all_tasks = [internal_task, *web_by_query.values()]
+    _, pending = await asyncio.wait(all_tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Batch search timeout after {timeout}s")
+
+    for task in all_tasks:
+        source = "aozora" if task is internal_task else "web"
+        if task in pending:
+            _record_source(source, "timeout", timeout)
+        else:
+            state = "error" if task.exception() is not None else "ok"
+            _record_source(source, state, finished_at.get(task, time.time()) - start_time)
+
+    def outcome(task: asyncio.Task, label: str, errors: list[str]) -> list[SearchResultItem]:
+        if task in pending:
+            errors.append(f"{label} timeout - partial results returned")
+            return []
+        if task.exception() is not None:
+            logger.error(f"{label} error: {task.exception()}")
+            errors.append(f"{label} error: {task.exception()}")
+            return []
+        return task.result()
+
+    internal_errors: list[str] = []
+    internal_results = outcome(internal_task, "Internal search", internal_errors)
+    if degraded and not internal_errors:
+        internal_errors.append(f"Internal search degraded: {'; '.join(degraded)}")
+    internal_done = finished_at.get(internal_task, time.time())
+
+    batch_results = []
+    for i, web_task in enumerate(web_tasks):
+        errors = list(internal_errors)
+        aozora_results = internal_results[i] if internal_results else []
+        web_results: list[SearchResultItem] = []
+        done = internal_done
+        if web_task is not None:
+            web_results = outcome(web_task, "Web search", errors)
+            done = max(done, finished_at.get(web_task, time.time()))
+        batch_results.append(
+            SearchResults(
+                aozora_results=aozora_results,
+                web_results=web_results,
+                timing_ms=int((done - start_time) * 1000),
+                errors=errors,
+            )
         )
-    except asyncio.TimeoutError:
-        logger.warning(f"Search timeout after {timeout}s")
-        errors.append("Search timeout - partial results returned")
-        results = [[], []]
-
-    # Process results
-    aozora_results: list[SearchResultItem] = []
-    web_results: list[SearchResultItem] = []
-
-    # Internal results
-    if len(results) > 0:
-        if isinstance(results[0], Exception):
-            logger.error(f"Internal search error: {results[0]}")
-            errors.append(f"Internal search error: {results[0]}")
-        elif isinstance(results[0], list):
-            aozora_results = results[0]
-
-    # Web results
-    if include_web and len(results) > 1:
-        if isinstance(results[1], Exception):
-            logger.error(f"Web search error: {results[1]}")
-            errors.append(f"Web search error: {results[1]}")
-        elif isinstance(results[1], list):
-            web_results = results[1]
 
-    elapsed_ms = int((time.time() - start_time) * 1000)
+    return batch_results
 
-    return SearchResults(
-        aozora_results=aozora_results,
-        web_results=web_results,
-        timing_ms=elapsed_ms,
-        errors=errors,
+
+@lru_cache
+def get_search_cache() -> SearchResultCache[SearchResults]:
+    """Get the process-wide search result cache."""
+    settings = get_settings()
+    return SearchResultCache(
+        max_entries=settings.search_cache_max_entries,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+    )
+
+
+def search_cache_key(
+    normalized_query: str,
+    k_internal: int,
+    k_web: int,
+    include_web: bool,
+    search_mode: SearchMode,
+    scope: SearchScope | None = None,
+) -> tuple:
+    """Build the result cache key for a normalized query and its parameters."""
+    k_web = k_web if include_web else 0
+    return (normalized_query, k_internal, k_web, include_web, search_mode, scope)
+
+
+async def run_cached_search(
+    query: str,
+    k_internal: int = 5,
+    k_web: int = 3,
+    include_web: bool = True,
+    timeout_ms: int | None = None,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+) -> SearchResults:
+    """
+    Run a search through the result cache.
+
+    Queries are keyed by their normalized text and result counts, so
+    repeated identical searches share one backend call, as do concurrent
+    ones with the same deadline (a shorter one could cut the search short).
+    Results with errors (timeouts, backend failures, hybrid search degraded
+    to one retriever) are not cached, so an outage isn't served for the TTL.
+
+    Args:
+        query: Search query
+        k_internal: Number of internal results
+        k_web: Number of web results
+        include_web: Whether to include web search
+        timeout_ms: Custom timeout in milliseconds
+        search_mode: Vector, lexical or hybrid retrieval for Aozora results
+        scope: Optional author/work restriction for Aozora results
+
+    Returns:
+        SearchResults, with timing_ms measuring this call
+    """
+    normalized = normalize_query(query)
+    key = search_cache_key(normalized, k_internal, k_web, include_web, search_mode, scope)
+    start_time = time.time()
+
+    results, from_cache = await get_search_cache().get_or_load(
+        key,
+        lambda: run_parallel_search(
+            normalized, k_internal, k_web, include_web, timeout_ms, search_mode, scope
+        ),
+        cacheable=lambda r: not r.errors,
+        group=timeout_ms or get_settings().search_timeout_ms,
     )
+    timings = current_timings()
+    if timings is not None:
+        timings.search_cache = "hit" if from_cache else "miss"
+
+    return replace(results, timing_ms=int((time.time() - start_time) * 1000))
+
+
+async def iter_cached_source_results(
+    query: str,
+    k_internal: int = 5,
+    k_web: int = 3,
+    include_web: bool = True,
+    timeout_ms: int | None = None,
+    search_mode: SearchMode = SearchMode.HYBRID,
+    scope: SearchScope | None = None,
+) -> AsyncIterator[SourceResult]:
+    """
+    Stream per-source results, answering from the result cache when possible.
+
+    Complete results (no errors) are stored in the cache once all sources
+    have finished.
+
+    Args:
+        query: Search query
+        k_internal: Number of internal results
+        k_web: Number of web results
+        include_web: Whether to include web search
+        timeout_ms: Custom timeout in milliseconds
+        search_mode: Vector, lexical or hybrid retrieval for Aozora results
+        scope: Optional author/work restriction for Aozora results
+
+    Yields:
+        SourceResult per source, in completion order
+    """
+    normalized = normalize_query(query)
+    key = search_cache_key(normalized, k_internal, k_web, include_web, search_mode, scope)
+    cache = get_search_cache()
+
+    cached = cache.lookup(key)
+    timings = current_timings()
+    if timings is not None:
+        timings.search_cache = "hit" if cached is not None else "miss"
+    if cached is not None:
+        yield SourceResult("aozora", cached.aozora_results, 0)
+        if include_web and k_web > 0:
+            yield SourceResult("web", cached.web_results, 0)
+        return
+
+    start_time = time.time()
+    results: dict[str, list[SearchResultItem]] = {"aozora": [], "web": []}
+    errors: list[str] = []
+    async for outcome in iter_source_results(
+        normalized, k_internal, k_web, include_web, timeout_ms, search_mode, scope
+    ):
+        results[outcome.source] = outcome.results
+        if outcome.error:
+            errors.append(outcome.error)
+        yield outcome
+
+    if not errors:
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        cache.put(key, SearchResults(results["aozora"], results["web"], elapsed_ms, errors))
@@ -0,0 +1,42 @@
+"""Author / work scoping for Aozora retrieval."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SearchScope:
+    """
+    Restricts retrieval to chunks from given authors and/or works.
+
+    Hashable, so it can be part of cache keys.
+    """
+
+    authors: tuple[str, ...] = ()
+    work_ids: tuple[str, ...] = ()
+
+    @classmethod
+    def create(
+        cls, authors: Optional[list[str]] = None, work_ids: Optional[list[str]] = None
+    ) -> Optional["SearchScope"]:
+        """Build a scope from request fields, or None when unscoped."""
+        if not authors and not work_ids:
+            return None
+        return cls(tuple(sorted(set(authors or ()))), tuple(sorted(set(work_ids or ()))))
+
+    def where(self) -> dict:
+        """Chroma metadata filter for this scope."""
+        conditions = []
+        if self.authors:
+            conditions.append({"author": {"$in": list(self.authors)}})
+        if self.work_ids:
+            conditions.append({"work_id": {"$in": list(self.work_ids)}})
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def matches(self, meta: dict) -> bool:
+        """Whether a chunk's metadata falls inside the scope."""
+        if self.authors and meta.get("author") not in self.authors:
+            return False
+        if self.work_ids and meta.get("work_id") not in self.work_ids:
+            return False
+        return True
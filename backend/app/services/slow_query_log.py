@@ -0,0 +1,54 @@
+"""JSONL log of searches slower than a configurable threshold."""
+
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryLog:
+    """
+    Appends one JSON object per slow search to a file.
+
+    Each entry has the normalized query, the request parameters and the
+    stage breakdown, so a slow chat answer can be traced to embedding,
+    vector search, Exa or response building after the fact.
+    """
+
+    def __init__(self, path: str, threshold_ms: int):
+        self.path = Path(path).resolve()
+        self.threshold_ms = threshold_ms
+        self.logged = 0
+        self._lock = threading.Lock()
+
+    def is_slow(self, total_ms: int) -> bool:
+        """Whether a search took long enough to be logged."""
+        return total_ms >= self.threshold_ms
+
+    def record(self, entry: dict) -> None:
+        """Append an entry, stamped with the current time."""
+        line = json.dumps({"ts": time.time(), **entry}, ensure_ascii=False)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                self.logged += 1
+        except OSError as e:
+            logger.warning(f"Could not write slow query log {self.path}: {e}")
+
+
+@lru_cache
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    """Get the slow query log, or None when disabled (threshold 0)."""
+    settings = get_settings()
+    if settings.slow_query_threshold_ms <= 0:
+        return None
+    return SlowQueryLog(settings.slow_query_log_path, settings.slow_query_threshold_ms)
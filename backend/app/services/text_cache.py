@@ -0,0 +1,100 @@
+"""Process-wide LRU cache of cleaned work texts, bounded by total bytes."""
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+from app.settings import get_settings
+from app.utils.sentence_index import SentenceIndex
+
+
+@dataclass
+class CachedText:
+    """A cleaned work text with its display metadata and sentence index."""
+
+    work_id: str
+    title: str
+    author: str
+    text: str
+    etag: str
+    sentences: SentenceIndex = field(init=False)
+    size_bytes: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.sentences = SentenceIndex(self.text)
+        self.size_bytes = sys.getsizeof(self.text) + self.sentences.size_bytes
+
+
+class TextCache:
+    """
+    LRU cache of cleaned texts bounded by total size in bytes.
+
+    A single long novel can outweigh hundreds of short stories, so the budget
+    is expressed in bytes rather than entry count.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CachedText] = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedText]:
+        """Get a cached text and mark it as most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: CachedText) -> None:
+        """Insert a text, evicting least recently used entries over budget."""
+        if value.size_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size_bytes
+
+            self._entries[key] = value
+            self.total_bytes += value.size_bytes
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size_bytes
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Get cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Global cache instance
+_text_cache: Optional[TextCache] = None
+
+
+def get_text_cache() -> TextCache:
+    """Get or create the text cache instance."""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache(max_bytes=get_settings().text_cache_max_bytes)
+    return _text_cache
@@ -0,0 +1,106 @@
+"""Per-request stage timings, collected across tasks and worker threads."""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from app.schemas import DebugTimings, StageTiming
+
+
+class RequestTimings:
+    """
+    Durations of the stages one search went through.
+
+    Held in a context variable, so tasks spawned by the request and calls
+    run on BoundedExecutor or asyncio.to_thread threads add to the same
+    instance. A stage that runs several times (e.g. one work-text read per
+    hit) is summed.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, list] = {}  # name -> [seconds, calls]
+        self.result_counts: dict[str, int] = {}
+        self.search_cache: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add one run of a stage."""
+        with self._lock:
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, name: str, results: int) -> None:
+        """Record how many results a source or retriever returned."""
+        with self._lock:
+            self.result_counts[name] = results
+
+    def merge(self, other: "RequestTimings") -> None:
+        """Add the stages and result counts of work done for this request elsewhere."""
+        with other._lock:
+            stages = {name: list(entry) for name, entry in other.stages.items()}
+            result_counts = dict(other.result_counts)
+        with self._lock:
+            for name, (seconds, calls) in stages.items():
+                entry = self.stages.setdefault(name, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+            self.result_counts.update(result_counts)
+
+    @property
+    def elapsed_ms(self) -> int:
+        """Milliseconds since the request started."""
+        return int((time.perf_counter() - self.started) * 1000)
+
+    def report(self) -> DebugTimings:
+        """Snapshot the timings as a response field."""
+        with self._lock:
+            stages = {
+                name: StageTiming(ms=round(seconds * 1000, 3), calls=calls)
+                for name, (seconds, calls) in self.stages.items()
+            }
+            return DebugTimings(
+                total_ms=self.elapsed_ms,
+                stages=stages,
+                result_counts=dict(self.result_counts),
+                search_cache=self.search_cache,
+            )
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_timings() -> RequestTimings:
+    """Start collecting stage timings for the current request."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Get the current request's timings, if collecting."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a stage of the current request; a no-op outside one."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def count_results(name: str, results: int) -> None:
+    """Record a result count on the current request, if collecting."""
+    timings = _current.get()
+    if timings is not None:
+        timings.count(name, results)
@@ -0,0 +1,65 @@
+"""Memory-mapped vector store used when VECTOR_BACKEND=memmap."""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from app.settings import get_settings
+from app.utils.aozora import MANIFEST_FILE, VectorStore
+
+logger = logging.getLogger(__name__)
+
+_store: Optional[VectorStore] = None
+_store_version: Optional[tuple[int, int]] = None
+_store_checked = False
+_store_lock = threading.Lock()
+
+
+def _manifest_version(path: Path) -> Optional[tuple[int, int]]:
+    """Identify the export at path by its manifest's inode and mtime, or None if absent."""
+    try:
+        stat = os.stat(path / MANIFEST_FILE)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_vector_store() -> Optional[VectorStore]:
+    """
+    Get the exported vector store, or None if it hasn't been exported.
+
+    The manifest is checked on every call, and a new export (which replaces
+    the whole directory) is mapped in place of the old one. Queries already
+    running keep the arrays they hold.
+    """
+    global _store, _store_version, _store_checked
+    path = Path(get_settings().vector_store_dir).resolve()
+    version = _manifest_version(path)
+    if _store_checked and version == _store_version:
+        return _store
+
+    with _store_lock:
+        if not _store_checked or version != _store_version:
+            if _store_checked:
+                logger.info(f"Vector store at {path} changed; reopening")
+            _store = None
+            try:
+                _store = VectorStore(path)
+                logger.info(f"Vector store: {len(_store)} chunks ({_store.space}) from {path}")
+                if get_settings().vector_index == "int8" and _store.codes is None:
+                    logger.warning("Vector store has no int8 codes; searching exactly")
+            except FileNotFoundError:
+                logger.warning(f"Vector store not found at {path}; run scripts/export_vectors.py")
+            except ValueError as e:
+                logger.error(f"Vector store at {path} unusable: {e}")
+            _store_version, _store_checked = version, True
+    return _store
+
+
+def reset_vector_store() -> None:
+    """Drop the open store so the next query maps the export again."""
+    global _store, _store_version, _store_checked
+    with _store_lock:
+        _store, _store_version, _store_checked = None, None, False
@@ -0,0 +1,260 @@
+"""Startup warmup of the search backends, tracked for the /ready endpoint."""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Optional
+
+from app.services.chroma_client import get_collection, query_similar
+from app.services.embeddings import get_embedding_service
+from app.services.lexical_index import get_lexical_index
+from app.services.vector_store import get_vector_store
+from app.services.work_texts import get_text_store
+from app.services.works_catalog import get_catalog
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Query used to load the index and embedding model before real traffic
+PROBE_QUERY = "吾輩は猫である"
+
+COMPONENTS = (
+    "vector_index",
+    "embedder",
+    "probe_query",
+    "lexical_index",
+    "works_catalog",
+    "work_texts",
+)
+
+
+class ComponentSkippedError(Exception):
+    """Raised by a warmup step whose component is disabled or not configured."""
+
+
+class ComponentEmptyError(Exception):
+    """Raised by a warmup step whose data hasn't been ingested yet."""
+
+
+@dataclass
+class ComponentStatus:
+    """Warmup state of one component."""
+
+    state: str = "pending"  # pending, running, ready, skipped, empty or failed
+    duration_ms: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class Warmup:
+    """
+    Runs the warmup steps and records per-component durations.
+
+    The service is ready when every step has finished without failing;
+    skipped steps (e.g. a disabled lexical index) don't block readiness,
+    and neither do empty ones, so a fresh deploy with nothing ingested
+    becomes ready (searches just return nothing). Failed and empty steps
+    are retried periodically, e.g. until ingest has created the collection.
+    """
+
+    def __init__(self):
+        self.components = {name: ComponentStatus() for name in COMPONENTS}
+        self.started_at: Optional[float] = None
+        self.duration_ms: Optional[int] = None
+        self.attempts = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether warmup finished and no component failed."""
+        return self.duration_ms is not None and all(
+            status.state in ("ready", "skipped", "empty") for status in self.components.values()
+        )
+
+    def start(self) -> None:
+        """Run the warmup in a background task, once."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        """Cancel a warmup still in progress."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def run(self) -> None:
+        """Warm all components, retrying failed ones until every one is ready."""
+        self.started_at = time.time()
+        start = time.perf_counter()
+        retry_seconds = get_settings().warmup_retry_seconds
+        while True:
+            await self.run_once()
+            self.duration_ms = int((time.perf_counter() - start) * 1000)
+            summary = ", ".join(
+                f"{name} {status.state} {status.duration_ms or 0}ms"
+                for name, status in self.components.items()
+            )
+            if all(status.state in ("ready", "skipped") for status in self.components.values()):
+                logger.info(f"Warmup finished in {self.duration_ms}ms: {summary}")
+                return
+            if not self.ready:
+                logger.warning(f"Warmup incomplete after {self.duration_ms}ms: {summary}")
+            if retry_seconds <= 0:
+                return
+            await asyncio.sleep(retry_seconds)
+
+    async def run_once(self) -> None:
+        """
+        Warm the components not yet done.
+
+        The probe query runs once the vector index and the query embedder
+        are ready; the other components are warmed alongside.
+        """
+        self.attempts += 1
+
+        async def vector_chain() -> None:
+            vector_ready = await self._step("vector_index", _warm_vector_index)
+            embedder_ready = await self._step("embedder", _warm_embedder)
+            if vector_ready and embedder_ready:
+                await self._step("probe_query", _probe_query)
+            elif not embedder_ready:
+                self.components["probe_query"] = ComponentStatus("failed", detail="no embedder")
+            elif self.components["vector_index"].state == "empty":
+                self.components["probe_query"] = ComponentStatus("empty", detail="no chunks")
+            else:
+                self.components["probe_query"] = ComponentStatus("failed", detail="no vector index")
+
+        await asyncio.gather(
+            vector_chain(),
+            self._step("lexical_index", _warm_lexical_index),
+            self._step("works_catalog", _warm_works_catalog),
+            self._step("work_texts", _warm_work_texts),
+        )
+
+    async def _step(self, name: str, func: Callable[[], Awaitable[str]]) -> bool:
+        """Run one step and record its outcome; returns whether it succeeded."""
+        status = self.components[name]
+        if status.state in ("ready", "skipped"):
+            return status.state == "ready"
+        status.state = "running"
+        start = time.perf_counter()
+        try:
+            status.detail = await func()
+            status.state = "ready"
+        except ComponentSkippedError as e:
+            status.detail = str(e)
+            status.state = "skipped"
+        except ComponentEmptyError as e:
+            if status.detail != str(e):
+                logger.warning(f"Warmup of {name}: {e}; ready, retrying until ingested")
+            status.detail = str(e)
+            status.state = "empty"
+        except Exception as e:
+            logger.error(f"Warmup of {name} failed: {e}")
+            status.detail = str(e)
+            status.state = "failed"
+        status.duration_ms = int((time.perf_counter() - start) * 1000)
+        return status.state == "ready"
+
+    def report(self) -> dict:
+        """Readiness and per-component warmup status."""
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "duration_ms": self.duration_ms,
+            "attempts": self.attempts,
+            "components": {name: asdict(status) for name, status in self.components.items()},
+        }
+
+
+def _ingested_chunks() -> int:
+    """
+    Count the chunks of the configured vector backend.
+
+    Raises:
+        ComponentEmptyError: If the store or collection is missing or empty
+    """
+    if get_settings().vector_backend == "memmap":
+        store = get_vector_store()
+        if store is None:
+            raise ComponentEmptyError("vector store not found")
+        count = len(store)
+    else:
+        collection = get_collection()
+        if collection is None:
+            raise ComponentEmptyError("Chroma collection not found")
+        count = collection.count()
+    if count == 0:
+        raise ComponentEmptyError("no chunks ingested")
+    return count
+
+
+async def _warm_vector_index() -> str:
+    """Open the vector index and read it into memory."""
+    settings = get_settings()
+    count = await asyncio.to_thread(_ingested_chunks)
+    if settings.vector_backend == "memmap":
+        store = await asyncio.to_thread(get_vector_store)
+        paged = await asyncio.to_thread(store.page_in, settings.vector_index == "int8")
+        return f"{count} chunks, {paged / 1e6:.0f} MB paged in"
+    return f"{count} chunks"
+
+
+async def _warm_embedder() -> str:
+    """
+    Check that queries are embedded with the ingest model.
+
+    Without an embedder Chroma would embed query texts with its default
+    model, whose vectors don't match the stored ones, so this fails
+    rather than falling back.
+    """
+    service = get_embedding_service()
+    if service is None:
+        provider = get_settings().embedding_provider
+        raise RuntimeError(f"no query embedder for provider {provider} (set OPENAI_API_KEY)")
+    return service.model
+
+
+async def _probe_query() -> str:
+    """Run one search so the HNSW index and embedding path are loaded."""
+    results = await query_similar(PROBE_QUERY, k=1)
+    if not results:
+        raise RuntimeError("probe query returned no results")
+    return f"top score {results[0].score:.3f}"
+
+
+async def _warm_lexical_index() -> str:
+    """Build the BM25 index."""
+    if not get_settings().lexical_index_enabled:
+        raise ComponentSkippedError("disabled")
+    # An index built over nothing would never be rebuilt after ingest
+    await asyncio.to_thread(_ingested_chunks)
+    holder = get_lexical_index()
+    await asyncio.to_thread(holder.build)
+    if holder.index is None:
+        raise RuntimeError("lexical index could not be built")
+    return f"{len(holder.index)} chunks"
+
+
+async def _warm_works_catalog() -> str:
+    """Load and refresh the works catalog."""
+    catalog = get_catalog()
+    await asyncio.to_thread(catalog.ensure_loaded)
+    return f"{len(catalog.works)} works"
+
+
+async def _warm_work_texts() -> str:
+    """Open the cleaned-text store used for context windows."""
+    if await asyncio.to_thread(get_text_store) is None:
+        raise ComponentSkippedError("text store not found")
+    return "open"
+
+
+# Global warmup instance
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Get or create the warmup tracker."""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup()
+    return _warmup
@@ -0,0 +1,163 @@
+"""Chunk context windows rebuilt from the per-work cleaned-text store."""
+
+import asyncio
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from app.schemas import SearchResultItem, SourceType
+from app.services.metrics import WORK_TEXT_READ_SECONDS
+from app.settings import get_settings
+from app.utils.aozora import TextStore, context_window
+
+logger = logging.getLogger(__name__)
+
+# Extra characters read on each side of a window to find sentence boundaries
+CONTEXT_SLACK_CHARS = 512
+
+_store: Optional[TextStore] = None
+_store_warned = False
+
+
+def get_text_store() -> Optional[TextStore]:
+    """
+    Get the read-only text store, or None if it isn't available.
+
+    Until it opens, every call tries again (and only the first failure is
+    logged), so a store built by ingest after startup is picked up.
+    """
+    global _store, _store_warned
+    if _store is None:
+        path = Path(get_settings().work_text_store_path).resolve()
+        try:
+            if not path.is_file():
+                raise FileNotFoundError("not a file")
+            store = TextStore(path, readonly=True)
+            try:
+                store.length("")  # Fails on a file that isn't a readable database
+            except sqlite3.Error:
+                store.close()
+                raise
+        except (OSError, sqlite3.Error) as e:
+            if not _store_warned:
+                _store_warned = True
+                logger.warning(f"Work text store at {path} unavailable ({e}); context_text off")
+            return None
+        _store, _store_warned = store, False
+    return _store
+
+
+def close_text_store() -> None:
+    """Close the text store connection."""
+    global _store, _store_warned
+    if _store is not None:
+        _store.close()
+    _store, _store_warned = None, False
+
+
+def context_span(
+    store: TextStore,
+    work_id: str,
+    offset_start: int,
+    offset_end: int,
+    context_tokens: int,
+    chunk_text: Optional[str] = None,
+) -> Optional[tuple[int, int, str]]:
+    """
+    Rebuild a chunk's context window from the stored work text.
+
+    Reads only the region around the chunk, so the result matches the
+    ingest-time window except that sentence boundaries are looked for at
+    most CONTEXT_SLACK_CHARS beyond it.
+
+    Args:
+        store: Cleaned-text store
+        work_id: Work of the chunk
+        offset_start: Chunk start in the cleaned text
+        offset_end: Chunk end in the cleaned text
+        context_tokens: Approximate window size
+        chunk_text: If given, the stored text at the offsets must equal it;
+            chunks ingested with the old drifting offsets don't
+
+    Returns:
+        Tuple of (start, end, text) in work text offsets, or None if the
+        work isn't stored or the offsets don't match chunk_text
+    """
+    half_context = int(context_tokens * 1.5) // 2
+    base = max(0, offset_start - half_context - CONTEXT_SLACK_CHARS)
+    with WORK_TEXT_READ_SECONDS.labels(source="store").time():
+        region = store.get_range(work_id, base, offset_end + half_context + CONTEXT_SLACK_CHARS)
+    if region is None:
+        return None
+    if chunk_text is not None and region[offset_start - base : offset_end - base] != chunk_text:
+        return None
+    start, end = context_window(region, offset_start - base, offset_end - base, context_tokens)
+    return base + start, base + end, region[start:end]
+
+
+def build_context(
+    store: TextStore,
+    work_id: str,
+    offset_start: int,
+    offset_end: int,
+    context_tokens: int,
+    chunk_text: Optional[str] = None,
+) -> Optional[str]:
+    """Rebuild a chunk's context_text, or None if it can't be (see context_span)."""
+    span = context_span(store, work_id, offset_start, offset_end, context_tokens, chunk_text)
+    return span[2] if span else None
+
+
+def with_context(items: list[SearchResultItem], include: bool = True) -> list[SearchResultItem]:
+    """
+    Fill in (or strip) context_text on Aozora results.
+
+    Items are copied rather than modified, since they may be shared with
+    the result cache. Context already present in chunk metadata (from
+    older ingests) is kept, and none is added where the stored text at a
+    chunk's offsets isn't the chunk.
+    """
+    store = get_text_store() if include else None
+    context_tokens = get_settings().context_window_tokens
+    output = []
+    for item in items:
+        if not include:
+            if item.context_text is not None:
+                item = item.model_copy(update={"context_text": None})
+        elif (
+            not item.context_text
+            and store is not None
+            and item.source == SourceType.AOZORA
+            and item.work_id
+            and item.offset_start is not None
+            and item.offset_end is not None
+        ):
+            context = build_context(
+                store, item.work_id, item.offset_start, item.offset_end, context_tokens, item.text
+            )
+            if context is not None:
+                item = item.model_copy(update={"context_text": context})
+        output.append(item)
+    return output
+
+
+async def attach_context(
+    items: list[SearchResultItem], include: bool = True
+) -> list[SearchResultItem]:
+    """Run with_context off the event loop."""
+    if not items:
+        return items
+    return await asyncio.to_thread(with_context, items, include)
+
+
+async def attach_context_batch(
+    result_lists: list[list[SearchResultItem]], include: bool = True
+) -> list[list[SearchResultItem]]:
+    """attach_context for several result lists in one thread hop."""
+    flat = await attach_context([item for items in result_lists for item in items], include)
+    output, position = [], 0
+    for items in result_lists:
+        output.append(flat[position : position + len(items)])
+        position += len(items)
+    return output
@@ -0,0 +1,418 @@
+"""Persistent works catalog backed by SQLite."""
+
+import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+from app.services.works_index import WorksSearchIndex
+from app.settings import get_settings
+from app.utils.aozora import extract_title_author, read_aozora_header
+
+logger = logging.getLogger(__name__)
+
+SKIP_NAME_PATTERNS = ["readme", "index", "copyright"]
+UNKNOWN = "不明"
+
+# Below this many changed files, parsing in-process beats starting a pool
+PARALLEL_PARSE_MIN_FILES = 200
+
+_WORK_ID_PATTERN = re.compile(r"(\d+)")
+
+
+@dataclass
+class CatalogEntry:
+    """Metadata for a single text file in the Aozora repository."""
+
+    work_id: str
+    title: str
+    author: str
+    path: str  # Relative to the repository root
+    encoding: Optional[str]  # None if the file could not be read
+    size: int
+    mtime_ns: int
+    rank: int  # Variant preference, lower is better
+
+    @property
+    def readable(self) -> bool:
+        """Whether the file could be decoded."""
+        return self.encoding is not None
+
+    @property
+    def listed(self) -> bool:
+        """Whether the file yields a proper work for the works list."""
+        return self.readable and self.title != UNKNOWN
+
+
+def is_text_file(name: str) -> bool:
+    """Whether a filename is a plain .txt or a _ruby/_txt ZIP variant."""
+    if name.endswith(".txt"):
+        return True
+    return name.endswith(".zip") and ("_ruby" in name or "_txt" in name)
+
+
+def variant_rank(name: str) -> int:
+    """Rank a filename by variant preference (plain .txt, then _ruby, then _txt)."""
+    if name.endswith(".txt"):
+        return 0
+    if "_ruby" in name:
+        return 1
+    return 2
+
+
+def extract_work_id(name: str) -> Optional[str]:
+    """Extract work_id from filename (e.g., "1234_ruby_12345.txt")."""
+    match = _WORK_ID_PATTERN.match(name)
+    return match.group(1) if match else None
+
+
+def parse_header(path: str, max_bytes: int) -> tuple[Optional[str], str, str]:
+    """
+    Extract (encoding, title, author) from the start of a file.
+
+    Module-level so it can be shipped to worker processes.
+    """
+    try:
+        text, encoding = read_aozora_header(Path(path), max_bytes)
+        title, author = extract_title_author(text)
+        return encoding, title, author
+    except Exception:
+        # Files that can't be read (corrupted ZIP, XML, etc.)
+        return None, UNKNOWN, UNKNOWN
+
+
+def scan_text_files(repo_path: Path) -> list[os.DirEntry]:
+    """
+    Find all text/zip files in the Aozora repository.
+
+    Walks cards/{author_id}/files/ with os.scandir in a single pass instead
+    of running one recursive glob per file pattern.
+    """
+    cards_dir = repo_path / "cards"
+    if not cards_dir.exists():
+        return []
+
+    text_files = []
+    with os.scandir(cards_dir) as authors:
+        for author in authors:
+            if not author.is_dir():
+                continue
+            try:
+                with os.scandir(os.path.join(author.path, "files")) as files:
+                    for file in files:
+                        if not is_text_file(file.name) or not file.is_file():
+                            continue
+                        # Skip certain patterns
+                        filename = file.name.lower()
+                        if any(skip in filename for skip in SKIP_NAME_PATTERNS):
+                            continue
+                        text_files.append(file)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    return text_files
+
+
+def repo_fingerprint(repo_path: Path) -> int:
+    """
+    Fingerprint the repository layout from directory mtimes.
+
+    Adding, removing or replacing files (as a git pull does) touches the
+    mtime of the containing files/ directory, so this only needs one stat
+    per author directory rather than one per text file.
+    """
+    cards_dir = repo_path / "cards"
+    try:
+        stamps = [cards_dir.stat().st_mtime_ns]
+        with os.scandir(cards_dir) as authors:
+            for author in authors:
+                try:
+                    files_stat = os.stat(os.path.join(author.path, "files"))
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                stamps.append(hash((author.name, files_stat.st_mtime_ns)))
+    except FileNotFoundError:
+        return 0
+    return hash(tuple(sorted(stamps)))
+
+
+class WorksCatalog:
+    """
+    Catalog of Aozora works persisted in SQLite.
+
+    Each text file is stored with its size and mtime so that a refresh only
+    re-parses files that were added or changed since the last run.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        db_path: Path,
+        revalidate_seconds: float = 60.0,
+        build_workers: int = 0,
+        header_bytes: int = 8192,
+    ):
+        self.repo_path = repo_path
+        self.db_path = db_path
+        self.revalidate_seconds = revalidate_seconds
+        self.build_workers = build_workers or os.cpu_count() or 1
+        self.header_bytes = header_bytes
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._warmup_lock = threading.Lock()
+        self._entries: dict[str, CatalogEntry] = {}
+        self._listing: tuple[list[CatalogEntry], WorksSearchIndex] = ([], WorksSearchIndex([], []))
+        self._by_work_id: dict[str, CatalogEntry] = {}
+        self._loaded = False
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._fingerprint = 0
+        self._checked_at = 0.0
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize the catalog database."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS works_files (
+                    path TEXT PRIMARY KEY,
+                    work_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    encoding TEXT,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    rank INTEGER NOT NULL
+                )
+            """)
+            conn.commit()
+
+    @property
+    def works(self) -> list[CatalogEntry]:
+        """Listed works, deduplicated by work_id and sorted by title."""
+        return self._listing[0]
+
+    def listing(self) -> tuple[list[CatalogEntry], WorksSearchIndex]:
+        """Listed works together with the title/author index built over them."""
+        return self._listing
+
+    def get(self, work_id: str) -> Optional[CatalogEntry]:
+        """Get the preferred readable file for a work."""
+        return self._by_work_id.get(work_id)
+
+    def absolute_path(self, entry: CatalogEntry) -> Path:
+        """Resolve an entry's path against the repository root."""
+        return self.repo_path / entry.path
+
+    @property
+    def ready(self) -> bool:
+        """Whether the catalog has been refreshed against the repository."""
+        return self._loaded
+
+    def start_warmup(self) -> None:
+        """Load and refresh the catalog in a background thread, once."""
+        with self._warmup_lock:
+            if self._loaded or self._warmup_thread is not None:
+                return
+            self._warmup_thread = threading.Thread(
+                target=self._warmup, name="works-catalog-warmup", daemon=True
+            )
+        self._warmup_thread.start()
+
+    def _warmup(self) -> None:
+        """Background warmup body; a failure allows the next request to retry."""
+        start = time.perf_counter()
+        try:
+            self.ensure_loaded()
+            logger.info(f"Works catalog ready in {time.perf_counter() - start:.2f}s")
+        except Exception:
+            logger.exception("Works catalog warmup failed")
+            self._warmup_thread = None
+
+    def ensure_loaded(self) -> None:
+        """Load the persisted catalog and refresh it once per process."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load()
+            self._refresh()
+            self._loaded = True
+
+    def refresh(self) -> None:
+        """Re-scan the repository and re-parse changed files."""
+        with self._lock:
+            self._refresh()
+
+    def needs_revalidation(self) -> bool:
+        """Whether the repository fingerprint is due for a re-check."""
+        return time.monotonic() - self._checked_at >= self.revalidate_seconds
+
+    def revalidate(self, force: bool = False) -> bool:
+        """
+        Refresh the catalog if the repository changed since the last scan.
+
+        Returns:
+            True if a refresh was performed.
+        """
+        if not force and not self.needs_revalidation():
+            return False
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if repo_fingerprint(self.repo_path) == self._fingerprint:
+                return False
+            logger.info("Aozora repository changed, refreshing catalog")
+            self._refresh()
+            return True
+
+    def _load(self) -> None:
+        """Load all entries from the database."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT work_id, title, author, path, encoding, size, mtime_ns, rank "
+                "FROM works_files"
+            ).fetchall()
+
+        self._entries = {row[3]: CatalogEntry(*row) for row in rows}
+        self._rebuild_indices()
+        logger.info(f"Loaded {len(self._entries)} catalog entries from {self.db_path}")
+
+    def _refresh(self) -> None:
+        """Scan the repository, parse new/changed files and drop removed ones."""
+        self._fingerprint = repo_fingerprint(self.repo_path)
+        self._checked_at = time.monotonic()
+        text_files = scan_text_files(self.repo_path)
+
+        seen: set[str] = set()
+        pending: list[tuple[Path, str, str, os.stat_result]] = []
+        for file in text_files:
+            work_id = extract_work_id(file.name)
+            if work_id is None:
+                continue
+
+            filepath = Path(file.path)
+            rel_path = filepath.relative_to(self.repo_path).as_posix()
+            seen.add(rel_path)
+
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+
+            known = self._entries.get(rel_path)
+            if known and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+                continue
+
+            pending.append((filepath, rel_path, work_id, stat))
+
+        headers = self._parse_headers([str(filepath) for filepath, _, _, _ in pending])
+        changed = [
+            CatalogEntry(
+                work_id=work_id,
+                title=title,
+                author=author,
+                path=rel_path,
+                encoding=encoding,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                rank=variant_rank(filepath.name),
+            )
+            for (filepath, rel_path, work_id, stat), (encoding, title, author) in zip(
+                pending, headers
+            )
+        ]
+
+        removed = [path for path in self._entries if path not in seen]
+        if not changed and not removed:
+            return
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO works_files
+                    (work_id, title, author, path, encoding, size, mtime_ns, rank)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (e.work_id, e.title, e.author, e.path, e.encoding, e.size, e.mtime_ns, e.rank)
+                    for e in changed
+                ],
+            )
+            conn.executemany("DELETE FROM works_files WHERE path = ?", [(p,) for p in removed])
+            conn.commit()
+
+        for path in removed:
+            del self._entries[path]
+        for entry in changed:
+            self._entries[entry.path] = entry
+        self._rebuild_indices()
+
+        logger.info(
+            f"Catalog refreshed: {len(changed)} parsed, {len(removed)} removed, "
+            f"{len(self.works)} unique works"
+        )
+
+    def _parse_headers(self, paths: list[str]) -> list[tuple[Optional[str], str, str]]:
+        """Parse file headers, fanning out over a process pool for large batches."""
+        if len(paths) < PARALLEL_PARSE_MIN_FILES or self.build_workers <= 1:
+            return [parse_header(path, self.header_bytes) for path in paths]
+
+        start = time.perf_counter()
+        logger.info(f"Parsing {len(paths)} file headers with {self.build_workers} workers...")
+        with ProcessPoolExecutor(
+            max_workers=self.build_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            results = list(
+                pool.map(parse_header, paths, repeat(self.header_bytes), chunksize=256)
+            )
+        logger.info(f"Parsed {len(paths)} headers in {time.perf_counter() - start:.2f}s")
+        return results
+
+    def _rebuild_indices(self) -> None:
+        """Rebuild the deduplicated works list and work_id lookup."""
+        ordered = sorted(self._entries.values(), key=lambda e: (e.rank, e.path))
+
+        works_map: dict[str, CatalogEntry] = {}
+        by_work_id: dict[str, CatalogEntry] = {}
+        for entry in ordered:
+            # Keep first occurrence (prefer _ruby over _txt)
+            if entry.listed and entry.work_id not in works_map:
+                works_map[entry.work_id] = entry
+            if entry.readable and entry.work_id not in by_work_id:
+                by_work_id[entry.work_id] = entry
+
+        works = list(works_map.values())
+        # Sort by title
+        works.sort(key=lambda e: e.title)
+
+        index = WorksSearchIndex([w.title for w in works], [w.author for w in works])
+        self._listing = (works, index)
+        self._by_work_id = by_work_id
+
+
+# Global catalog instance
+_catalog: Optional[WorksCatalog] = None
+
+
+def get_catalog() -> WorksCatalog:
+    """Get or create the catalog instance."""
+    global _catalog
+    if _catalog is None:
+        settings = get_settings()
+        _catalog = WorksCatalog(
+            repo_path=Path(settings.aozora_repo_path).resolve(),
+            db_path=Path(settings.works_catalog_path).resolve(),
+            revalidate_seconds=settings.works_revalidate_seconds,
+            build_workers=settings.catalog_build_workers,
+            header_bytes=settings.catalog_header_bytes,
+        )
+    return _catalog
@@ -0,0 +1,128 @@
+"""Character n-gram inverted index over work titles and authors."""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+
+
+def _grams(text: str) -> set[str]:
+    """Character unigrams and bigrams of a string."""
+    grams = set(text)
+    grams.update(text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+@dataclass
+class Suggestion:
+    """A single autocomplete suggestion."""
+
+    text: str
+    kind: str  # "title" or "author"
+    work_count: int
+    position: int  # Position of the first matching work
+
+
+class WorksSearchIndex:
+    """
+    Inverted index from character unigrams/bigrams to work positions.
+
+    Substring queries intersect the posting lists of the query's bigrams
+    and then verify the few remaining candidates, instead of scanning every
+    title and author. Positions refer to the order of the input lists, so
+    results keep the catalog's sort order.
+    """
+
+    def __init__(self, titles: list[str], authors: list[str]):
+        self._titles = [t.lower() for t in titles]
+        self._authors = [a.lower() for a in authors]
+
+        postings: dict[str, array] = {}
+        for position, (title, author) in enumerate(zip(self._titles, self._authors)):
+            for gram in _grams(title) | _grams(author):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(position)
+        self._postings = postings
+
+        # Sorted (lowered, display, kind) entries for prefix lookups
+        title_counts = Counter(titles)
+        author_counts = Counter(authors)
+        first_position: dict[tuple[str, str], int] = {}
+        for position, (title, author) in enumerate(zip(titles, authors)):
+            first_position.setdefault(("title", title), position)
+            first_position.setdefault(("author", author), position)
+
+        self._prefix_keys: list[str] = []
+        self._prefix_values: list[Suggestion] = []
+        entries = sorted(
+            (
+                (text.lower(), Suggestion(text, kind, counts[text], first_position[(kind, text)]))
+                for kind, counts in (("title", title_counts), ("author", author_counts))
+                for text in counts
+            ),
+            key=lambda entry: entry[0],
+        )
+        for key, suggestion in entries:
+            self._prefix_keys.append(key)
+            self._prefix_values.append(suggestion)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def search(self, query: str) -> list[int]:
+        """
+        Find positions whose title or author contains the query.
+
+        Matches the semantics of a case-insensitive substring scan.
+        """
+        q = query.lower()
+        if not q:
+            return list(range(len(self._titles)))
+
+        grams = {q} if len(q) == 1 else {q[i : i + 2] for i in range(len(q) - 1)}
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = list(postings[0])
+        for posting in postings[1:]:
+            candidates = [p for p in candidates if _contains(posting, p)]
+            if not candidates:
+                return []
+
+        if len(q) <= 2:
+            return candidates
+        titles, authors = self._titles, self._authors
+        return [p for p in candidates if q in titles[p] or q in authors[p]]
+
+    def suggest(self, prefix: str, limit: int = 10, scan_limit: int = 1000) -> list[Suggestion]:
+        """
+        Get titles and authors starting with a prefix.
+
+        Suggestions are ranked by number of works, then by length.
+        """
+        q = prefix.lower()
+        if not q:
+            return []
+
+        start = bisect_left(self._prefix_keys, q)
+        matches = []
+        for i in range(start, min(start + scan_limit, len(self._prefix_keys))):
+            if not self._prefix_keys[i].startswith(q):
+                break
+            matches.append(self._prefix_values[i])
+
+        matches.sort(key=lambda s: (-s.work_count, len(s.text), s.text))
+        return matches[:limit]
+
+
+def _contains(posting: array, position: int) -> bool:
+    """Membership test on a sorted posting list."""
+    i = bisect_left(posting, position)
+    return i < len(posting) and posting[i] == position
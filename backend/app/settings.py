@@ -11,17 +11,61 @@ class Settings(BaseSettings):
 
     # Exa API
     exa_api_key: str = ""
+    exa_base_url: str = "https://api.exa.ai"
+    exa_max_connections: int = 10
+
+    # Query embeddings (must match the ingest model)
+    openai_api_key: str = ""
+    openai_base_url: str = "https://api.openai.com/v1"
+    embedding_provider: str = "openai"
+    embedding_model: str = "text-embedding-3-small"
+    embedding_timeout_seconds: float = 5.0
+    embedding_cache_size: int = 1024
+    embedding_batch_window_ms: float = 5.0
+    embedding_max_batch: int = 64
 
     # ChromaDB
     chroma_persist_dir: str = "../chroma"
     chroma_collection: str = "aozora_chunks_v1"
+    chroma_query_workers: int = 4
+    chroma_max_queue: int = 64
+    scoped_bruteforce_max_chunks: int = 5000
+    scoped_cache_entries: int = 32
+    scoped_cache_ttl_seconds: float = 300.0
+
+    # Vector search backend: "chroma", or "memmap" for an exported VectorStore
+    vector_backend: str = "chroma"
+    vector_store_dir: str = "../data/vector_store"
+    vector_index: str = "exact"  # "int8" scans the store's int8 codes, then re-ranks
+    vector_rerank_factor: int = 4  # int8 candidates per requested result
 
     # Aozora Repository
     aozora_repo_path: str = "../data/aozora_repo"
+    works_catalog_path: str = "../data/works_catalog.sqlite"
+    works_revalidate_seconds: int = 60
+    catalog_build_workers: int = 0  # 0 = one per CPU
+    catalog_header_bytes: int = 8192
+    text_cache_max_bytes: int = 256 * 1024 * 1024
+    work_text_store_path: str = "../data/work_texts.sqlite"
+    context_window_tokens: int = 2000
 
     # Search Settings
     search_timeout_ms: int = 8000
+    search_cache_ttl_seconds: float = 300.0
+    search_cache_max_entries: int = 1024
+    lexical_index_enabled: bool = True
     exa_cache_ttl_days: int = 7
+    exa_cache_path: str = "../data/exa_cache.sqlite"
+    exa_cache_max_rows: int = 50000
+    exa_cache_l1_entries: int = 256
+    exa_cache_purge_interval_seconds: int = 3600
+
+    # Searches slower than this are appended to the slow query log (0 = off)
+    slow_query_threshold_ms: int = 2000
+    slow_query_log_path: str = "../data/slow_queries.jsonl"
+
+    # Startup warmup (failed components are retried; 0 = don't retry)
+    warmup_retry_seconds: float = 30.0
 
     # Server
     host: str = "0.0.0.0"
@@ -1 +1,10 @@
 """Utility modules for the backend."""
+
+import sys
+from pathlib import Path
+
+# The Aozora text processing package (scripts/aozora) is shared with the
+# ingest pipeline. Docker mounts it at /scripts, which this also resolves to.
+_SCRIPTS_DIR = Path(__file__).resolve().parents[3] / "scripts"
+if _SCRIPTS_DIR.is_dir() and str(_SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(_SCRIPTS_DIR))
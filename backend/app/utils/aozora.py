@@ -1,132 +1,24 @@
-"""Text cleaning utilities for Aozora Bunko texts."""
+"""
+Text utilities for Aozora Bunko texts.
 
+Cleaning, context windows, the cleaned-text store and the exported vector
+store are shared with the ingest pipeline (scripts/aozora).
+"""
+
+import codecs
 import io
-import re
 import zipfile
 from pathlib import Path
 
+from aozora.chunking import context_window as context_window
+from aozora.chunking import estimate_tokens as estimate_tokens
+from aozora.cleaning import clean_aozora_text as clean_aozora_text
+from aozora.text_store import TextStore as TextStore
+from aozora.vector_store import MANIFEST_FILE as MANIFEST_FILE
+from aozora.vector_store import VectorStore as VectorStore
 
-def remove_ruby(text: str) -> str:
-    """
-    Remove ruby annotations from text.
-
-    Patterns:
-    - ｜base《ruby》 → base
-    - base《ruby》 → base (when no ｜)
-    - 《...》 alone → removed
-    """
-    # Pattern: ｜base《ruby》
-    text = re.sub(r"｜([^《]+)《[^》]+》", r"\1", text)
-
-    # Pattern: base《ruby》 (kanji followed by ruby)
-    text = re.sub(r"([一-龯々]+)《[^》]+》", r"\1", text)
-
-    # Remove any remaining ruby brackets
-    text = re.sub(r"《[^》]*》", "", text)
-
-    return text
-
-
-def remove_annotations(text: str) -> str:
-    """
-    Remove Aozora-specific annotations.
-
-    Patterns:
-    - ［＃...］ (editorial notes)
-    - ※［＃...］ (gaiji notes)
-    """
-    # Remove ※［＃...］ (gaiji annotations)
-    text = re.sub(r"※［＃[^］]*］", "", text)
-
-    # Remove ［＃...］ (general annotations)
-    text = re.sub(r"［＃[^］]*］", "", text)
-
-    return text
-
-
-def extract_body(text: str) -> str:
-    """
-    Extract the main body text, removing header and footer.
-
-    Removes:
-    - Header info before the main text
-    - Ruby/annotation explanation section
-    - Footer with 底本, 校正, etc.
-    """
-    lines = text.split("\n")
-
-    # Find start of main text
-    # Look for the LAST dashed line separator in the first 50 lines
-    # (to skip the header explanation section that may have its own separators)
-    start_idx = 0
-    last_separator_idx = -1
-
-    for i, line in enumerate(lines[:50]):
-        if re.match(r"^[-－ー]+$", line.strip()) and len(line.strip()) >= 10:
-            last_separator_idx = i
-
-    if last_separator_idx > 0:
-        start_idx = last_separator_idx + 1
-    else:
-        # Fallback: look for empty line after title/author block
-        for i, line in enumerate(lines):
-            if i > 0 and i < 20 and line.strip() == "" and lines[i - 1].strip():
-                if any(kw in "".join(lines[:i]) for kw in ["作者", "著者", "訳者"]):
-                    start_idx = i + 1
-                    break
-
-    # Find end of main text (before footer)
-    end_idx = len(lines)
-    footer_markers = [
-        "底本：",
-        "底本:",
-        "入力：",
-        "校正：",
-        "このファイルは",
-        "青空文庫作成ファイル",
-        "-------",
-        "━━━━━",
-    ]
-
-    for i in range(len(lines) - 1, max(len(lines) - 50, 0), -1):
-        line = lines[i].strip()
-        if any(marker in line for marker in footer_markers):
-            end_idx = i
-            break
-
-    # Extract body
-    body_lines = lines[start_idx:end_idx]
-
-    return "\n".join(body_lines)
-
-
-def clean_aozora_text(text: str) -> str:
-    """
-    Full cleaning pipeline for Aozora text.
 
-    1. Extract body (remove header/footer)
-    2. Remove ruby annotations
-    3. Remove editorial annotations
-    4. Normalize whitespace
-    """
-    # Extract body first
-    text = extract_body(text)
-
-    # Remove ruby
-    text = remove_ruby(text)
-
-    # Remove annotations
-    text = remove_annotations(text)
-
-    # Normalize whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = text.strip()
-
-    return text
-
-
-def read_aozora_file(filepath: Path) -> str:
+def read_aozora_file(filepath: Path, encoding: str | None = None) -> str:
     """
     Read an Aozora Bunko text file with proper encoding handling.
 
@@ -136,7 +28,21 @@ def read_aozora_file(filepath: Path) -> str:
     - UTF-8 encoded files
     - Skips XML/HTML files
 
-    Most files are Shift-JIS, some are UTF-8.
+    Most files are Shift-JIS, some are UTF-8. When the encoding is already
+    known (e.g. from the works catalog) it is tried first.
+    """
+    text, _ = read_aozora_file_with_encoding(filepath, encoding=encoding)
+    return text
+
+
+def read_aozora_file_with_encoding(
+    filepath: Path, encoding: str | None = None
+) -> tuple[str, str]:
+    """
+    Read an Aozora Bunko text file and report the codec that decoded it.
+
+    Returns:
+        Tuple of (text, encoding).
     """
     # Read raw bytes first to detect file type
     with open(filepath, "rb") as f:
@@ -144,17 +50,17 @@ def read_aozora_file(filepath: Path) -> str:
 
     # Check for ZIP magic bytes (PK\x03\x04)
     if raw_data[:4] == b"PK\x03\x04":
-        return _extract_text_from_zip(raw_data)
+        return _extract_text_from_zip(raw_data, encoding)
 
     # Check for XML/HTML (skip these)
     if raw_data[:5] == b"<?xml" or raw_data[:6] == b"<!DOCT":
         raise ValueError("XML/HTML file, not plain text")
 
     # Decode as text
-    return _decode_text(raw_data)
+    return _decode_text_with_encoding(raw_data, encoding)
 
 
-def _extract_text_from_zip(zip_data: bytes) -> str:
+def _extract_text_from_zip(zip_data: bytes, encoding: str | None = None) -> tuple[str, str]:
     """Extract text content from a ZIP archive."""
     try:
         with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
@@ -167,27 +73,85 @@ def _extract_text_from_zip(zip_data: bytes) -> str:
             txt_name = txt_files[0]
             txt_data = zf.read(txt_name)
 
-            return _decode_text(txt_data)
+            return _decode_text_with_encoding(txt_data, encoding)
     except zipfile.BadZipFile:
         raise ValueError("Invalid ZIP file")
 
 
-def _decode_text(data: bytes) -> str:
-    """Decode bytes to string, trying multiple encodings."""
+def read_aozora_header(filepath: Path, max_bytes: int = 8192) -> tuple[str, str]:
+    """
+    Read and decode only the beginning of an Aozora Bunko text file.
+
+    For ZIP files only the first .txt member is opened and only max_bytes of
+    it are decompressed. A trailing partial line is dropped when the file was
+    cut short, so the result is safe for extract_title_author.
+
+    Returns:
+        Tuple of (text prefix, encoding).
+    """
+    with open(filepath, "rb") as f:
+        head = f.read(max_bytes)
+
+        # Check for ZIP magic bytes (PK\x03\x04)
+        if head[:4] == b"PK\x03\x04":
+            f.seek(0)
+            try:
+                with zipfile.ZipFile(f) as zf:
+                    txt_files = [n for n in zf.namelist() if n.endswith(".txt")]
+                    if not txt_files:
+                        raise ValueError("No .txt file found in ZIP")
+                    with zf.open(txt_files[0]) as member:
+                        data = member.read(max_bytes + 1)
+            except zipfile.BadZipFile:
+                raise ValueError("Invalid ZIP file")
+        else:
+            # Check for XML/HTML (skip these)
+            if head[:5] == b"<?xml" or head[:6] == b"<!DOCT":
+                raise ValueError("XML/HTML file, not plain text")
+            data = head + f.read(1)
+
+    truncated = len(data) > max_bytes
+    text, encoding = _decode_prefix(data[:max_bytes], final=not truncated)
+    if truncated and "\n" in text:
+        text = text.rsplit("\n", 1)[0]
+    return text, encoding
+
+
+def _decode_prefix(data: bytes, final: bool) -> tuple[str, str]:
+    """Decode a possibly truncated prefix, tolerating a cut multi-byte character."""
+    for encoding in ("utf-8", "cp932"):
+        try:
+            return codecs.getincrementaldecoder(encoding)().decode(data, final=final), encoding
+        except UnicodeDecodeError:
+            pass
+
+    # Last resort: UTF-8 with error handling
+    return data.decode("utf-8", errors="replace"), "utf-8"
+
+
+def _decode_text_with_encoding(data: bytes, encoding: str | None = None) -> tuple[str, str]:
+    """Decode bytes to string, returning the codec that succeeded."""
+    # Try the known encoding first
+    if encoding:
+        try:
+            return data.decode(encoding), encoding
+        except (UnicodeDecodeError, LookupError):
+            pass
+
     # Try UTF-8 first
     try:
-        return data.decode("utf-8")
+        return data.decode("utf-8"), "utf-8"
     except UnicodeDecodeError:
         pass
 
     # Fall back to Shift-JIS (CP932 for Windows compatibility)
     try:
-        return data.decode("cp932")
+        return data.decode("cp932"), "cp932"
     except UnicodeDecodeError:
         pass
 
     # Last resort: UTF-8 with error handling
-    return data.decode("utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace"), "utf-8"
 
 
 def extract_title_author(text: str) -> tuple[str, str]:
@@ -0,0 +1,22 @@
+"""Query text normalization shared by the search caches."""
+
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query for use as a cache key.
+
+    Applies NFKC (folding full-width ASCII and half-width kana), collapses
+    runs of whitespace, including the ideographic space, and trims the ends.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Normalized query text
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
@@ -0,0 +1,53 @@
+"""Sentence offset index for slicing cleaned texts around search hits."""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Same sentence endings as the ingest chunker
+SENTENCE_END_PATTERN = re.compile(r"[。！？」』\n]")
+
+
+class SentenceIndex:
+    """
+    Sorted sentence boundary offsets of a text.
+
+    Offsets are in cleaned-text coordinates, i.e. the same coordinates as
+    the offset_start/offset_end of search hits.
+    """
+
+    def __init__(self, text: str):
+        self.length = len(text)
+        boundaries = array("I", [0])
+        boundaries.extend(m.end() for m in SENTENCE_END_PATTERN.finditer(text))
+        if boundaries[-1] != self.length:
+            boundaries.append(self.length)
+        self.boundaries = boundaries
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory used by the index."""
+        return self.boundaries.itemsize * len(self.boundaries)
+
+    def snap_start(self, pos: int) -> int:
+        """Move a position back to the start of its sentence."""
+        pos = min(max(pos, 0), self.length)
+        return self.boundaries[bisect_right(self.boundaries, pos) - 1]
+
+    def snap_end(self, pos: int) -> int:
+        """Move a position forward to the end of its sentence."""
+        pos = min(max(pos, 0), self.length)
+        return self.boundaries[bisect_left(self.boundaries, pos)]
+
+    def window(self, start: int, end: int, padding: int = 0) -> tuple[int, int]:
+        """
+        Expand [start, end) by padding characters on each side.
+
+        With padding the window is snapped outward to sentence boundaries so
+        that previews never begin or end mid-sentence.
+        """
+        start = min(max(start, 0), self.length)
+        end = min(max(end, start), self.length)
+        if padding <= 0:
+            return start, end
+        return self.snap_start(start - padding), self.snap_end(end + padding)
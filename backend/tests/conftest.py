@@ -0,0 +1,54 @@
+"""Shared fixtures: settings isolated to a temporary data directory."""
+
+import pytest
+
+from app.services import (
+    chroma_client,
+    embeddings,
+    exa_client,
+    search_orchestrator,
+    text_cache,
+    vector_store,
+    work_texts,
+    works_catalog,
+)
+from app.services.slow_query_log import get_slow_query_log
+from app.settings import get_settings
+
+
+def _reset_services() -> None:
+    """Drop cached settings and the service singletons built from them."""
+    get_settings.cache_clear()
+    get_slow_query_log.cache_clear()
+    search_orchestrator.get_search_cache.cache_clear()
+    chroma_client.get_scoped_vectors.cache_clear()
+    chroma_client.reset_collection()
+    vector_store.reset_vector_store()
+    work_texts.close_text_store()
+    embeddings._service, embeddings._service_checked = None, False
+    works_catalog._catalog = None
+    text_cache._text_cache = None
+    if exa_client._cache is not None:
+        exa_client._cache.close()
+        exa_client._cache = None
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    """Settings with every data path under tmp_path and no external APIs."""
+    env = {
+        "CHROMA_PERSIST_DIR": str(tmp_path / "chroma"),
+        "AOZORA_REPO_PATH": str(tmp_path / "aozora_repo"),
+        "WORKS_CATALOG_PATH": str(tmp_path / "works_catalog.sqlite"),
+        "WORK_TEXT_STORE_PATH": str(tmp_path / "work_texts.sqlite"),
+        "VECTOR_STORE_DIR": str(tmp_path / "vector_store"),
+        "EXA_CACHE_PATH": str(tmp_path / "exa_cache.sqlite"),
+        "SLOW_QUERY_THRESHOLD_MS": "0",
+        "EXA_API_KEY": "",
+        "OPENAI_API_KEY": "",
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    _reset_services()
+    yield get_settings()
+    _reset_services()
@@ -0,0 +1,41 @@
+"""Chunk offsets are positions in the cleaned text."""
+
+import random
+
+from aozora.chunking import chunk_text, create_chunks_with_context
+from aozora.cleaning import clean_aozora_text
+from aozora.schema import WorkInfo
+from aozora.synthetic import generate_text
+
+# Blank lines and indentation, which the sentence splitter drops
+TEXT = "一\n\n　吾輩は猫である。名前はまだ無い。\n\n\n　どこで生れたか  とんと見当がつかぬ。\n" * 40
+
+
+def _cleaned_work() -> str:
+    return clean_aozora_text(generate_text(random.Random(1), "猫と犬", "夏目漱石", 20_000))
+
+
+def test_chunk_text_is_the_offset_slice():
+    for text in (TEXT, _cleaned_work()):
+        chunks = list(chunk_text(text, target_tokens=60, overlap_tokens=15))
+        assert len(chunks) > 5
+        for chunk in chunks:
+            assert text[chunk.offset_start : chunk.offset_end] == chunk.text
+
+
+def test_chunks_cover_the_text_in_order():
+    text = _cleaned_work()
+    chunks = list(chunk_text(text, target_tokens=60, overlap_tokens=15))
+    assert chunks[0].offset_start == 0
+    assert chunks[-1].offset_end == len(text)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.offset_start < chunk.offset_start
+        # Overlapping, or separated by whitespace only
+        assert not text[previous.offset_end : chunk.offset_start].strip()
+
+
+def test_metadata_offsets_match_chunk_text():
+    text = _cleaned_work()
+    info = WorkInfo("1000", "猫と犬", "夏目漱石", "cards/000001/files/1000_ruby_1.zip")
+    for chunk, meta in create_chunks_with_context(text, info, search_tokens=100):
+        assert text[meta.offset_start : meta.offset_end] == chunk
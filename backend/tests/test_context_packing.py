@@ -0,0 +1,89 @@
+"""Packed passages contain the hits they stand for."""
+
+import random
+
+import pytest
+from aozora.chunking import create_chunks_with_context
+from aozora.cleaning import clean_aozora_text
+from aozora.schema import WorkInfo
+from aozora.synthetic import generate_text
+from aozora.text_store import TextStore
+
+from app.schemas import SearchResultItem, SourceType
+from app.services.context_packing import pack_context
+
+BUDGET = 100_000
+
+
+@pytest.fixture
+def chunks(settings) -> list[tuple[str, object]]:
+    """Chunks of two works, whose cleaned texts are in the text store."""
+    rng = random.Random(5)
+    store = TextStore(settings.work_text_store_path)
+    chunks = []
+    for work_id in ("1000", "1001"):
+        text = clean_aozora_text(generate_text(rng, "猫と犬", "夏目漱石", 30_000))
+        store.put(work_id, text)
+        chunks += create_chunks_with_context(text, WorkInfo(work_id, "猫と犬", "夏目漱石", ""))
+    store.close()
+    return chunks
+
+
+def _hit(chunk: str, meta, score: float = 0.5, shift: int = 0) -> SearchResultItem:
+    return SearchResultItem(
+        id=meta.chunk_id,
+        source=SourceType.AOZORA,
+        text=chunk,
+        score=score,
+        title=meta.title,
+        author=meta.author,
+        work_id=meta.work_id,
+        offset_start=meta.offset_start + shift,
+        offset_end=meta.offset_end + shift,
+    )
+
+
+def _assert_hits_packed(packed, hits: list[SearchResultItem]) -> None:
+    by_id = {hit.id: hit for hit in hits}
+    assert sorted(c for p in packed.passages for c in p.chunk_ids) == sorted(by_id)
+    for passage in packed.passages:
+        for chunk_id in passage.chunk_ids:
+            assert by_id[chunk_id].text in passage.text
+
+
+def test_passages_contain_their_hits(chunks):
+    # Neighbouring chunks (merged into one passage) and scattered ones
+    picks = [3, 4, 5, 20, len(chunks) - 1, len(chunks) // 2]
+    hits = [_hit(*chunks[i]) for i in picks]
+
+    packed = pack_context(hits, BUDGET)
+
+    assert len(packed.passages) < len(hits)
+    _assert_hits_packed(packed, hits)
+
+
+def test_stale_offsets_fall_back_to_hit_text(chunks):
+    hits = [_hit(*chunks[i], shift=37) for i in (2, 9, 30)]
+
+    packed = pack_context(hits, BUDGET)
+
+    _assert_hits_packed(packed, hits)
+    assert [p.text for p in packed.passages] == [hit.text for hit in hits]
+
+
+def test_without_store_hits_are_stitched(chunks, settings):
+    hits = [_hit(*chunks[i]) for i in (6, 7, 8)]
+
+    packed = pack_context(hits, BUDGET, use_context=False)
+
+    assert len(packed.passages) == 1
+    _assert_hits_packed(packed, hits)
+
+
+def test_passages_follow_hit_rank_not_score(chunks):
+    # Fused results: the first hit outranks a later one with a higher raw score
+    hits = [_hit(*chunks[10], score=0.03), _hit(*chunks[40], score=1.0)]
+
+    packed = pack_context(hits, BUDGET)
+
+    assert [p.chunk_ids for p in packed.passages] == [[hits[0].id], [hits[1].id]]
@@ -0,0 +1,74 @@
+"""ExaCache expiry, trimming, upgrade from the old table and async access."""
+
+import asyncio
+import sqlite3
+import time
+
+from app.services import exa_client
+from app.services.exa_client import ExaCache
+
+
+def _age(cache: ExaCache, seconds: float) -> None:
+    """Make every stored entry seconds older."""
+    with cache._lock:
+        cache._conn.execute("UPDATE exa_results SET created_at = created_at - ?", (seconds,))
+    with cache._l1_lock:
+        cache._l1.clear()
+
+
+def test_purge_deletes_expired_rows_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(exa_client, "PURGE_BATCH_ROWS", 3)
+    cache = ExaCache(str(tmp_path / "exa.sqlite"), ttl_seconds=60, max_rows=100)
+    for i in range(10):
+        cache.set(f"old {i}", 3, [{"i": i}])
+    _age(cache, 120)
+    cache.set("fresh", 3, [{"i": -1}])
+
+    assert cache.purge() == 10
+    assert cache.get("fresh", 3) == [{"i": -1}]
+    assert cache.get("old 0", 3) is None
+    cache.close()
+
+
+def test_purge_trims_to_max_rows_keeping_newest(tmp_path, monkeypatch):
+    monkeypatch.setattr(exa_client, "PURGE_BATCH_ROWS", 2)
+    cache = ExaCache(str(tmp_path / "exa.sqlite"), ttl_seconds=3600, max_rows=4)
+    for i in range(9):
+        cache.set(f"query {i}", 3, [{"i": i}])
+        _age(cache, 1)
+
+    assert cache.purge() == 5
+    assert [cache.get(f"query {i}", 3) is not None for i in range(9)] == [False] * 5 + [True] * 4
+    cache.close()
+
+
+def test_old_cache_table_is_replaced(tmp_path):
+    path = tmp_path / "exa.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT, created_at TEXT)")
+        conn.execute("INSERT INTO cache VALUES ('k', '[]', ?)", (str(time.time()),))
+
+    cache = ExaCache(str(path))
+    tables = {row[0] for row in cache._conn.execute("SELECT name FROM sqlite_master")}
+    assert "cache" not in tables and "exa_results" in tables
+    cache.close()
+
+
+async def test_async_access_does_not_block_the_event_loop(tmp_path):
+    cache = ExaCache(str(tmp_path / "exa.sqlite"))
+    await cache.aset("in l1", 3, [{"i": 1}])
+    await cache.aset("in sqlite", 3, [{"i": 2}])
+    with cache._l1_lock:
+        del cache._l1[cache._make_key("in sqlite")]
+
+    # Hold the connection as a purge batch would
+    cache._lock.acquire()
+    try:
+        assert await asyncio.wait_for(cache.aget("in l1", 3), 1) == [{"i": 1}]
+        lookup = asyncio.create_task(cache.aget("in sqlite", 3))
+        await asyncio.sleep(0.05)  # The loop keeps running while the lookup waits
+        assert not lookup.done()
+    finally:
+        cache._lock.release()
+    assert await lookup == [{"i": 2}]
+    cache.close()
@@ -0,0 +1,29 @@
+"""Reciprocal rank fusion of vector and lexical results."""
+
+from app.schemas import SearchResultItem, SourceType
+from app.services.search_orchestrator import fuse_results
+
+
+def _items(scores: dict[str, float]) -> list[SearchResultItem]:
+    return [
+        SearchResultItem(id=chunk_id, source=SourceType.AOZORA, text=chunk_id, score=score)
+        for chunk_id, score in scores.items()
+    ]
+
+
+def test_fused_scores_follow_fused_rank():
+    # Cosine similarities around 0.7 vs lexical scores scaled to a top of 1.0
+    vector = _items({"a": 0.706, "b": 0.705, "c": 0.704})
+    lexical = _items({"d": 1.0, "b": 0.999, "e": 0.5})
+
+    fused = fuse_results([vector, lexical], 5)
+
+    assert fused[0].id == "b"
+    scores = [item.score for item in fused]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0.0 < score <= 1.0 for score in scores)
+
+
+def test_top_of_every_list_scores_one():
+    fused = fuse_results([_items({"a": 0.7}), _items({"a": 1.0})], 1)
+    assert fused[0].score == 1.0
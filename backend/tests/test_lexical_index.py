@@ -0,0 +1,94 @@
+"""Lexical index: hits fetched from the chunk source, rebuilt when the chunks change."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aozora.vector_store import VectorStoreWriter
+
+from app.services import lexical_index
+from app.services.chroma_client import get_chroma_client
+from app.services.lexical_index import LexicalIndexHolder, build_lexical_index
+from app.services.search_scope import SearchScope
+
+
+def _chunks(texts: dict[str, str]) -> tuple[list[str], list[str], list[dict]]:
+    ids = list(texts)
+    metas = [{"work_id": i.split("-")[0], "author": "著者" + i[0]} for i in ids]
+    return ids, list(texts.values()), metas
+
+
+def _export(path, texts: dict[str, str]) -> None:
+    ids, documents, metas = _chunks(texts)
+    writer = VectorStoreWriter(path)
+    writer.add(ids, [[1.0, 0.0]] * len(ids), documents, metas)
+    writer.finish()
+
+
+def _refreshed(holder: LexicalIndexHolder):
+    """Run a due check and wait for its background rebuild."""
+    holder.current()
+    deadline = time.monotonic() + 10
+    while holder._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return holder.index
+
+
+def test_hits_are_fetched_from_the_store(settings, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "memmap")
+    _export(settings.vector_store_dir, {"a-0": "吾輩は猫である", "b-0": "山路を登りながら"})
+
+    index = build_lexical_index()
+    assert not hasattr(index, "documents") and not hasattr(index, "metadatas")
+    [hit] = index.query("猫である", k=5)
+    assert (hit.id, hit.text, hit.work_id) == ("a-0", "吾輩は猫である", "a")
+
+
+def test_new_export_is_reindexed(settings, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "memmap")
+    monkeypatch.setattr(lexical_index, "CHECK_SECONDS", 0)
+    _export(settings.vector_store_dir, {"a-0": "吾輩は猫である"})
+    holder = LexicalIndexHolder()
+    holder.build()
+    assert [hit.id for hit in holder.index.query("猫の手")] == []
+
+    _export(settings.vector_store_dir, {"c-0": "猫の手も借りたい", "c-1": "吾輩は犬である"})
+    index = _refreshed(holder)
+    assert len(index) == 2
+    assert [hit.id for hit in index.query("猫の手")] == ["c-0"]
+
+
+def test_reingested_collection_is_reindexed(settings, monkeypatch):
+    monkeypatch.setattr(lexical_index, "CHECK_SECONDS", 0)
+    client = get_chroma_client()
+    collection = client.create_collection(settings.chroma_collection)
+    try:
+        ids, documents, metas = _chunks({"a-0": "吾輩は猫である"})
+        collection.add(ids=ids, embeddings=[[1.0, 0.0]], documents=documents, metadatas=metas)
+        holder = LexicalIndexHolder()
+        holder.build()
+        [hit] = holder.index.query("猫である")
+        assert hit.text == "吾輩は猫である"
+
+        ids, documents, metas = _chunks({"b-0": "猫である名前はまだ無い"})
+        collection.add(ids=ids, embeddings=[[0.0, 1.0]], documents=documents, metadatas=metas)
+        index = _refreshed(holder)
+        assert len(index) == 2
+        assert {hit.id for hit in index.query("猫である")} == {"a-0", "b-0"}
+    finally:
+        # Chroma shares state between clients in one process
+        client.delete_collection(settings.chroma_collection)
+
+
+def test_scopes_from_many_threads(settings, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "memmap")
+    texts = {f"w{i}-0": f"猫の話その{i}" for i in range(100)}
+    _export(settings.vector_store_dir, texts)
+    index = build_lexical_index()
+
+    def scoped_hits(i: int) -> list[str]:
+        return [hit.id for hit in index.query("猫の話", 5, SearchScope(work_ids=(f"w{i}",)))]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(scoped_hits, range(100)))
+    assert results == [[f"w{i}-0"] for i in range(100)]
+    assert len(index._scopes) <= lexical_index._MAX_SCOPES
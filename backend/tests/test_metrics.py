@@ -0,0 +1,57 @@
+"""/metrics output parses as the Prometheus text format."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.routes import metrics
+from app.services.metrics import SEARCH_SOURCE_SECONDS, SEARCH_SOURCE_TOTAL, VECTOR_QUERY_SECONDS
+
+
+def _scrape() -> dict:
+    app = FastAPI()
+    app.include_router(metrics.router)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=")
+    return {family.name: family for family in text_string_to_metric_families(response.text)}
+
+
+def test_metrics_parse(settings):
+    SEARCH_SOURCE_TOTAL.labels(source="aozora", outcome="ok").inc()
+    SEARCH_SOURCE_SECONDS.labels(source="aozora").observe(0.003)
+    with VECTOR_QUERY_SECONDS.labels(backend="memmap").time():
+        pass
+
+    families = _scrape()
+
+    searches = {
+        tuple(sorted(sample.labels.items())): sample.value
+        for sample in families["aozora_search_source"].samples
+        if sample.name == "aozora_search_source_total"
+    }
+    assert searches[(("outcome", "ok"), ("source", "aozora"))] >= 1
+
+    latency = families["aozora_search_source_seconds"]
+    assert latency.type == "histogram"
+    buckets = [
+        sample
+        for sample in latency.samples
+        if sample.name.endswith("_bucket") and sample.labels["source"] == "aozora"
+    ]
+    assert buckets[-1].labels["le"] == "+Inf"
+    counts = [sample.value for sample in buckets]
+    assert counts == sorted(counts)
+
+
+def test_service_stats_reported(settings):
+    families = _scrape()
+
+    caches = {
+        sample.labels["cache"]
+        for sample in families["aozora_cache_hits"].samples
+        if sample.name == "aozora_cache_hits_total"
+    }
+    assert {"search", "exa", "work_text"} <= caches
+    assert families["aozora_executor_queued"].type == "gauge"
+    assert families["aozora_executor_rejected"].type == "counter"
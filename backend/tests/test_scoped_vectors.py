@@ -0,0 +1,41 @@
+"""Scoped vector cache follows changes to the collection."""
+
+import chromadb
+
+from app.services import scoped_vectors
+from app.services.scoped_vectors import ScopedVectorCache
+
+
+def _collection(tmp_path):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.create_collection("chunks")
+    collection.add(
+        ids=["a0", "a1", "b0"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        documents=["a0", "a1", "b0"],
+        metadatas=[{"work_id": "a"}, {"work_id": "a"}, {"work_id": "b"}],
+    )
+    return collection
+
+
+def test_reingested_scope_is_reloaded(tmp_path):
+    collection = _collection(tmp_path)
+    cache = ScopedVectorCache(max_chunks=10, max_scopes=4)
+    assert cache.get(collection, {"work_id": "a"}).ids == ["a0", "a1"]
+
+    collection.add(
+        ids=["a2"], embeddings=[[0.5, 0.5]], documents=["a2"], metadatas=[{"work_id": "a"}]
+    )
+    assert sorted(cache.get(collection, {"work_id": "a"}).ids) == ["a0", "a1", "a2"]
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    collection = _collection(tmp_path)
+    cache = ScopedVectorCache(max_chunks=1, max_scopes=4, ttl_seconds=60)
+    assert cache.get(collection, {"work_id": "a"}) is None  # Too large
+
+    cache.max_chunks = 10
+    assert cache.get(collection, {"work_id": "a"}) is None  # Still remembered
+    now = scoped_vectors.time.monotonic()
+    monkeypatch.setattr(scoped_vectors.time, "monotonic", lambda: now + 61)
+    assert cache.get(collection, {"work_id": "a"}).ids == ["a0", "a1"]
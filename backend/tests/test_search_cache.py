@@ -0,0 +1,56 @@
+"""Coalesced search loads: deadlines and stage timings."""
+
+import asyncio
+
+from app.services.search_cache import SearchResultCache
+from app.services.timings import current_timings, stage, start_timings
+
+
+async def test_callers_with_other_deadlines_do_not_share_a_load():
+    cache: SearchResultCache[str] = SearchResultCache(max_entries=8, ttl_seconds=60)
+    release = asyncio.Event()
+    loads = []
+
+    async def loader(deadline: int) -> str:
+        loads.append(deadline)
+        await release.wait()
+        return f"loaded within {deadline}"
+
+    short = asyncio.create_task(cache.get_or_load("q", lambda: loader(100), group=100))
+    same = asyncio.create_task(cache.get_or_load("q", lambda: loader(100), group=100))
+    long = asyncio.create_task(cache.get_or_load("q", lambda: loader(8000), group=8000))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await short == ("loaded within 100", False)
+    assert await same == ("loaded within 100", False)
+    assert await long == ("loaded within 8000", False)
+    assert loads == [100, 8000]
+    assert cache.coalesced == 1
+    assert cache.get("q") is not None
+
+
+async def test_each_caller_gets_the_shared_load_timings():
+    cache: SearchResultCache[str] = SearchResultCache(max_entries=8, ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def loader() -> str:
+        with stage("vector_search"):
+            await release.wait()
+        return "value"
+
+    async def request():
+        timings = start_timings()
+        await cache.get_or_load("q", loader)
+        return timings
+
+    leader = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    release.set()
+    leader_timings, follower_timings = await leader, await follower
+
+    assert leader_timings.stages["vector_search"][1] == 1
+    assert follower_timings.stages["vector_search"][1] == 1
+    assert current_timings() is None
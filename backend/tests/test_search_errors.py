@@ -0,0 +1,93 @@
+"""Source failures are reported as errors and never cached as results."""
+
+import httpx
+import pytest
+
+from app.schemas import SearchMode, SearchResultItem, SourceType
+from app.services import chroma_client, exa_client, search_orchestrator
+from app.services.search_orchestrator import run_cached_search
+
+
+def _item(chunk_id: str, score: float) -> SearchResultItem:
+    return SearchResultItem(id=chunk_id, source=SourceType.AOZORA, text="猫", score=score)
+
+
+class _FailingCollection:
+    def query(self, **kwargs):
+        raise RuntimeError("connection refused")
+
+
+class _LexicalIndex:
+    def query(self, query, k, scope=None):
+        return [_item("lexical-1", 1.0)]
+
+
+def _failing_exa_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url="https://exa.test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+    )
+
+
+def test_chroma_query_error_propagates(settings, monkeypatch):
+    monkeypatch.setattr(chroma_client, "get_collection", lambda: _FailingCollection())
+    with pytest.raises(RuntimeError, match="connection refused"):
+        chroma_client._query_similar_sync(["猫"], 5, None)
+
+
+def test_missing_collection_raises(settings, monkeypatch):
+    monkeypatch.setattr(chroma_client, "get_collection", lambda: None)
+    with pytest.raises(RuntimeError, match="collection not available"):
+        chroma_client._query_similar_sync(["猫"], 5, None)
+
+
+async def test_vector_failure_is_not_cached(settings, monkeypatch):
+    calls = []
+
+    async def failing_query(query, k=5, where_filter=None):
+        calls.append(query)
+        raise RuntimeError("ChromaDB collection not available")
+
+    monkeypatch.setattr(search_orchestrator, "query_similar", failing_query)
+    for _ in range(2):
+        results = await run_cached_search("猫", include_web=False, search_mode=SearchMode.VECTOR)
+        assert results.aozora_results == []
+        assert results.errors == ["Internal search error: ChromaDB collection not available"]
+    assert len(calls) == 2
+
+
+async def test_degraded_hybrid_search_is_not_cached(settings, monkeypatch):
+    calls = []
+
+    async def failing_query(query, k=5, where_filter=None):
+        calls.append(query)
+        raise RuntimeError("embedding timeout")
+
+    monkeypatch.setattr(search_orchestrator, "query_similar", failing_query)
+    monkeypatch.setattr(search_orchestrator, "_lexical_index", lambda mode: _LexicalIndex())
+    for _ in range(2):
+        results = await run_cached_search("猫", include_web=False)
+        assert [item.id for item in results.aozora_results] == ["lexical-1"]
+        assert len(results.errors) == 1
+        assert results.errors[0].startswith("Internal search degraded: vector search failed")
+    assert len(calls) == 2
+
+
+async def test_web_failure_is_not_cached(settings, monkeypatch):
+    monkeypatch.setenv("EXA_API_KEY", "test")
+    search_orchestrator.get_settings.cache_clear()
+
+    async def vector_query(query, k=5, where_filter=None):
+        return [_item("vector-1", 0.7)]
+
+    monkeypatch.setattr(search_orchestrator, "query_similar", vector_query)
+    monkeypatch.setattr(exa_client, "get_http_client", _failing_exa_client)
+
+    for _ in range(2):
+        results = await run_cached_search("猫", search_mode=SearchMode.VECTOR)
+        assert [item.id for item in results.aozora_results] == ["vector-1"]
+        assert results.web_results == []
+        assert len(results.errors) == 1
+        assert results.errors[0].startswith("Web search error")
+    assert search_orchestrator.get_search_cache().stats()["misses"] == 2
+    assert exa_client.get_cache().get("猫", 3) is None
@@ -0,0 +1,31 @@
+"""The memmap vector store follows new exports without a restart."""
+
+from aozora.vector_store import VectorStoreWriter
+
+from app.services.vector_store import get_vector_store
+
+
+def _export(path, ids: list[str]) -> None:
+    writer = VectorStoreWriter(path)
+    writer.add(ids, [[float(i), 1.0] for i in range(len(ids))], ids, [{} for _ in ids])
+    writer.finish()
+
+
+def test_missing_store_is_picked_up_after_export(settings):
+    assert get_vector_store() is None
+
+    _export(settings.vector_store_dir, ["a", "b"])
+    store = get_vector_store()
+    assert store is not None and len(store) == 2
+
+
+def test_new_export_replaces_open_store(settings):
+    _export(settings.vector_store_dir, ["a", "b"])
+    old = get_vector_store()
+    assert get_vector_store() is old
+
+    _export(settings.vector_store_dir, ["c", "d", "e"])
+    new = get_vector_store()
+    assert new is not old
+    assert len(new) == 3
+    assert new.ids[0] == "c"
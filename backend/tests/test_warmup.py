@@ -0,0 +1,62 @@
+"""Warmup readiness on a fresh deploy with nothing ingested."""
+
+import pytest
+from aozora.vector_store import VectorStoreWriter
+
+from app.services.warmup import Warmup
+
+
+@pytest.fixture
+def embedder(settings, monkeypatch):
+    """A query embedder configured against a closed local port."""
+    monkeypatch.setattr(settings, "openai_api_key", "test")
+    monkeypatch.setattr(settings, "openai_base_url", "http://127.0.0.1:9")
+
+
+async def test_missing_collection_is_ready(settings, embedder, monkeypatch):
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0)
+    warmup = Warmup()
+    await warmup.run()
+
+    assert warmup.ready
+    assert warmup.components["embedder"].state == "ready"
+    for name in ("vector_index", "probe_query", "lexical_index"):
+        assert warmup.components[name].state == "empty"
+
+
+async def test_empty_vector_store_is_ready(settings, embedder, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "memmap")
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0)
+    VectorStoreWriter(settings.vector_store_dir).finish()
+
+    warmup = Warmup()
+    await warmup.run()
+
+    assert warmup.ready
+    assert warmup.components["vector_index"].detail == "no chunks ingested"
+
+
+async def test_empty_steps_are_retried(settings, embedder, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "memmap")
+    monkeypatch.setattr(settings, "lexical_index_enabled", False)
+    warmup = Warmup()
+    await warmup.run_once()
+    assert warmup.components["vector_index"].state == "empty"
+
+    writer = VectorStoreWriter(settings.vector_store_dir)
+    writer.add(["a"], [[1.0, 0.0]], ["吾輩は猫である"], [{"work_id": "1"}])
+    writer.finish()
+    await warmup.run_once()
+
+    assert warmup.components["vector_index"].state == "ready"
+    assert warmup.components["probe_query"].state != "empty"
+
+
+async def test_missing_embedder_is_not_ready(settings, monkeypatch):
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0)
+    warmup = Warmup()
+    await warmup.run()
+
+    assert not warmup.ready
+    assert warmup.components["embedder"].state == "failed"
+    assert warmup.components["probe_query"].state == "failed"
@@ -0,0 +1,56 @@
+"""The text range endpoint returns a search hit's own text for its offsets."""
+
+import random
+from pathlib import Path
+
+import pytest
+from aozora.chunking import create_chunks_with_context
+from aozora.cleaning import clean_aozora_text, read_aozora_file
+from aozora.schema import WorkInfo
+from aozora.synthetic import generate_corpus, write_corpus
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import works
+from app.services.works_catalog import get_catalog
+
+
+@pytest.fixture
+def corpus(settings):
+    """Two works in the repository, with their chunks as ingest makes them."""
+    written = write_corpus(Path(settings.aozora_repo_path), generate_corpus(2, seed=3))
+    get_catalog().ensure_loaded()
+    chunks = []
+    for work in written:
+        text = clean_aozora_text(read_aozora_file(work.path))
+        info = WorkInfo(work.work_id, work.title, work.author, str(work.path))
+        chunks += [(text, chunk, meta) for chunk, meta in create_chunks_with_context(text, info)]
+    return chunks
+
+
+@pytest.fixture
+def client(corpus):
+    app = FastAPI()
+    app.include_router(works.router)
+    return TestClient(app)
+
+
+def test_range_is_the_hit_text(client, corpus):
+    for _, chunk, meta in random.Random(0).sample(corpus, 10):
+        response = client.get(
+            f"/api/works/{meta.work_id}/text/range",
+            params={"start": meta.offset_start, "end": meta.offset_end},
+        )
+        assert response.status_code == 200
+        assert response.json()["text"] == chunk
+
+
+def test_padded_range_contains_the_hit(client, corpus):
+    for text, chunk, meta in random.Random(1).sample(corpus, 10):
+        body = client.get(
+            f"/api/works/{meta.work_id}/text/range",
+            params={"start": meta.offset_start, "end": meta.offset_end, "padding": 300},
+        ).json()
+        assert body["text"] == text[body["window_start"] : body["window_end"]]
+        start = body["offset_start"] - body["window_start"]
+        assert body["text"][start : start + len(chunk)] == chunk
@@ -0,0 +1,25 @@
+"""Opening the cleaned-text store."""
+
+from pathlib import Path
+
+from aozora.text_store import TextStore
+
+from app.services.work_texts import get_text_store
+
+
+def test_text_store_is_retried_until_it_opens(settings):
+    path = settings.work_text_store_path
+    assert get_text_store() is None
+
+    # What a bind mount of a missing file leaves behind
+    Path(path).mkdir()
+    assert get_text_store() is None
+
+    Path(path).rmdir()
+    writer = TextStore(path)
+    writer.put("1000", "吾輩は猫である。")
+    writer.close()
+
+    store = get_text_store()
+    assert store is not None
+    assert store.get_range("1000", 0, 5) == "吾輩は猫で"
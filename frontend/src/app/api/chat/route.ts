@@ -28,6 +28,7 @@ export async function POST(req: Request) {
         k_internal: 5,
         k_web: 3,
         include_web: true,
+        context_token_budget: 6000,
       }),
     });
 
@@ -55,7 +56,8 @@ export async function POST(req: Request) {
         title: r.title,
         url: r.url,
         text: r.text,
-      }))
+      })),
+      searchResults.packed_context?.text
     );
   } else if (searchError) {
     contextSection = `\n\n[検索エラー: ${searchError}]\n\n`;
@@ -0,0 +1,30 @@
+import { NextRequest, NextResponse } from "next/server";
+import { BACKEND_URLS } from "@/lib/backend-config";
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ workId: string }> }
+) {
+  const { workId } = await params;
+  const url = new URL(`${BACKEND_URLS.works}/${workId}/text/range`);
+
+  // Forward all query params (start, end, padding)
+  request.nextUrl.searchParams.forEach((value, key) => {
+    url.searchParams.set(key, value);
+  });
+
+  try {
+    const response = await fetch(url.toString());
+    if (!response.ok) {
+      return NextResponse.json(
+        { error: `Backend returned ${response.status}` },
+        { status: response.status }
+      );
+    }
+    const data = await response.json();
+    return NextResponse.json(data);
+  } catch (error) {
+    console.error("Failed to fetch work text range:", error);
+    return NextResponse.json({ error: "Failed to fetch work text range" }, { status: 500 });
+  }
+}
@@ -8,8 +8,23 @@ export async function GET(
   const { workId } = await params;
   const url = `${BACKEND_URLS.works}/${workId}/text`;
 
+  // Forward conditional request so unchanged texts come back as 304
+  const headers: HeadersInit = {};
+  const ifNoneMatch = request.headers.get("if-none-match");
+  if (ifNoneMatch) {
+    headers["If-None-Match"] = ifNoneMatch;
+  }
+
   try {
-    const response = await fetch(url);
+    const response = await fetch(url, { headers, cache: "no-store" });
+    const etag = response.headers.get("etag");
+    const cacheHeaders: Record<string, string> = etag
+      ? { ETag: etag, "Cache-Control": "no-cache" }
+      : {};
+
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: cacheHeaders });
+    }
     if (!response.ok) {
       return NextResponse.json(
         { error: `Backend returned ${response.status}` },
@@ -17,7 +32,7 @@ export async function GET(
       );
     }
     const data = await response.json();
-    return NextResponse.json(data);
+    return NextResponse.json(data, { headers: cacheHeaders });
   } catch (error) {
     console.error("Failed to fetch work text:", error);
     return NextResponse.json({ error: "Failed to fetch work text" }, { status: 500 });
@@ -8,9 +8,17 @@ import { TextViewer } from "@/components/viewer/text-viewer";
 import { ChatPanel } from "@/components/chat/chat-panel";
 import { useViewer } from "@/hooks/use-viewer";
 import { useChatContext } from "@/hooks/use-chat-context";
-import { searchWorks, fetchWorkText, type SearchResultItem } from "@/lib/api";
+import {
+  searchWorks,
+  fetchWorkText,
+  fetchWorkTextRange,
+  type SearchResultItem,
+} from "@/lib/api";
 import type { Work, Citation } from "@/lib/types";
 
+// Characters of surrounding text shown around a cited passage
+const CITATION_PADDING_CHARS = 1500;
+
 export default function Home() {
   const { tabs, activeTabId, setActiveTabId, openTab, closeTab } = useViewer();
   const {
@@ -47,6 +55,8 @@ export default function Home() {
             author: result.author,
             text: result.context_text || result.text,
             workId: result.work_id,
+            offsetStart: result.offset_start,
+            offsetEnd: result.offset_end,
           });
         }
       }
@@ -95,7 +105,7 @@ export default function Home() {
   );
 
   const handleCitationClick = useCallback(
-    (citation: Citation) => {
+    async (citation: Citation) => {
       if (citation.type === "aozora" && citation.workId) {
         // Add to recent
         const work = {
@@ -114,6 +124,32 @@ export default function Home() {
           author: citation.author || "",
           content: citation.text,
         });
+
+        if (citation.offsetStart === undefined || citation.offsetEnd === undefined) {
+          return;
+        }
+
+        // Replace the excerpt with the passage around the hit, highlighted
+        try {
+          const range = await fetchWorkTextRange(
+            citation.workId,
+            citation.offsetStart,
+            citation.offsetEnd,
+            CITATION_PADDING_CHARS
+          );
+          openTab({
+            workId: citation.workId,
+            title: range.title,
+            author: range.author,
+            content: range.text,
+            highlightRange: {
+              start: range.offset_start - range.window_start,
+              end: range.offset_end - range.window_start,
+            },
+          });
+        } catch (err) {
+          console.error("Failed to fetch cited passage:", err);
+        }
       }
     },
     [openTab]
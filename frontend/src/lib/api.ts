@@ -7,12 +7,20 @@ import type {
   WorkItem,
   WorkListResponse,
   WorkTextResponse,
+  WorkTextRangeResponse,
   SearchResultItem,
   SearchResponse,
 } from "./types";
 
 // Re-export types for convenience
-export type { WorkItem, WorkListResponse, WorkTextResponse, SearchResultItem, SearchResponse };
+export type {
+  WorkItem,
+  WorkListResponse,
+  WorkTextResponse,
+  WorkTextRangeResponse,
+  SearchResultItem,
+  SearchResponse,
+};
 
 // Use relative URLs to go through the Next.js API proxy
 const API_BASE = "";
@@ -47,6 +55,28 @@ export async function fetchWorkText(workId: string): Promise<WorkTextResponse> {
   return res.json();
 }
 
+/**
+ * Fetch a slice of a work's text around a search hit.
+ * Padding is expanded to sentence boundaries by the backend.
+ */
+export async function fetchWorkTextRange(
+  workId: string,
+  start: number,
+  end: number,
+  padding = 0
+): Promise<WorkTextRangeResponse> {
+  const params = new URLSearchParams({
+    start: start.toString(),
+    end: end.toString(),
+    padding: padding.toString(),
+  });
+  const res = await fetch(`${API_BASE}/api/works/${workId}/text/range?${params}`);
+  if (!res.ok) {
+    throw new Error(`Failed to fetch work text range: ${res.status}`);
+  }
+  return res.json();
+}
+
 /**
  * Search for works and web results.
  */
@@ -30,6 +30,7 @@ export const SYSTEM_PROMPT = `あなたは青空文庫アーカイブの研究
 
 /**
  * Build the context section for the prompt.
+ * A packed Aozora context from the backend replaces the per-result listing.
  */
 export function buildContext(
   aozoraResults: Array<{
@@ -42,11 +43,15 @@ export function buildContext(
     title?: string;
     url?: string;
     text: string;
-  }>
+  }>,
+  packedAozoraContext?: string
 ): string {
   let context = "";
 
-  if (aozoraResults.length > 0) {
+  if (packedAozoraContext) {
+    context += "## 青空文庫アーカイブからの情報\n\n";
+    context += `${packedAozoraContext}\n\n`;
+  } else if (aozoraResults.length > 0) {
     context += "## 青空文庫アーカイブからの情報\n\n";
     for (const result of aozoraResults) {
       const text = result.context_text || result.text;
@@ -39,6 +39,22 @@ export interface WorkTextResponse {
   text: string;
 }
 
+/**
+ * Response from the work text range endpoint.
+ * Offsets are in cleaned-text coordinates, like search result offsets.
+ */
+export interface WorkTextRangeResponse {
+  work_id: string;
+  title: string;
+  author: string;
+  text: string;
+  window_start: number;
+  window_end: number;
+  offset_start: number;
+  offset_end: number;
+  total_length: number;
+}
+
 /**
  * Search result from the backend.
  */
@@ -57,6 +73,31 @@ export interface SearchResultItem {
   snippet?: string;
 }
 
+/**
+ * A merged, non-overlapping passage of one work in a packed context.
+ */
+export interface ContextPassage {
+  work_id: string;
+  title: string;
+  author: string;
+  offset_start: number;
+  offset_end: number;
+  text: string;
+  score: number;
+  token_count: number;
+  chunk_ids: string[];
+}
+
+/**
+ * Aozora hits packed into a token-budgeted context.
+ */
+export interface PackedContext {
+  text: string;
+  passages: ContextPassage[];
+  token_count: number;
+  token_budget: number;
+}
+
 /**
  * Response from the search endpoint.
  */
@@ -66,6 +107,7 @@ export interface SearchResponse {
   web_results: SearchResultItem[];
   timing_ms: number;
   errors: string[];
+  packed_context?: PackedContext | null;
 }
 
 /**
@@ -77,6 +119,9 @@ export interface Citation {
   title: string;
   author?: string;
   workId?: string;
+  /** Offsets of the cited hit in the work's cleaned text */
+  offsetStart?: number;
+  offsetEnd?: number;
   url?: string;
 }
 
@@ -1,14 +1,20 @@
 """Aozora Bunko text processing utilities."""
 
 from .cleaning import clean_aozora_text, extract_body
-from .chunking import chunk_text, create_chunks_with_context
+from .chunking import chunk_text, context_window, create_chunks_with_context
 from .schema import ChunkMetadata, WorkInfo
+from .text_store import TextStore
+from .vector_store import VectorStore, VectorStoreWriter
 
 __all__ = [
     "clean_aozora_text",
     "extract_body",
     "chunk_text",
+    "context_window",
     "create_chunks_with_context",
     "ChunkMetadata",
     "WorkInfo",
+    "TextStore",
+    "VectorStore",
+    "VectorStoreWriter",
 ]
@@ -21,9 +21,24 @@ def estimate_tokens(text: str) -> int:
 
 def split_into_sentences(text: str) -> list[str]:
     """Split text into sentences for Japanese."""
+    return [text[start:end] for start, end in sentence_spans(text)]
+
+
+def sentence_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Offsets of the sentences in text.
+
+    Whitespace-only pieces are skipped but still advance the position, so
+    text[start:end] is always the sentence.
+    """
+    spans = []
+    position = 0
     # Split on Japanese sentence endings
-    sentences = re.split(r"(?<=[。！？」』\n])", text)
-    return [s for s in sentences if s.strip()]
+    for piece in re.split(r"(?<=[。！？」』\n])", text):
+        if piece.strip():
+            spans.append((position, position + len(piece)))
+        position += len(piece)
+    return spans
 
 
 @dataclass
@@ -44,63 +59,96 @@ def chunk_text(
     """
     Chunk text into pieces of approximately target_tokens.
 
-    Uses sentence boundaries to avoid cutting mid-sentence.
+    Uses sentence boundaries to avoid cutting mid-sentence. Offsets are
+    positions in text and each chunk's text is text[offset_start:offset_end],
+    including any blank lines between its sentences.
     """
-    sentences = split_into_sentences(text)
+    # (start, end, tokens) per sentence
+    sentences = [
+        (start, end, estimate_tokens(text[start:end])) for start, end in sentence_spans(text)
+    ]
     if not sentences:
         return
 
-    current_chunk = []
+    current_chunk: list[tuple[int, int, int]] = []
     current_tokens = 0
-    current_start = 0
-    text_position = 0
+
+    def make_chunk() -> TextChunk:
+        start, end = current_chunk[0][0], current_chunk[-1][1]
+        return TextChunk(
+            text=text[start:end],
+            offset_start=start,
+            offset_end=end,
+            token_count=current_tokens,
+        )
 
     for sentence in sentences:
-        sentence_tokens = estimate_tokens(sentence)
+        sentence_tokens = sentence[2]
 
         # If adding this sentence exceeds target (and we have content)
         if current_tokens + sentence_tokens > target_tokens and current_chunk:
             # Yield current chunk
-            chunk_text = "".join(current_chunk)
-            yield TextChunk(
-                text=chunk_text,
-                offset_start=current_start,
-                offset_end=text_position,
-                token_count=current_tokens,
-            )
+            yield make_chunk()
 
             # Start new chunk with overlap
             # Keep last few sentences for overlap
-            overlap_text = ""
             overlap_sentences = []
             overlap_token_count = 0
 
             for s in reversed(current_chunk):
-                s_tokens = estimate_tokens(s)
-                if overlap_token_count + s_tokens <= overlap_tokens:
+                if overlap_token_count + s[2] <= overlap_tokens:
                     overlap_sentences.insert(0, s)
-                    overlap_token_count += s_tokens
+                    overlap_token_count += s[2]
                 else:
                     break
 
             current_chunk = overlap_sentences
             current_tokens = overlap_token_count
-            current_start = text_position - len("".join(overlap_sentences))
 
         # Add sentence to current chunk
         current_chunk.append(sentence)
         current_tokens += sentence_tokens
-        text_position += len(sentence)
 
     # Yield final chunk
     if current_chunk:
-        chunk_text = "".join(current_chunk)
-        yield TextChunk(
-            text=chunk_text,
-            offset_start=current_start,
-            offset_end=text_position,
-            token_count=current_tokens,
-        )
+        yield make_chunk()
+
+
+def context_window(
+    text: str,
+    offset_start: int,
+    offset_end: int,
+    context_tokens: int = 2000,
+) -> tuple[int, int]:
+    """
+    Expand a chunk's span to a window of about context_tokens.
+
+    The window is centred on the chunk and widened to sentence boundaries.
+
+    Returns (start, end) offsets into text.
+    """
+    target_context_chars = int(context_tokens * 1.5)  # Approximate chars
+    half_context = target_context_chars // 2
+
+    context_start = max(0, offset_start - half_context)
+    context_end = min(len(text), offset_end + half_context)
+
+    # Adjust to sentence boundaries
+    if context_start > 0:
+        # Find previous sentence end
+        prev_text = text[:context_start]
+        match = re.search(r"[。！？」』\n][^。！？」』\n]*$", prev_text)
+        if match:
+            context_start = match.start() + 1
+
+    if context_end < len(text):
+        # Find next sentence end
+        next_text = text[context_end:]
+        match = re.search(r"[。！？」』\n]", next_text)
+        if match:
+            context_end += match.end()
+
+    return context_start, context_end
 
 
 def create_chunks_with_context(
@@ -109,44 +157,26 @@ def create_chunks_with_context(
     search_tokens: int = 400,
     context_tokens: int = 2000,
     overlap_tokens: int = 50,
+    include_context: bool = False,
 ) -> list[tuple[str, ChunkMetadata]]:
     """
     Create chunks for search with expanded context for LLM.
 
     Returns list of (search_chunk_text, metadata) tuples.
-    The metadata includes context_text with expanded context.
+    The cleaned work text is stored once in the text store, and the backend
+    rebuilds each chunk's context window from its offsets. Pass
+    include_context=True to also embed context_text in the metadata.
     """
     chunks = list(chunk_text(text, target_tokens=search_tokens, overlap_tokens=overlap_tokens))
     results = []
 
     for i, chunk in enumerate(chunks):
-        # Calculate context window
-        context_start = chunk.offset_start
-        context_end = chunk.offset_end
-
-        # Expand context backwards
-        target_context_chars = int(context_tokens * 1.5)  # Approximate chars
-        half_context = target_context_chars // 2
-
-        context_start = max(0, chunk.offset_start - half_context)
-        context_end = min(len(text), chunk.offset_end + half_context)
-
-        # Adjust to sentence boundaries
-        if context_start > 0:
-            # Find previous sentence end
-            prev_text = text[:context_start]
-            match = re.search(r"[。！？」』\n][^。！？」』\n]*$", prev_text)
-            if match:
-                context_start = match.start() + 1
-
-        if context_end < len(text):
-            # Find next sentence end
-            next_text = text[context_end:]
-            match = re.search(r"[。！？」』\n]", next_text)
-            if match:
-                context_end += match.end()
-
-        context_text = text[context_start:context_end]
+        context_text = None
+        if include_context:
+            start, end = context_window(
+                text, chunk.offset_start, chunk.offset_end, context_tokens
+            )
+            context_text = text[start:end]
 
         # Create metadata
         chunk_id = ChunkMetadata.create_id(work_info.work_id, i, chunk.offset_start)
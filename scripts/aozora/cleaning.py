@@ -1,10 +1,43 @@
-"""Text cleaning utilities for Aozora Bunko texts."""
+"""
+Text cleaning utilities for Aozora Bunko texts.
 
+This module is the single cleaning engine shared by the ingest pipeline and
+the backend (which imports it from scripts/, see backend/app/utils).
+"""
+
+import io
 import re
 import zipfile
-import io
 from pathlib import Path
 
+_RUBY_WITH_BAR = re.compile(r"｜([^《]+)《[^》]+》")
+_RUBY_AFTER_KANJI = re.compile(r"([一-龯々]+)《[^》]+》")
+_RUBY_BRACKETS = re.compile(r"《[^》]*》")
+_GAIJI_ANNOTATION = re.compile(r"※［＃[^］]*］")
+_ANNOTATION = re.compile(r"［＃[^］]*］")
+_SEPARATOR_LINE = re.compile(r"^[-－ー]+$")
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+# A ruby opened again (or never closed) before its 》. Only then can the
+# kanji-base pass remove something the bracket pass would not.
+_NESTED_RUBY = re.compile(r"《[^》]*(?:《|\Z)")
+
+# Header/footer scanning limits (in lines)
+HEADER_SCAN_LINES = 50
+FOOTER_SCAN_LINES = 50
+FOOTER_MARKERS = [
+    "底本：",
+    "底本:",
+    "入力：",
+    "校正：",
+    "このファイルは",
+    "青空文庫作成ファイル",
+    "-------",
+    "━━━━━",
+]
+AUTHOR_KEYWORDS = ["作者", "著者", "訳者"]
+
 
 def remove_ruby(text: str) -> str:
     """
@@ -16,13 +49,13 @@ def remove_ruby(text: str) -> str:
     - 《...》 alone → removed
     """
     # Pattern: ｜base《ruby》
-    text = re.sub(r"｜([^《]+)《[^》]+》", r"\1", text)
+    text = _RUBY_WITH_BAR.sub(r"\1", text)
 
     # Pattern: base《ruby》 (kanji followed by ruby)
-    text = re.sub(r"([一-龯々]+)《[^》]+》", r"\1", text)
+    text = _RUBY_AFTER_KANJI.sub(r"\1", text)
 
     # Remove any remaining ruby brackets
-    text = re.sub(r"《[^》]*》", "", text)
+    text = _RUBY_BRACKETS.sub("", text)
 
     return text
 
@@ -36,14 +69,43 @@ def remove_annotations(text: str) -> str:
     - ※［＃...］ (gaiji notes)
     """
     # Remove ※［＃...］ (gaiji annotations)
-    text = re.sub(r"※［＃[^］]*］", "", text)
+    text = _GAIJI_ANNOTATION.sub("", text)
 
     # Remove ［＃...］ (general annotations)
-    text = re.sub(r"［＃[^］]*］", "", text)
+    text = _ANNOTATION.sub("", text)
 
     return text
 
 
+def _find_body_start(lines: list[str]) -> int:
+    """Index of the first body line, given at least the first 50 lines."""
+    # Look for the LAST dashed line separator in the first 50 lines
+    # (to skip the header explanation section that may have its own separators)
+    last_separator_idx = -1
+
+    for i, line in enumerate(lines[:HEADER_SCAN_LINES]):
+        stripped = line.strip()
+        if len(stripped) >= 10 and _SEPARATOR_LINE.match(stripped):
+            last_separator_idx = i
+
+    if last_separator_idx > 0:
+        return last_separator_idx + 1
+
+    # Fallback: look for empty line after title/author block
+    for i in range(1, min(len(lines), 20)):
+        if lines[i].strip() == "" and lines[i - 1].strip():
+            if any(kw in "".join(lines[:i]) for kw in AUTHOR_KEYWORDS):
+                return i + 1
+
+    return 0
+
+
+def _is_footer_line(line: str) -> bool:
+    """Whether a line marks the start of the footer."""
+    line = line.strip()
+    return any(marker in line for marker in FOOTER_MARKERS)
+
+
 def extract_body(text: str) -> str:
     """
     Extract the main body text, removing header and footer.
@@ -56,44 +118,12 @@ def extract_body(text: str) -> str:
     lines = text.split("\n")
 
     # Find start of main text
-    # Look for the LAST dashed line separator in the first 50 lines
-    # (to skip the header explanation section that may have its own separators)
-    start_idx = 0
-    last_separator_idx = -1
-
-    for i, line in enumerate(lines[:50]):
-        if re.match(r"^[-－ー]+$", line.strip()) and len(line.strip()) >= 10:
-            last_separator_idx = i
-
-    if last_separator_idx > 0:
-        start_idx = last_separator_idx + 1
-    else:
-        # Fallback: look for empty line after title/author block
-        for i, line in enumerate(lines):
-            if i > 0 and i < 20 and line.strip() == "" and lines[i - 1].strip():
-                if any(
-                    kw in "".join(lines[:i])
-                    for kw in ["作者", "著者", "訳者"]
-                ):
-                    start_idx = i + 1
-                    break
+    start_idx = _find_body_start(lines)
 
     # Find end of main text (before footer)
     end_idx = len(lines)
-    footer_markers = [
-        "底本：",
-        "底本:",
-        "入力：",
-        "校正：",
-        "このファイルは",
-        "青空文庫作成ファイル",
-        "-------",
-        "━━━━━",
-    ]
-
-    for i in range(len(lines) - 1, max(len(lines) - 50, 0), -1):
-        line = lines[i].strip()
-        if any(marker in line for marker in footer_markers):
+    for i in range(len(lines) - 1, max(len(lines) - FOOTER_SCAN_LINES, 0), -1):
+        if _is_footer_line(lines[i]):
             end_idx = i
             break
 
@@ -103,10 +133,75 @@ def extract_body(text: str) -> str:
     return "\n".join(body_lines)
 
 
+def _extract_body_fast(text: str) -> str:
+    """
+    Same result as extract_body, without splitting the whole text.
+
+    Only the first and last 50 lines are split off; the body is a single
+    slice of the original string.
+    """
+    head = text.split("\n", HEADER_SCAN_LINES)
+    tail = text.rsplit("\n", FOOTER_SCAN_LINES)
+    if len(head) <= HEADER_SCAN_LINES or len(text) - len(head[-1]) > len(tail[0]):
+        # Header and footer regions overlap; short texts are cheap anyway
+        return extract_body(text)
+
+    start_idx = _find_body_start(head)
+    start = sum(len(line) + 1 for line in head[:start_idx])
+
+    # tail[0] holds everything before the last 50 lines; like extract_body,
+    # scan the last 49 lines from the bottom up
+    end = len(text)
+    for j in range(len(tail) - 1, 1, -1):
+        if _is_footer_line(tail[j]):
+            end = len(text) - sum(len(line) + 1 for line in tail[j:])
+            break
+
+    return text[start:end]
+
+
 def clean_aozora_text(text: str) -> str:
     """
     Full cleaning pipeline for Aozora text.
 
+    1. Extract body (remove header/footer)
+    2. Remove ruby annotations
+    3. Remove editorial annotations
+    4. Normalize whitespace
+
+    Output is identical to clean_aozora_text_reference, but passes that
+    cannot match are skipped using cheap substring checks, and the kanji
+    ruby pass only runs when ruby brackets are nested or left open.
+    """
+    text = _extract_body_fast(text)
+
+    # Remove ruby
+    if "｜" in text:
+        text = _RUBY_WITH_BAR.sub(r"\1", text)
+    if "《" in text:
+        if _NESTED_RUBY.search(text):
+            text = _RUBY_AFTER_KANJI.sub(r"\1", text)
+        text = _RUBY_BRACKETS.sub("", text)
+
+    # Remove annotations
+    if "［＃" in text:
+        if "※［＃" in text:
+            text = _GAIJI_ANNOTATION.sub("", text)
+        text = _ANNOTATION.sub("", text)
+
+    # Normalize whitespace (a lone space is left unchanged by the pattern)
+    if "\t" in text or "  " in text:
+        text = _SPACES.sub(" ", text)
+    if "\n\n\n" in text:
+        text = _BLANK_LINES.sub("\n\n", text)
+
+    return text.strip()
+
+
+def clean_aozora_text_reference(text: str) -> str:
+    """
+    Multi-pass cleaning pipeline, kept as the reference for clean_aozora_text.
+
     1. Extract body (remove header/footer)
     2. Remove ruby annotations
     3. Remove editorial annotations
@@ -122,8 +217,8 @@ def clean_aozora_text(text: str) -> str:
     text = remove_annotations(text)
 
     # Normalize whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
     text = text.strip()
 
     return text
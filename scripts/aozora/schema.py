@@ -37,7 +37,7 @@ class ChunkMetadata:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for ChromaDB metadata."""
-        return {
+        data = {
             "work_id": self.work_id,
             "title": self.title,
             "author": self.author,
@@ -46,5 +46,7 @@ class ChunkMetadata:
             "offset_start": self.offset_start,
             "offset_end": self.offset_end,
             "chunk_tokens": self.chunk_tokens,
-            "context_text": self.context_text or "",
         }
+        if self.context_text:
+            data["context_text"] = self.context_text
+        return data
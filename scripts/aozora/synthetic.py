@@ -0,0 +1,255 @@
+"""
+Synthetic Aozora Bunko files for benchmarks and load tests.
+
+Generates works in Aozora notation (title/author header with the notation
+legend, ruby, ［＃］ annotations, gaiji notes, chapter headings, and the
+底本/入力/校正 footer), encoded as cp932 or UTF-8 with CRLF line endings,
+zipped or plain, laid out like the repository (cards/{author}/files/).
+Output is deterministic for a given seed.
+"""
+
+import io
+import random
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Approximate lengths in characters: a short story, a novella, a full novel
+SIZE_CLASSES = {"short": 8_000, "medium": 60_000, "novel": 350_000}
+
+NOUNS = [
+    "猫", "犬", "先生", "汽車", "銀河", "停車場", "雨", "夜", "月", "海", "山", "川", "町",
+    "学校", "手紙", "硝子戸", "羅生門", "下人", "老婆", "蜘蛛", "地獄", "極楽", "鐘", "桜",
+    "電車", "下宿", "友人", "奥さん", "兄", "妹", "坊っちゃん", "赤シャツ", "狸", "山嵐",
+]
+VERBS = [
+    "歩いた", "眺めていた", "考えた", "待っていた", "笑った", "泣いた", "思い出した",
+    "黙っていた", "書いた", "読んだ", "走り出した", "振り返った",
+]
+CLAUSES = [
+    "しばらくの間", "何とも云えず", "ふと気がつくと", "夜が更けるにつれて", "いつものように",
+    "誰にも知られずに", "雨の降る日に", "その翌日", "ひとりで",
+]
+RUBY = [
+    ("吾輩", "わがはい"), ("下人", "げにん"), ("停車場", "ていしゃば"), ("硝子戸", "ガラスど"),
+    ("銀河", "ぎんが"), ("蜘蛛", "くも"), ("老婆", "ろうば"), ("山嵐", "やまあらし"),
+    ("獰悪", "どうあく"), ("煩悶", "はんもん"), ("黄昏", "たそがれ"), ("洋燈", "ランプ"),
+]
+BAR_RUBY = [("一番獰悪", "いちばんどうあく"), ("あの人", "・・・"), ("十二月", "しわす")]
+GAIJI = [
+    "※［＃「木＋間」、第3水準1-85-88］",
+    "※［＃「言＋墟のつくり」、第4水準2-88-74］",
+    "※［＃「口＋世」、第3水準1-14-85］",
+]
+SURNAMES = ["夏目", "芥川", "宮沢", "太宰", "森", "樋口", "泉", "中島", "梶井", "堀"]
+GIVEN_NAMES = ["漱石", "龍之介", "賢治", "治", "鴎外", "一葉", "鏡花", "敦", "基次郎", "辰雄"]
+KANJI_NUMBERS = "一二三四五六七八九十"
+
+SEPARATOR = "-" * 55
+LEGEND = [
+    SEPARATOR,
+    "【テキスト中に現れる記号について】",
+    "",
+    "《》：ルビ",
+    "（例）吾輩《わがはい》",
+    "",
+    "｜：ルビの付く文字列の始まりを特定する記号",
+    "（例）一番｜獰悪《どうあく》",
+    "",
+    "［＃］：入力者注　主に外字の説明や、傍点の位置の指定",
+    "（例）※［＃「言＋墟のつくり」、第4水準2-88-74］",
+    SEPARATOR,
+]
+
+
+@dataclass
+class SyntheticWork:
+    """A generated work and how it was written to disk."""
+
+    work_id: str
+    author_id: str
+    title: str
+    author: str
+    text: str  # As written, before encoding (LF line endings)
+    encoding: str  # "cp932" or "utf-8"
+    zipped: bool
+    path: Optional[Path] = None
+
+
+def author_name(author_id: int) -> str:
+    """A deterministic author name for an author card number."""
+    return f"{SURNAMES[author_id % 10]}{GIVEN_NAMES[author_id // 10 % 10]}"
+
+
+def _chapter_name(number: int) -> str:
+    """Kanji numeral for chapter numbers up to 99."""
+    tens, ones = divmod(number, 10)
+    prefix = "" if tens == 0 else ("十" if tens == 1 else KANJI_NUMBERS[tens - 1] + "十")
+    return prefix + (KANJI_NUMBERS[ones - 1] if ones else "")
+
+
+def make_sentence(rng: random.Random) -> str:
+    """One sentence, sometimes with ruby, emphasis, gaiji or dialogue."""
+    subject, obj = rng.choice(NOUNS), rng.choice(NOUNS)
+    sentence = f"{subject}は{rng.choice(CLAUSES)}{obj}の前で{rng.choice(VERBS)}。"
+    roll = rng.random()
+    if roll < 0.15:
+        base, reading = rng.choice(RUBY)
+        sentence = f"{base}《{reading}》が{sentence}"
+    elif roll < 0.2:
+        base, reading = rng.choice(BAR_RUBY)
+        sentence = f"{sentence}それは｜{base}《{reading}》のことであった。"
+    elif roll < 0.25:
+        sentence += f"［＃「{obj}」に傍点］"
+    elif roll < 0.27:
+        sentence = sentence.replace(obj, f"{obj}{rng.choice(GAIJI)}", 1)
+    elif roll < 0.35:
+        sentence = f"「{obj}はどうした」と{subject}が云った。"
+    return sentence
+
+
+def generate_text(
+    rng: random.Random,
+    title: str,
+    author: str,
+    chars: int,
+    chapter_chars: int = 20_000,
+) -> str:
+    """
+    Generate a work of about chars body characters in Aozora notation.
+
+    Args:
+        rng: Random source
+        title: Work title (first header line)
+        author: Author name (second header line)
+        chars: Target body length in characters
+        chapter_chars: Body characters per chapter heading
+
+    Returns:
+        The work's text with LF line endings
+    """
+    lines = [title, author, "", *LEGEND, ""]
+    size = 0
+    chapter = 0
+    while size < chars:
+        if size >= chapter * chapter_chars and chapter < 99:
+            chapter += 1
+            name = _chapter_name(chapter)
+            if chapter > 1:
+                lines += ["", "［＃改ページ］", ""]
+            lines += [f"［＃５字下げ］{name}［＃「{name}」は中見出し］", ""]
+        if rng.random() < 0.03:
+            # An indented block, e.g. a quoted letter
+            lines.append("［＃ここから２字下げ］")
+            block = [make_sentence(rng) for _ in range(rng.randint(2, 5))]
+            lines += block
+            lines.append("［＃ここで字下げ終わり］")
+            size += sum(map(len, block))
+            continue
+        paragraph = "　" + "".join(make_sentence(rng) for _ in range(rng.randint(1, 8)))
+        lines.append(paragraph)
+        size += len(paragraph)
+
+    year = rng.randint(1950, 1999)
+    lines += [
+        "",
+        "",
+        "",
+        f"底本：「{author}全集（合成）」青空出版",
+        f"　　　{year}年{rng.randint(1, 12)}月{rng.randint(1, 28)}日第1刷発行",
+        f"初出：「{rng.choice(NOUNS)}」",
+        "入力：synthetic",
+        "校正：synthetic",
+        f"{year + 20}年{rng.randint(1, 12)}月{rng.randint(1, 28)}日作成",
+        "青空文庫作成ファイル：",
+        "このファイルは、インターネットの図書館、青空文庫で作られました。"
+        "入力、校正、制作にあたったのは、ボランティアの皆さんです。",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def encode_work(text: str, encoding: str, zipped: bool, name: str) -> bytes:
+    """
+    Encode a work as it is stored in the repository.
+
+    Args:
+        text: Work text with LF line endings
+        encoding: "cp932" or "utf-8"
+        zipped: Wrap the text file in a ZIP archive
+        name: File name stem (the text file inside the ZIP is name.txt)
+
+    Returns:
+        File contents
+    """
+    data = text.replace("\n", "\r\n").encode(encoding)
+    if not zipped:
+        return data
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{name}.txt", data)
+    return buffer.getvalue()
+
+
+def generate_corpus(
+    count: int,
+    sizes: Optional[dict[str, float]] = None,
+    utf8_ratio: float = 0.2,
+    zip_ratio: float = 0.8,
+    seed: int = 0,
+    authors: Optional[int] = None,
+) -> list[SyntheticWork]:
+    """
+    Generate works with a mix of lengths, encodings and packaging.
+
+    Real Aozora files are mostly cp932 ZIPs, hence the defaults.
+
+    Args:
+        count: Number of works
+        sizes: Weights of SIZE_CLASSES names (default: mostly short stories)
+        utf8_ratio: Fraction encoded as UTF-8 rather than cp932
+        zip_ratio: Fraction zipped rather than plain .txt
+        seed: Random seed
+        authors: Number of distinct authors (default: one per 8 works)
+
+    Returns:
+        The works, not yet written to disk
+    """
+    rng = random.Random(seed)
+    sizes = sizes or {"short": 0.7, "medium": 0.25, "novel": 0.05}
+    classes = list(sizes)
+    authors = authors or max(count // 8, 1)
+
+    works = []
+    for i in range(count):
+        author_id = i % authors + 1
+        title = f"{rng.choice(NOUNS)}と{rng.choice(NOUNS)}"
+        author = author_name(author_id)
+        target = SIZE_CLASSES[rng.choices(classes, [sizes[c] for c in classes])[0]]
+        works.append(
+            SyntheticWork(
+                work_id=str(1000 + i),
+                author_id=f"{author_id:06d}",
+                title=title,
+                author=author,
+                text=generate_text(rng, title, author, int(target * rng.uniform(0.6, 1.4))),
+                encoding="utf-8" if rng.random() < utf8_ratio else "cp932",
+                zipped=rng.random() < zip_ratio,
+            )
+        )
+    return works
+
+
+def write_corpus(root: Path, works: list[SyntheticWork]) -> list[SyntheticWork]:
+    """
+    Write works as a repository tree: cards/{author_id}/files/{work_id}_ruby_{n}.zip|.txt.
+
+    Sets each work's path and returns the works.
+    """
+    for n, work in enumerate(works):
+        files = root / "cards" / work.author_id / "files"
+        files.mkdir(parents=True, exist_ok=True)
+        name = f"{work.work_id}_ruby_{20000 + n}"
+        work.path = files / (f"{name}.zip" if work.zipped else f"{name}.txt")
+        work.path.write_bytes(encode_work(work.text, work.encoding, work.zipped, name))
+    return works
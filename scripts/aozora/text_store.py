@@ -0,0 +1,116 @@
+"""Compact per-work store of cleaned texts, keyed by work_id."""
+
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+# Characters per compressed block; a context window touches one or two
+BLOCK_CHARS = 8192
+
+
+class TextStore:
+    """
+    SQLite store of cleaned work texts in zlib-compressed blocks.
+
+    Each work is stored once, split into fixed-size character blocks so a
+    reader can fetch a span of a long work without decompressing all of it.
+    Offsets are character offsets into the cleaned text, matching chunk
+    offset_start/offset_end.
+    """
+
+    def __init__(self, path: str | Path, readonly: bool = False):
+        self.path = Path(path).resolve()
+        self._lock = threading.Lock()
+        if readonly:
+            self._conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize the store tables."""
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS works (
+                    work_id TEXT PRIMARY KEY,
+                    length INTEGER NOT NULL,
+                    block_chars INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS blocks (
+                    work_id TEXT NOT NULL,
+                    block INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (work_id, block)
+                ) WITHOUT ROWID;
+            """)
+
+    def put(self, work_id: str, text: str) -> None:
+        """Store (or replace) a work's cleaned text."""
+        blocks = [
+            (work_id, i, zlib.compress(text[start : start + BLOCK_CHARS].encode("utf-8")))
+            for i, start in enumerate(range(0, len(text), BLOCK_CHARS))
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM blocks WHERE work_id = ?", (work_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO works (work_id, length, block_chars) VALUES (?, ?, ?)",
+                (work_id, len(text), BLOCK_CHARS),
+            )
+            self._conn.executemany(
+                "INSERT INTO blocks (work_id, block, data) VALUES (?, ?, ?)", blocks
+            )
+
+    def length(self, work_id: str) -> Optional[int]:
+        """Get the length of a stored text, or None if the work isn't stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT length FROM works WHERE work_id = ?", (work_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_range(self, work_id: str, start: int, end: int) -> Optional[str]:
+        """
+        Get text[start:end] of a stored work.
+
+        Only the blocks overlapping the span are read and decompressed.
+
+        Returns:
+            The requested span (clipped to the text), or None if not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT length, block_chars FROM works WHERE work_id = ?", (work_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            length, block_chars = row
+            start, end = max(0, start), min(length, end)
+            if start >= end:
+                return ""
+            first, last = start // block_chars, (end - 1) // block_chars
+            rows = self._conn.execute(
+                "SELECT data FROM blocks WHERE work_id = ? AND block BETWEEN ? AND ? "
+                "ORDER BY block",
+                (work_id, first, last),
+            ).fetchall()
+
+        text = "".join(zlib.decompress(data).decode("utf-8") for (data,) in rows)
+        base = first * block_chars
+        return text[start - base : end - base]
+
+    def get(self, work_id: str) -> Optional[str]:
+        """Get a work's full cleaned text, or None if not stored."""
+        return self.get_range(work_id, 0, 2**62)
+
+    def __contains__(self, work_id: str) -> bool:
+        return self.length(work_id) is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,563 @@
+"""Memory-mapped chunk vectors with columnar metadata, addressed by row."""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.bin"
+SQ_NORMS_FILE = "sq_norms.npy"
+CODES_FILE = "codes.int8.bin"
+CODE_SCALES_FILE = "code_scales.npy"
+
+# Bytes of float32 vectors scored per block, bounding temporary memory
+SEARCH_BLOCK_BYTES = 64 * 1024 * 1024
+
+# Bytes of float16/int8 rows widened to float32 at a time, sized to stay in cache
+WIDEN_BLOCK_BYTES = 1024 * 1024
+
+# Sentinel for a missing integer metadata value
+_MISSING_INT = np.iinfo(np.int64).min
+
+_COMPARISONS = {
+    "$gt": np.greater,
+    "$gte": np.greater_equal,
+    "$lt": np.less,
+    "$lte": np.less_equal,
+}
+
+
+class _Strings:
+    """Read-only column of strings: one UTF-8 blob plus row offsets."""
+
+    def __init__(self, path: Path, name: str):
+        self.offsets = np.load(path / f"{name}.offsets.npy", mmap_mode="r")
+        size = int(self.offsets[-1])
+        self.data = (
+            np.memmap(path / f"{name}.bin", dtype=np.uint8, mode="r")
+            if size
+            else np.zeros(0, dtype=np.uint8)
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.data[start:end].tobytes().decode("utf-8")
+
+
+def _write_strings(path: Path, name: str, values: Iterable[str]) -> None:
+    """Write a _Strings column."""
+    offsets = [0]
+    with open(path / f"{name}.bin", "wb") as f:
+        for value in values:
+            data = value.encode("utf-8")
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+    np.save(path / f"{name}.offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+
+class _Column:
+    """
+    One metadata field for every row.
+
+    Kinds: "int" and "float" (numeric arrays, with a missing marker),
+    "category" (int32 codes into a value list, -1 = missing) and "text"
+    (free strings, for high-cardinality fields).
+    """
+
+    def __init__(self, path: Path, name: str, kind: str):
+        self.kind = kind
+        self.values: list = []
+        self.strings: Optional[_Strings] = None
+        self.present: Optional[np.ndarray] = None
+        if kind == "text":
+            self.strings = _Strings(path, f"meta.{name}")
+            self.present = np.load(path / f"meta.{name}.present.npy", mmap_mode="r")
+            return
+        self.array = np.load(path / f"meta.{name}.npy", mmap_mode="r")
+        if kind == "category":
+            with open(path / f"meta.{name}.values.json", encoding="utf-8") as f:
+                self.values = json.load(f)
+            self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def get(self, i: int):
+        """Value of row i, or None if the row doesn't have this field."""
+        if self.kind == "text":
+            return self.strings[i] if self.present[i] else None
+        value = self.array[i]
+        if self.kind == "category":
+            return self.values[value] if value >= 0 else None
+        if self.kind == "int":
+            return int(value) if value != _MISSING_INT else None
+        return None if np.isnan(value) else float(value)
+
+    def isin(self, wanted: list) -> np.ndarray:
+        """Rows whose value is one of wanted."""
+        if self.kind == "category":
+            codes = [self._codes[v] for v in wanted if isinstance(v, str) and v in self._codes]
+            return np.isin(self.array, codes)
+        if self.kind == "text":
+            wanted_set = set(wanted)
+            rows = range(len(self.strings))
+            matches = (bool(self.present[i]) and self.strings[i] in wanted_set for i in rows)
+            return np.fromiter(matches, dtype=bool, count=len(rows))
+        numbers = [v for v in wanted if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        return np.isin(self.array, numbers)
+
+    def missing(self) -> np.ndarray:
+        """Rows without this field."""
+        if self.kind == "text":
+            return ~np.asarray(self.present, dtype=bool)
+        if self.kind == "category":
+            return self.array < 0
+        if self.kind == "int":
+            return self.array == _MISSING_INT
+        return np.isnan(self.array)
+
+    def compare(self, op: str, value) -> np.ndarray:
+        """Rows satisfying a numeric comparison."""
+        if self.kind not in ("int", "float"):
+            raise ValueError(f"{op} needs a numeric field")
+        return _COMPARISONS[op](self.array, value) & ~self.missing()
+
+
+def _column_kind(values: list) -> str:
+    """Pick the storage kind for one metadata field from its values."""
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    distinct = len(set(map(str, present)))
+    return "category" if distinct <= max(1024, len(values) // 4) else "text"
+
+
+def _write_column(path: Path, name: str, values: list) -> str:
+    """Write one metadata column and return its kind."""
+    kind = _column_kind(values)
+    if kind == "int":
+        array = np.array([_MISSING_INT if v is None else v for v in values], dtype=np.int64)
+        np.save(path / f"meta.{name}.npy", array)
+    elif kind == "float":
+        array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        np.save(path / f"meta.{name}.npy", array)
+    elif kind == "category":
+        codes: dict[str, int] = {}
+        array = np.array(
+            [-1 if v is None else codes.setdefault(str(v), len(codes)) for v in values],
+            dtype=np.int32,
+        )
+        np.save(path / f"meta.{name}.npy", array)
+        with open(path / f"meta.{name}.values.json", "w", encoding="utf-8") as f:
+            json.dump(list(codes), f, ensure_ascii=False)
+    else:
+        _write_strings(path, f"meta.{name}", ("" if v is None else str(v) for v in values))
+        np.save(path / f"meta.{name}.present.npy", np.array([v is not None for v in values]))
+    return kind
+
+
+class VectorStoreWriter:
+    """
+    Writes a VectorStore directory incrementally.
+
+    Vectors are appended straight to disk; ids, documents and metadata are
+    collected and written as columns by finish(). The directory is built
+    next to the target and swapped in at the end, so processes reading the
+    previous export keep working.
+
+    With quantize="int8", finish() also writes int8 codes of the vectors
+    (one scale per dimension) for VectorStore.search(..., rerank=...).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        space: str = "l2",
+        dtype: str = "float32",
+        quantize: Optional[str] = None,
+    ):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        if quantize not in (None, "int8"):
+            raise ValueError(f"Unsupported quantization: {quantize}")
+        self.path = Path(path).resolve()
+        self.space = space
+        self.dtype = np.dtype(dtype)
+        self.quantize = quantize
+        self.dim: Optional[int] = None
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        self._tmp.mkdir(parents=True)
+        self._vectors = open(self._tmp / VECTORS_FILE, "wb")
+        self._ids: list[str] = []
+        self._documents: list[str] = []
+        self._metadatas: list[dict] = []
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings,
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Append rows."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if len(vectors) != len(ids):
+            raise ValueError("ids and embeddings differ in length")
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d vectors, got {vectors.shape[1]}-d")
+        self._vectors.write(vectors.astype(self.dtype).tobytes())
+        self._ids.extend(ids)
+        self._documents.extend(doc or "" for doc in documents)
+        self._metadatas.extend(meta or {} for meta in metadatas)
+
+    def finish(self) -> Path:
+        """Write the columns and manifest, then replace the target directory."""
+        self._vectors.close()
+        count, dim = len(self._ids), self.dim or 0
+
+        # Squared norms, needed for l2 and cosine distances
+        sq_norms = np.zeros(count, dtype=np.float32)
+        if count:
+            vectors = np.memmap(
+                self._tmp / VECTORS_FILE, dtype=self.dtype, mode="r", shape=(count, dim)
+            )
+            step = _block_rows(dim)
+            for start in range(0, count, step):
+                block = np.asarray(vectors[start : start + step], dtype=np.float32)
+                sq_norms[start : start + step] = np.einsum("ij,ij->i", block, block)
+            if self.quantize == "int8":
+                _write_int8_codes(self._tmp, vectors)
+            del vectors
+        np.save(self._tmp / SQ_NORMS_FILE, sq_norms)
+
+        _write_strings(self._tmp, "ids", self._ids)
+        _write_strings(self._tmp, "documents", self._documents)
+        keys = sorted({key for meta in self._metadatas for key in meta})
+        columns = {
+            key: _write_column(self._tmp, key, [meta.get(key) for meta in self._metadatas])
+            for key in keys
+        }
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "count": count,
+            "dim": dim,
+            "dtype": self.dtype.name,
+            "space": self.space,
+            "quantization": self.quantize if count else None,
+            "columns": columns,
+            "created_at": time.time(),
+        }
+        with open(self._tmp / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        old = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(old, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(self._tmp, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+        return self.path
+
+
+def _write_int8_codes(path: Path, vectors: np.ndarray) -> None:
+    """
+    Quantize vectors to int8 with a symmetric scale per dimension.
+
+    code = round(x / scale) with scale = max |x| / 127 over the corpus, so
+    x ~= code * scale and a query's dot product with a row is approximately
+    (query * scales) @ code.
+    """
+    step = _block_rows(vectors.shape[1])
+    max_abs = np.zeros(vectors.shape[1], dtype=np.float32)
+    for start in range(0, len(vectors), step):
+        block = np.abs(np.asarray(vectors[start : start + step], dtype=np.float32))
+        np.maximum(max_abs, block.max(axis=0), out=max_abs)
+    scales = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+
+    with open(path / CODES_FILE, "wb") as f:
+        for start in range(0, len(vectors), step):
+            block = np.asarray(vectors[start : start + step], dtype=np.float32)
+            codes = np.clip(np.rint(block / scales), -127, 127).astype(np.int8)
+            f.write(codes.tobytes())
+    np.save(path / CODE_SCALES_FILE, scales)
+
+
+def _block_rows(dim: int) -> int:
+    """Rows per scoring block for vectors of the given dimension."""
+    return max(1024, SEARCH_BLOCK_BYTES // (4 * max(dim, 1)))
+
+
+class VectorStore:
+    """
+    Nearest-neighbour search over memory-mapped chunk vectors.
+
+    The vectors are one contiguous float32 or float16 matrix on disk and
+    metadata is stored column by column, so opening a store only reads the
+    manifest and several processes share the same pages through the OS page
+    cache. Distances are computed as Chroma does for the collection's space
+    ("l2" is squared euclidean, "cosine" and "ip" are 1 - similarity).
+    float16 vectors are widened to float32 block by block while scoring.
+
+    A store exported with int8 codes can also be searched approximately
+    through the codes (a quarter of the float32 size) with exact re-ranking
+    of the candidates; see search().
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).resolve()
+        with open(self.path / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format: {manifest.get('format_version')}")
+
+        self.count: int = manifest["count"]
+        self.dim: int = manifest["dim"]
+        self.space: str = manifest["space"]
+        self.vectors = (
+            np.memmap(
+                self.path / VECTORS_FILE,
+                dtype=manifest["dtype"],
+                mode="r",
+                shape=(self.count, self.dim),
+            )
+            if self.count
+            else np.zeros((0, self.dim), dtype=manifest["dtype"])
+        )
+        self.sq_norms = np.load(self.path / SQ_NORMS_FILE, mmap_mode="r")
+
+        # Optional int8 codes for candidate generation
+        self.quantization: Optional[str] = manifest.get("quantization")
+        self.codes: Optional[np.ndarray] = None
+        self.code_scales: Optional[np.ndarray] = None
+        if self.quantization == "int8":
+            self.codes = np.memmap(
+                self.path / CODES_FILE, dtype=np.int8, mode="r", shape=(self.count, self.dim)
+            )
+            self.code_scales = np.load(self.path / CODE_SCALES_FILE)
+        self.ids = _Strings(self.path, "ids")
+        self.documents = _Strings(self.path, "documents")
+        self.columns = {
+            name: _Column(self.path, name, kind) for name, kind in manifest["columns"].items()
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes of all files in the store."""
+        return sum(f.stat().st_size for f in self.path.iterdir())
+
+    def page_in(self, codes: bool = False) -> int:
+        """
+        Read the vector (or int8 code) file once so its pages are cached.
+
+        Returns:
+            Bytes paged in
+        """
+        matrix = self.codes if codes and self.codes is not None else self.vectors
+        if not len(matrix):
+            return 0
+        data = matrix.reshape(-1).view(np.uint8)
+        page = 4096
+        for start in range(0, len(data), SEARCH_BLOCK_BYTES):
+            # Touching one byte per page faults the whole page in
+            int(data[start : start + SEARCH_BLOCK_BYTES : page].sum())
+        return len(data)
+
+    def metadata(self, i: int) -> dict:
+        """Metadata of row i, as it was exported."""
+        meta = {}
+        for name, column in self.columns.items():
+            value = column.get(i)
+            if value is not None:
+                meta[name] = value
+        return meta
+
+    def mask(self, where: dict) -> np.ndarray:
+        """
+        Rows matching a Chroma-style metadata filter.
+
+        Supports $and / $or and the $eq, $ne, $in, $nin, $gt, $gte, $lt and
+        $lte operators (a bare value means $eq).
+
+        Raises:
+            ValueError: For an unsupported operator
+        """
+        result = np.ones(self.count, dtype=bool)
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                masks = [self.mask(sub) for sub in condition]
+                if not masks:
+                    continue
+                combine = np.logical_and if key == "$and" else np.logical_or
+                result &= combine.reduce(masks)
+            else:
+                result &= self._field_mask(key, condition)
+        return result
+
+    def _field_mask(self, name: str, condition) -> np.ndarray:
+        """Rows whose field satisfies one condition."""
+        column = self.columns.get(name)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        result = np.ones(self.count, dtype=bool)
+        for op, value in condition.items():
+            if op not in ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte"):
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if column is None:
+                # Rows without the field never match
+                return np.zeros(self.count, dtype=bool)
+            if op in ("$eq", "$in"):
+                result &= column.isin(value if op == "$in" else [value])
+            elif op in ("$ne", "$nin"):
+                result &= ~column.isin(value if op == "$nin" else [value]) & ~column.missing()
+            else:
+                result &= column.compare(op, value)
+        return result
+
+    def search(
+        self,
+        queries,
+        k: int,
+        positions: Optional[np.ndarray] = None,
+        rerank: Optional[int] = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        k nearest rows for each query vector.
+
+        Rows are scored block by block with one matrix product per block
+        for all queries, keeping each block's top k. With rerank, the scan
+        runs over the int8 codes instead and keeps k * rerank candidates,
+        which are then re-scored against the full-precision vectors; only
+        the candidates' rows of the vector file are read.
+
+        Args:
+            queries: Query vectors, shape (n_queries, dim)
+            k: Number of results per query
+            positions: Restrict the search to these rows (e.g. a filter)
+            rerank: Candidates per result for int8 search (needs codes)
+
+        Returns:
+            One (rows, distances) pair per query, nearest first
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        total = self.count if positions is None else len(positions)
+        if total == 0 or k <= 0:
+            empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+            return [empty for _ in queries]
+
+        if rerank is None:
+            return self._scan(self.vectors, queries, queries, k, positions)
+        if self.codes is None:
+            raise ValueError("Store has no int8 codes; export with --quantize int8")
+        candidates = self._scan(
+            self.codes, queries * self.code_scales, queries, k * max(rerank, 1), positions
+        )
+        return [self._rescore(query, rows, k) for query, (rows, _) in zip(queries, candidates)]
+
+    def _scan(
+        self,
+        matrix: np.ndarray,
+        scan_queries: np.ndarray,
+        queries: np.ndarray,
+        k: int,
+        positions: Optional[np.ndarray],
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Top k rows of matrix per query, scoring dot products with scan_queries."""
+        total = self.count if positions is None else len(positions)
+        query_sq_norms = np.einsum("ij,ij->i", queries, queries)
+        step = _block_rows(self.dim)
+        candidate_rows, candidate_distances = [], []
+        for start in range(0, total, step):
+            if positions is None:
+                rows = np.arange(start, min(start + step, total))
+                block = matrix[start : start + step]
+            else:
+                rows = np.asarray(positions[start : start + step], dtype=np.int64)
+                block = matrix[rows]
+            distances = self._distances(
+                _dots(block, scan_queries), self.sq_norms[rows], query_sq_norms
+            )
+            top = _top_k(distances, k)
+            candidate_rows.append(rows[top])
+            candidate_distances.append(np.take_along_axis(distances, top, axis=1))
+
+        rows = np.concatenate(candidate_rows, axis=1)
+        distances = np.concatenate(candidate_distances, axis=1)
+        top = _top_k(distances, k)
+        rows = np.take_along_axis(rows, top, axis=1)
+        distances = np.take_along_axis(distances, top, axis=1)
+        order = np.argsort(distances, axis=1, kind="stable")
+        rows = np.take_along_axis(rows, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+        return list(zip(rows, distances))
+
+    def _rescore(
+        self, query: np.ndarray, rows: np.ndarray, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Exact top k among candidate rows."""
+        rows = np.sort(rows)  # Read the vector file front to back
+        distances = self._distances(
+            _dots(self.vectors[rows], query[None, :]),
+            self.sq_norms[rows],
+            np.array([query @ query]),
+        )[0]
+        order = np.argsort(distances, kind="stable")[:k]
+        return rows[order], distances[order]
+
+    def _distances(
+        self,
+        dots: np.ndarray,
+        row_sq_norms: np.ndarray,
+        query_sq_norms: np.ndarray,
+    ) -> np.ndarray:
+        """Distances from query/row dot products, shape (n_queries, rows)."""
+        if self.space == "cosine":
+            norms = np.sqrt(query_sq_norms)[:, None] * np.sqrt(row_sq_norms)[None, :]
+            return 1.0 - dots / np.maximum(norms, 1e-12)
+        if self.space == "ip":
+            return 1.0 - dots
+        return np.maximum(query_sq_norms[:, None] - 2 * dots + row_sq_norms[None, :], 0.0)
+
+
+def _dots(block: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """
+    Dot products of each query with each row, shape (n_queries, rows).
+
+    float16 and int8 rows are widened a cache-sized slice at a time into a
+    reused float32 buffer, which is much faster than widening the block.
+    """
+    if block.dtype == np.float32:
+        return (block @ queries.T).T
+    dots = np.empty((len(queries), len(block)), dtype=np.float32)
+    step = max(64, WIDEN_BLOCK_BYTES // (4 * max(block.shape[1], 1)))
+    buffer = np.empty((min(step, len(block)), block.shape[1]), dtype=np.float32)
+    for start in range(0, len(block), step):
+        part = block[start : start + step]
+        widened = buffer[: len(part)]
+        np.copyto(widened, part, casting="unsafe")
+        dots[:, start : start + len(part)] = (widened @ queries.T).T
+    return dots
+
+
+def _top_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k smallest distances in each row (unordered)."""
+    if distances.shape[1] <= k:
+        return np.broadcast_to(np.arange(distances.shape[1]), distances.shape).copy()
+    return np.argpartition(distances, k - 1, axis=1)[:, :k]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Aozora cleaning engine.
+
+Compares clean_aozora_text with the multi-pass reference pipeline on texts
+from the Aozora repository, checks that both produce identical output, and
+reports throughput in MB/s of input text.
+
+Usage:
+    python bench_cleaning.py [--limit 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from aozora.cleaning import (
+    clean_aozora_text,
+    clean_aozora_text_reference,
+    read_aozora_file,
+)
+
+load_dotenv()
+
+AOZORA_REPO_PATH = Path(os.getenv("AOZORA_REPO_PATH", "../data/aozora_repo"))
+
+SAMPLE_TEXT = (
+    "羅生門\n芥川龍之介\n\n"
+    "-------------------------------------------------------\n"
+    "【テキスト中に現れる記号について】\n\n《》：ルビ\n（例）下人《げにん》\n"
+    "-------------------------------------------------------\n\n"
+    + "　ある日の暮方の事である。一人の下人《げにん》が、羅生門《らしょうもん》の下で"
+    "雨やみを待っていた。｜広い門《もん》の下には、この男のほかに誰もいない。"
+    "［＃「誰もいない」に傍点］※［＃「木＋間」、第3水準1-85-88］\n" * 2000
+    + "\n\n\n底本：「芥川龍之介全集1」ちくま文庫、筑摩書房\n入力：j.utiyama\n"
+)
+
+
+def load_texts(limit: int) -> list[str]:
+    """Load texts from the repository, or fall back to a built-in sample."""
+    cards_dir = AOZORA_REPO_PATH.resolve() / "cards"
+    texts = []
+    if cards_dir.exists():
+        for filepath in sorted(cards_dir.glob("**/files/*_ruby*.zip"))[:limit]:
+            try:
+                texts.append(read_aozora_file(filepath))
+            except ValueError:
+                continue
+
+    if not texts:
+        print(f"No texts found under {cards_dir}, using built-in sample")
+        texts = [SAMPLE_TEXT]
+    return texts
+
+
+def bench(name: str, func, texts: list[str], total_mb: float, repeat: int) -> list[str]:
+    """Run a cleaning function over all texts and print the best throughput."""
+    best = float("inf")
+    outputs: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{name:<12} {best * 1000:9.1f} ms  {total_mb / best:8.2f} MB/s")
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--limit", type=int, default=200, help="Max number of files to load")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    texts = load_texts(args.limit)
+    total_mb = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    print(f"{len(texts)} texts, {total_mb:.2f} MB\n")
+
+    reference = bench("reference", clean_aozora_text_reference, texts, total_mb, args.repeat)
+    engine = bench("engine", clean_aozora_text, texts, total_mb, args.repeat)
+
+    mismatches = sum(1 for a, b in zip(reference, engine) if a != b)
+    if mismatches:
+        print(f"\nERROR: {mismatches} outputs differ from the reference")
+        sys.exit(1)
+    print("\nOutputs identical to reference")
+
+
+if __name__ == "__main__":
+    main()
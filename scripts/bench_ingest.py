@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ingest stages on a synthetic Aozora corpus.
+
+Generates cp932 and UTF-8 works, zipped and plain, from short stories to
+full-length novels (see aozora/synthetic.py), writes them to a temporary
+repository and times each stage the ingest pipeline runs per file:
+read_aozora_file, _decode_text, clean_aozora_text, chunk_text and
+create_chunks_with_context, plus all of them end to end. Throughput is
+reported in MB/s of decoded text (UTF-8 bytes) so stages are comparable,
+and in chunks/s for the chunking stages.
+
+Usage:
+    python bench_ingest.py [--works 40] [--sizes short=7,medium=2,novel=1] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from aozora.chunking import chunk_text, create_chunks_with_context
+from aozora.cleaning import _decode_text, clean_aozora_text, read_aozora_file
+from aozora.schema import WorkInfo
+from aozora.synthetic import SIZE_CLASSES, SyntheticWork, generate_corpus, write_corpus
+
+
+def best_time(func: Callable[[], int], repeat: int) -> tuple[float, int]:
+    """Run func repeat times; returns (best seconds, its return value)."""
+    best, result = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def parse_sizes(value: str) -> dict[str, float]:
+    """Parse "short=7,medium=2,novel=1" into size class weights."""
+    sizes = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SIZE_CLASSES:
+            raise argparse.ArgumentTypeError(f"Unknown size {name!r}; use {list(SIZE_CLASSES)}")
+        sizes[name] = float(weight or 1)
+    return sizes
+
+
+def work_info(work: SyntheticWork) -> WorkInfo:
+    """Chunk metadata source for a generated work."""
+    return WorkInfo(work.work_id, work.title, work.author, str(work.path))
+
+
+def run_stages(works: list[SyntheticWork], repeat: int) -> dict[str, dict]:
+    """
+    Time every stage over all works.
+
+    Each stage gets the previous stage's output, prepared outside the timed
+    region, so a row measures that function alone.
+
+    Returns:
+        Per stage: seconds, MB/s and (for chunking stages) chunks and chunks/s
+    """
+    paths = [work.path for work in works]
+    raw = [read_aozora_file(path) for path in paths]
+    text_mb = sum(len(text.encode("utf-8")) for text in raw) / 1e6
+
+    # _decode_text gets the file's text bytes, unzipped as read_aozora_file would
+    encoded = [work.text.replace("\n", "\r\n").encode(work.encoding) for work in works]
+    cleaned = [clean_aozora_text(text) for text in raw]
+    infos = [work_info(work) for work in works]
+
+    def overall() -> int:
+        chunks = 0
+        for path, info in zip(paths, infos):
+            text = clean_aozora_text(read_aozora_file(path))
+            chunks += len(create_chunks_with_context(text, info))
+        return chunks
+
+    stages = {
+        "read_aozora_file": lambda: len([read_aozora_file(path) for path in paths]),
+        "_decode_text": lambda: len([_decode_text(data) for data in encoded]),
+        "clean_aozora_text": lambda: len([clean_aozora_text(text) for text in raw]),
+        "chunk_text": lambda: sum(len(list(chunk_text(text))) for text in cleaned),
+        "create_chunks_with_context": lambda: sum(
+            len(create_chunks_with_context(text, info)) for text, info in zip(cleaned, infos)
+        ),
+        "overall": overall,
+    }
+
+    results = {}
+    for name, func in stages.items():
+        seconds, count = best_time(func, repeat)
+        row = {"seconds": seconds, "mb_per_s": text_mb / seconds}
+        if name in ("chunk_text", "create_chunks_with_context", "overall"):
+            row.update(chunks=count, chunks_per_s=count / seconds)
+        results[name] = row
+    return results
+
+
+def run_by_format(works: list[SyntheticWork], repeat: int) -> dict[str, dict]:
+    """Time read_aozora_file separately per encoding and packaging."""
+    groups: dict[str, list[SyntheticWork]] = {}
+    for work in works:
+        groups.setdefault(f"{work.encoding} {'zip' if work.zipped else 'txt'}", []).append(work)
+
+    results = {}
+    for name, members in sorted(groups.items()):
+        paths = [work.path for work in members]
+        text_mb = sum(len(work.text.encode("utf-8")) for work in members) / 1e6
+        seconds, _ = best_time(lambda: len([read_aozora_file(path) for path in paths]), repeat)
+        results[name] = {"works": len(members), "seconds": seconds, "mb_per_s": text_mb / seconds}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--works", type=int, default=40, help="Number of synthetic works")
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default="short=7,medium=2,novel=1",
+        help=f"Weights of size classes {SIZE_CLASSES}",
+    )
+    parser.add_argument("--utf8-ratio", type=float, default=0.2, help="Fraction encoded as UTF-8")
+    parser.add_argument("--zip-ratio", type=float, default=0.8, help="Fraction zipped")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", type=Path, default=None, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    works = generate_corpus(args.works, args.sizes, args.utf8_ratio, args.zip_ratio, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(Path(tmp), works)
+        file_mb = sum(work.path.stat().st_size for work in works) / 1e6
+        text_mb = sum(len(work.text.encode("utf-8")) for work in works) / 1e6
+        longest = max(len(work.text) for work in works)
+        print(
+            f"{len(works)} works, {text_mb:.1f} MB of text ({file_mb:.1f} MB on disk), "
+            f"longest {longest:,} chars; generated in {time.perf_counter() - start:.1f}s\n"
+        )
+
+        stages = run_stages(works, args.repeat)
+        print(f"{'stage':<28} {'ms':>9} {'MB/s':>8} {'chunks/s':>10}")
+        for name, row in stages.items():
+            chunks_per_s = f"{row['chunks_per_s']:10.0f}" if "chunks_per_s" in row else f"{'':>10}"
+            print(f"{name:<28} {row['seconds'] * 1000:9.1f} {row['mb_per_s']:8.2f} {chunks_per_s}")
+
+        formats = run_by_format(works, args.repeat)
+        print(f"\n{'read_aozora_file by format':<28} {'works':>9} {'MB/s':>8}")
+        for name, row in formats.items():
+            print(f"{name:<28} {row['works']:>9} {row['mb_per_s']:8.2f}")
+
+    if args.output:
+        result = {
+            "params": {
+                "works": args.works,
+                "sizes": args.sizes,
+                "utf8_ratio": args.utf8_ratio,
+                "zip_ratio": args.zip_ratio,
+                "seed": args.seed,
+            },
+            "text_mb": text_mb,
+            "stages": stages,
+            "read_by_format": formats,
+        }
+        args.output.write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
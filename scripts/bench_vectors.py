@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark int8 search with exact re-ranking against exact vector search.
+
+Runs the same queries through a VectorStore exactly and through its int8
+codes at several re-rank factors, and reports the memory each mode keeps
+hot, queries per second, and recall@k against the exact results. Uses the
+exported store (VECTOR_STORE_DIR, exported with --quantize int8) or, with
+--synthetic, a generated clustered corpus.
+
+Usage:
+    python bench_vectors.py [--synthetic 200000 --dim 1536] [--queries 200] [-k 10]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from aozora.vector_store import CODES_FILE, VECTORS_FILE, VectorStore, VectorStoreWriter
+
+load_dotenv()
+
+VECTOR_STORE_DIR = Path(os.getenv("VECTOR_STORE_DIR", "../data/vector_store"))
+
+
+def build_synthetic(path: Path, count: int, dim: int, seed: int) -> VectorStore:
+    """Write a clustered random corpus (embeddings are far from uniform) with int8 codes."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(count // 200, 1), dim), dtype=np.float32)
+    writer = VectorStoreWriter(path, space="cosine", quantize="int8")
+    step = 20000
+    for start in range(0, count, step):
+        n = min(step, count - start)
+        vectors = centers[rng.integers(0, len(centers), n)]
+        vectors += 0.5 * rng.standard_normal((n, dim), dtype=np.float32)
+        writer.add(
+            [f"synthetic:{i}" for i in range(start, start + n)],
+            vectors,
+            [""] * n,
+            [{"chunk_index": i} for i in range(start, start + n)],
+        )
+    return VectorStore(writer.finish())
+
+
+def make_queries(store: VectorStore, count: int, seed: int) -> np.ndarray:
+    """Perturbed copies of random stored vectors, standing in for query embeddings."""
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(store), size=min(count, len(store)), replace=False))
+    vectors = np.asarray(store.vectors[rows], dtype=np.float32)
+    noise = rng.standard_normal(vectors.shape, dtype=np.float32)
+    return vectors + 0.5 * noise * vectors.std(axis=1, keepdims=True)
+
+
+def run(store: VectorStore, queries: np.ndarray, k: int, batch: int, rerank) -> tuple:
+    """Search all queries in batches; returns (results, queries per second)."""
+    store.search(queries[:batch], k, rerank=rerank)  # Warm the page cache
+    start = time.perf_counter()
+    results = []
+    for i in range(0, len(queries), batch):
+        results.extend(rows for rows, _ in store.search(queries[i : i + batch], k, rerank=rerank))
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def recall(results: list[np.ndarray], exact: list[np.ndarray], k: int) -> float:
+    """Mean fraction of the exact top k found."""
+    hits = [len(set(r.tolist()) & set(e.tolist())) for r, e in zip(results, exact)]
+    return float(np.mean(hits)) / k
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--store", type=Path, default=VECTOR_STORE_DIR, help="Store directory")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate this many vectors")
+    parser.add_argument("--dim", type=int, default=1536, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--batch", type=int, default=1, help="Queries per search call")
+    parser.add_argument("-k", type=int, default=10, help="Results per query")
+    parser.add_argument(
+        "--rerank", type=int, nargs="+", default=[1, 2, 4, 8], help="Re-rank factors to try"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            print(f"Generating {args.synthetic} synthetic {args.dim}-d vectors...")
+            store = build_synthetic(Path(tmp) / "store", args.synthetic, args.dim, args.seed)
+        else:
+            store = VectorStore(args.store)
+        if store.codes is None:
+            print(f"{store.path} has no int8 codes: export with --quantize int8 or use --synthetic")
+            sys.exit(1)
+
+        vectors_mb = (store.path / VECTORS_FILE).stat().st_size / 1e6
+        codes_mb = (store.path / CODES_FILE).stat().st_size / 1e6
+        print(f"{len(store)} vectors, {store.dim}-d {store.vectors.dtype}, {store.space}")
+        print(f"{'':<12} {'hot MB':>9} {'QPS':>9} {'recall@' + str(args.k):>10}")
+
+        queries = make_queries(store, args.queries, args.seed)
+        exact, qps = run(store, queries, args.k, args.batch, None)
+        print(f"{'exact':<12} {vectors_mb:9.1f} {qps:9.1f} {1.0:10.3f}")
+
+        row_mb = store.dim * store.vectors.dtype.itemsize / 1e6
+        for factor in args.rerank:
+            results, qps = run(store, queries, args.k, args.batch, factor)
+            # Codes stay resident; re-ranking touches only the candidates' rows
+            hot_mb = codes_mb + min(args.k * factor * len(queries) * row_mb, vectors_mb)
+            print(
+                f"{'int8 x' + str(factor):<12} {hot_mb:9.1f} {qps:9.1f} "
+                f"{recall(results, exact, args.k):10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Export the Chroma chunk collection to a memory-mapped vector store.
+
+Writes every chunk's embedding into one contiguous float32 (or float16)
+matrix plus columnar ids, documents and metadata, for the backend's
+VECTOR_BACKEND=memmap mode. Re-run after each ingest; the new export
+replaces the old one atomically.
+
+Usage:
+    python export_vectors.py [--dtype float16] [--quantize int8] [--page-size 5000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import chromadb
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from aozora.vector_store import VectorStoreWriter
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+CHROMA_PERSIST_DIR = Path(os.getenv("CHROMA_PERSIST_DIR", "../chroma"))
+CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "aozora_chunks_v1")
+VECTOR_STORE_DIR = Path(os.getenv("VECTOR_STORE_DIR", "../data/vector_store"))
+
+
+def collection_space(collection) -> str:
+    """Get the distance function a collection's HNSW index was built with."""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="Storage precision; float16 halves memory but scores more slowly",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["int8"],
+        default=None,
+        help="Also write int8 codes for VECTOR_INDEX=int8",
+    )
+    parser.add_argument("--page-size", type=int, default=5000, help="Chunks read per Chroma call")
+    parser.add_argument("--output", type=Path, default=VECTOR_STORE_DIR, help="Store directory")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=str(CHROMA_PERSIST_DIR.resolve()))
+    collection = client.get_collection(name=CHROMA_COLLECTION)
+    space = collection_space(collection)
+    logger.info(f"Exporting {collection.count()} chunks from {CHROMA_COLLECTION} ({space})")
+
+    start = time.perf_counter()
+    writer = VectorStoreWriter(args.output, space=space, dtype=args.dtype, quantize=args.quantize)
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=args.page_size,
+            offset=offset,
+        )
+        if not page["ids"]:
+            break
+        writer.add(page["ids"], page["embeddings"], page["documents"], page["metadatas"])
+        offset += len(page["ids"])
+        logger.info(f"  {offset} chunks")
+
+    path = writer.finish()
+    size_mb = sum(f.stat().st_size for f in path.iterdir()) / 1e6
+    logger.info(
+        f"Wrote {offset} vectors ({writer.dim}-d {args.dtype}) to {path}: "
+        f"{size_mb:.1f} MB in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,9 @@ Aozora Bunko ingestion pipeline.
 This script:
 1. Finds text files in the Aozora repository
 2. Cleans and chunks the text
-3. Generates embeddings using OpenAI
-4. Stores in ChromaDB
+3. Stores each cleaned work once in the text store
+4. Generates embeddings using OpenAI
+5. Stores in ChromaDB
 """
 
 import json
@@ -27,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from aozora.cleaning import clean_aozora_text, read_aozora_file
 from aozora.chunking import create_chunks_with_context
 from aozora.schema import WorkInfo
+from aozora.text_store import TextStore
 
 # Load environment
 load_dotenv()
@@ -43,6 +45,7 @@ AOZORA_REPO_PATH = Path(os.getenv("AOZORA_REPO_PATH", "../data/aozora_repo"))
 CHROMA_PERSIST_DIR = Path(os.getenv("CHROMA_PERSIST_DIR", "../chroma"))
 CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "aozora_chunks_v1")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+TEXT_STORE_PATH = Path(os.getenv("WORK_TEXT_STORE_PATH", "../data/work_texts.sqlite"))
 MANIFEST_PATH = Path(os.getenv("OUTPUT_MANIFEST_PATH", "../data/manifests/aozora_index.jsonl"))
 
 # Batch sizes
@@ -156,6 +159,10 @@ def main():
     logger.info(f"Using collection: {CHROMA_COLLECTION}")
     logger.info(f"Existing documents: {collection.count()}")
 
+    # Cleaned texts are stored once per work; chunks only keep offsets
+    text_store = TextStore(TEXT_STORE_PATH)
+    logger.info(f"Using text store: {text_store.path}")
+
     # Find text files
     repo_path = AOZORA_REPO_PATH.resolve()
     logger.info(f"Scanning repository: {repo_path}")
@@ -193,6 +200,8 @@ def main():
             logger.error(f"Error processing {filepath}: {e}")
             continue
 
+        text_store.put(work_info.work_id, clean_text)
+
         # Create chunks
         chunks = create_chunks_with_context(clean_text, work_info)
         logger.info(f"  Created {len(chunks)} chunks for {work_info.title[:30]}...")
@@ -249,6 +258,8 @@ def main():
         for entry in manifest_entries:
             f.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
+    text_store.close()
+
     logger.info(f"\nManifest saved to: {MANIFEST_PATH}")
     logger.info(f"Total documents in collection: {collection.count()}")
     logger.info("=== Ingestion complete ===")
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the backend against local fixtures.
+
+Builds a synthetic Aozora repository, text store and Chroma collection
+(chunked and indexed the same way as ingest_pipeline.py, with stub
+embeddings), starts the stub Exa/embedding server and the backend, then
+drives /api/search, /api/works and /api/works/{id}/text at a target
+concurrency. Reports throughput and p50/p95/p99 latency per endpoint and
+compares them with a stored baseline, exiting non-zero on a regression.
+
+The backend is started with this interpreter, so run it in an environment
+that also has the backend's requirements installed.
+
+Usage:
+    python loadtest.py [--works 200] [--concurrency 32] [--duration 30] [--save-baseline]
+    python loadtest.py --url http://localhost:8000   # an already running backend
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import chromadb
+import httpx
+import numpy as np
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from aozora.chunking import create_chunks_with_context
+from aozora.cleaning import clean_aozora_text
+from aozora.schema import WorkInfo
+from aozora.synthetic import NOUNS, SURNAMES, VERBS, author_name, encode_work, generate_text
+from aozora.text_store import TextStore
+from stub_services import EMBEDDING_DIM, StubConfig, start_stub_server, stub_embedding
+
+load_dotenv()
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+FIXTURE_DIR = Path(os.getenv("LOADTEST_FIXTURE_DIR", "../data/loadtest"))
+BASELINE_PATH = Path(os.getenv("LOADTEST_BASELINE_PATH", "../data/loadtest_baseline.json"))
+CHROMA_COLLECTION = "aozora_chunks_v1"
+CHROMA_BATCH_SIZE = 5000
+
+ENDPOINTS = ("search", "works", "text")
+
+
+def build_fixture(path: Path, works: int, work_chars: int, dim: int, seed: int) -> dict:
+    """
+    Build the repository, text store and Chroma collection, unless present.
+
+    Returns:
+        The fixture manifest (its parameters and chunk count)
+    """
+    params = {"works": works, "work_chars": work_chars, "dim": dim, "seed": seed}
+    manifest_path = path / "fixture.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["params"] == params:
+            print(f"Reusing fixture in {path} ({manifest['chunks']} chunks)")
+            return manifest
+
+    print(f"Building fixture in {path}: {works} works of ~{work_chars} chars...")
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    for name in ("fixture.json", "works_catalog.sqlite", "work_texts.sqlite", "exa_cache.sqlite"):
+        (path / name).unlink(missing_ok=True)
+    shutil.rmtree(path / "aozora_repo", ignore_errors=True)
+    path.mkdir(parents=True, exist_ok=True)
+
+    client = chromadb.PersistentClient(path=str((path / "chroma").resolve()))
+    if CHROMA_COLLECTION in [c.name for c in client.list_collections()]:
+        client.delete_collection(CHROMA_COLLECTION)
+    collection = client.create_collection(CHROMA_COLLECTION, metadata={"hnsw:space": "cosine"})
+    text_store = TextStore(path / "work_texts.sqlite")
+    repo = path / "aozora_repo"
+
+    pending: list[tuple[str, object]] = []
+    chunks = 0
+
+    def flush() -> None:
+        texts = [text for text, _ in pending]
+        collection.add(
+            ids=[meta.chunk_id for _, meta in pending],
+            embeddings=[stub_embedding(text, dim) for text in texts],
+            documents=texts,
+            metadatas=[meta.to_dict() for _, meta in pending],
+        )
+        pending.clear()
+
+    for i in range(works):
+        author_id = f"{i % max(works // 8, 1) + 1:06d}"
+        author = author_name(int(author_id))
+        work_id = str(1000 + i)
+        title = f"{rng.choice(NOUNS)}と{rng.choice(NOUNS)}"
+        text = generate_text(rng, title, author, int(work_chars * rng.uniform(0.5, 1.5)))
+
+        # Aozora ships Shift_JIS text with CRLF line endings inside a ZIP
+        files = repo / "cards" / author_id / "files"
+        files.mkdir(parents=True, exist_ok=True)
+        name = f"{work_id}_ruby_{20000 + i}"
+        (files / f"{name}.zip").write_bytes(encode_work(text, "cp932", True, name))
+
+        clean_text = clean_aozora_text(text)
+        text_store.put(work_id, clean_text)
+        info = WorkInfo(work_id, title, author, f"cards/{author_id}/files/{name}.zip")
+        for chunk in create_chunks_with_context(clean_text, info):
+            pending.append(chunk)
+            chunks += 1
+            if len(pending) >= CHROMA_BATCH_SIZE:
+                flush()
+    if pending:
+        flush()
+    text_store.close()
+
+    manifest = {"params": params, "chunks": chunks}
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    print(f"Built {works} works, {chunks} chunks in {time.perf_counter() - start:.1f}s")
+    return manifest
+
+
+def start_backend(fixture: Path, stub_url: str, port: int, extra_env: dict) -> subprocess.Popen:
+    """Start uvicorn on the fixture with the stub APIs; logs go to backend.log."""
+    fixture = fixture.resolve()
+    env = {
+        **os.environ,
+        "AOZORA_REPO_PATH": str(fixture / "aozora_repo"),
+        "WORKS_CATALOG_PATH": str(fixture / "works_catalog.sqlite"),
+        "WORK_TEXT_STORE_PATH": str(fixture / "work_texts.sqlite"),
+        "CHROMA_PERSIST_DIR": str(fixture / "chroma"),
+        "CHROMA_COLLECTION": CHROMA_COLLECTION,
+        "EXA_CACHE_PATH": str(fixture / "exa_cache.sqlite"),
+        "SLOW_QUERY_LOG_PATH": str(fixture / "slow_queries.jsonl"),
+        "EXA_API_KEY": "loadtest",
+        "EXA_BASE_URL": stub_url,
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": stub_url,
+        "EMBEDDING_PROVIDER": "openai",
+        **extra_env,
+    }
+    log = (fixture / "backend.log").open("wb")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+async def wait_ready(url: str, timeout: float, process: Optional[subprocess.Popen]) -> None:
+    """Poll /ready until the backend has warmed up."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Backend exited with code {process.returncode}")
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"Backend at {url} not ready after {timeout}s")
+
+
+class Workload:
+    """Picks the next request: endpoint by weight, queries with a hot set for cache hits."""
+
+    def __init__(
+        self,
+        mix: dict[str, float],
+        work_ids: list[str],
+        repeat_ratio: float,
+        include_web: bool,
+        seed: int,
+    ):
+        self.endpoints = list(mix)
+        self.weights = [mix[e] for e in self.endpoints]
+        self.work_ids = work_ids
+        self.repeat_ratio = repeat_ratio
+        self.include_web = include_web
+        self.rng = random.Random(seed)
+        self.hot_queries = [self._fresh_query() for _ in range(20)]
+
+    def _fresh_query(self) -> str:
+        nouns = self.rng.sample(NOUNS, 2)
+        return f"{nouns[0]}が{nouns[1]}の前で{self.rng.choice(VERBS)}場面"
+
+    def next_request(self) -> tuple[str, str, str, Optional[dict]]:
+        """Returns (endpoint, method, path, JSON body)."""
+        endpoint = self.rng.choices(self.endpoints, self.weights)[0]
+        if endpoint == "search":
+            if self.rng.random() < self.repeat_ratio:
+                query = self.rng.choice(self.hot_queries)
+            else:
+                query = self._fresh_query()
+            body = {"query": query, "k_internal": 5, "k_web": 3, "include_web": self.include_web}
+            return endpoint, "POST", "/api/search", body
+        if endpoint == "works":
+            if self.rng.random() < 0.5:
+                return endpoint, "GET", f"/api/works?q={self.rng.choice(SURNAMES)}", None
+            return endpoint, "GET", f"/api/works?limit=100&offset={self.rng.randrange(200)}", None
+        return endpoint, "GET", f"/api/works/{self.rng.choice(self.work_ids)}/text", None
+
+
+async def fetch_work_ids(client: httpx.AsyncClient) -> list[str]:
+    """List every work ID the backend serves."""
+    work_ids: list[str] = []
+    while True:
+        response = await client.get("/api/works", params={"limit": 500, "offset": len(work_ids)})
+        response.raise_for_status()
+        page = response.json()["works"]
+        work_ids += [work["work_id"] for work in page]
+        if not page or len(work_ids) >= response.json()["total"]:
+            return work_ids
+
+
+async def drive(
+    url: str,
+    workload: Workload,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    timeout: float,
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    """
+    Run closed-loop workers for warmup + duration seconds.
+
+    Returns:
+        Tuple of (latencies in seconds per endpoint, errors per endpoint,
+        measured seconds); requests finishing during warmup are discarded
+    """
+    latencies: dict[str, list[float]] = {e: [] for e in ENDPOINTS}
+    errors: dict[str, int] = {e: 0 for e in ENDPOINTS}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        stop_at = measure_from + duration
+
+        async def worker() -> None:
+            while loop.time() < stop_at:
+                endpoint, method, path, body = workload.next_request()
+                start = loop.time()
+                try:
+                    response = await client.request(method, path, json=body)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                end = loop.time()
+                if measure_from <= start and end <= stop_at:
+                    if ok:
+                        latencies[endpoint].append(end - start)
+                    else:
+                        errors[endpoint] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, duration
+
+
+def summarize(latencies: dict[str, list[float]], errors: dict[str, int], seconds: float) -> dict:
+    """Throughput, error rate and latency percentiles (ms) per endpoint and overall."""
+    summary = {}
+    groups = {**latencies, "all": [x for values in latencies.values() for x in values]}
+    error_counts = {**errors, "all": sum(errors.values())}
+    for name, values in groups.items():
+        total = len(values) + error_counts[name]
+        if not total:
+            continue
+        ms = np.asarray(values) * 1000 if values else np.zeros(1)
+        summary[name] = {
+            "requests": total,
+            "errors": error_counts[name],
+            "error_rate": error_counts[name] / total,
+            "throughput_rps": len(values) / seconds,
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "mean_ms": float(ms.mean()),
+        }
+    return summary
+
+
+def print_summary(summary: dict) -> None:
+    """Print the per-endpoint table."""
+    header = f"{'endpoint':<8} {'reqs':>7} {'errors':>7} {'req/s':>8}"
+    print(header + f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in summary.items():
+        print(
+            f"{name:<8} {row['requests']:>7} {row['errors']:>7} {row['throughput_rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Find regressions against the baseline.
+
+    Latency percentiles may grow and throughput may drop by the tolerance
+    fraction; the error rate may grow by one percentage point.
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    print(f"\nAgainst baseline ({baseline.get('created_at', 'unknown date')}):")
+    for name, row in summary.items():
+        base = baseline["summary"].get(name)
+        if base is None:
+            continue
+        changes = []
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = base[metric], row[metric]
+            change = (after - before) / before if before else 0.0
+            changes.append(f"{metric} {change:+.0%}")
+            worse = -change if metric == "throughput_rps" else change
+            if metric != "p50_ms" and worse > tolerance:
+                regressions.append(f"{name} {metric}: {before:.1f} -> {after:.1f} ({change:+.0%})")
+        if row["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(
+                f"{name} error rate: {base['error_rate']:.1%} -> {row['error_rate']:.1%}"
+            )
+        print(f"  {name:<8} " + ", ".join(changes))
+    return regressions
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse "search=6,works=2,text=2" into endpoint weights."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name!r}; use {ENDPOINTS}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def run(args: argparse.Namespace) -> int:
+    process = None
+    stub = None
+    url = args.url
+    if url is None:
+        build_fixture(args.fixture_dir, args.works, args.work_chars, args.dim, args.seed)
+        stub = start_stub_server(
+            StubConfig(
+                exa_latency_ms=args.exa_latency_ms,
+                exa_jitter_ms=args.exa_latency_ms / 3,
+                exa_failure_rate=args.exa_failure_rate,
+                exa_timeout_rate=args.exa_timeout_rate,
+                embedding_latency_ms=args.embedding_latency_ms,
+                dim=args.dim,
+                seed=args.seed,
+            )
+        )
+        # A fresh Exa cache per run, so cache hits come only from the workload
+        (args.fixture_dir / "exa_cache.sqlite").unlink(missing_ok=True)
+        extra_env = dict(item.split("=", 1) for item in args.backend_env)
+        process = start_backend(
+            args.fixture_dir, f"http://127.0.0.1:{stub.server_port}", args.port, extra_env
+        )
+        url = f"http://127.0.0.1:{args.port}"
+        print(f"Backend starting on {url} (log: {args.fixture_dir / 'backend.log'})")
+
+    try:
+        await wait_ready(url, args.ready_timeout, process)
+        async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+            work_ids = await fetch_work_ids(client)
+        print(
+            f"Driving {url} with {args.concurrency} workers for {args.duration}s "
+            f"(+{args.warmup}s warmup) over {len(work_ids)} works"
+        )
+        workload = Workload(args.mix, work_ids, args.repeat_ratio, not args.no_web, args.seed)
+        latencies, errors, seconds = await drive(
+            url, workload, args.concurrency, args.duration, args.warmup, args.request_timeout
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if stub is not None:
+            stub.shutdown()
+
+    summary = summarize(latencies, errors, seconds)
+    print()
+    print_summary(summary)
+
+    result = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "works": args.works if args.url is None else None,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": args.mix,
+            "repeat_ratio": args.repeat_ratio,
+            "include_web": not args.no_web,
+            "exa_latency_ms": args.exa_latency_ms,
+            "exa_failure_rate": args.exa_failure_rate,
+        },
+        "summary": summary,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["params"] != result["params"]:
+        print("Warning: baseline was recorded with different parameters")
+    regressions = compare(summary, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    target = parser.add_argument_group("target")
+    target.add_argument("--url", default=None, help="Test a running backend instead")
+    target.add_argument("--port", type=int, default=18800, help="Port for the started backend")
+    target.add_argument(
+        "--backend-env",
+        nargs="*",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Extra backend settings, e.g. VECTOR_BACKEND=memmap",
+    )
+    target.add_argument("--ready-timeout", type=float, default=120.0, help="Seconds to warm up")
+
+    fixture = parser.add_argument_group("fixture")
+    fixture.add_argument("--fixture-dir", type=Path, default=FIXTURE_DIR, help="Fixture directory")
+    fixture.add_argument("--works", type=int, default=200, help="Synthetic works")
+    fixture.add_argument("--work-chars", type=int, default=20000, help="Mean characters per work")
+    fixture.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Embedding dimension")
+    fixture.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    stubs = parser.add_argument_group("stub APIs")
+    stubs.add_argument("--exa-latency-ms", type=float, default=150.0, help="Mean Exa latency")
+    stubs.add_argument("--exa-failure-rate", type=float, default=0.02, help="Failing Exa calls")
+    stubs.add_argument("--exa-timeout-rate", type=float, default=0.0, help="Hanging Exa calls")
+    stubs.add_argument("--embedding-latency-ms", type=float, default=20.0, help="Embedding latency")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    load.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    load.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds first")
+    load.add_argument(
+        "--mix", type=parse_mix, default="search=6,works=2,text=2", help="Endpoint weights"
+    )
+    load.add_argument(
+        "--repeat-ratio", type=float, default=0.3, help="Searches drawn from a hot query set"
+    )
+    load.add_argument("--no-web", action="store_true", help="Search with include_web=false")
+    load.add_argument("--request-timeout", type=float, default=30.0, help="Client timeout")
+
+    report = parser.add_argument_group("report")
+    report.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON")
+    report.add_argument("--save-baseline", action="store_true", help="Record this run as baseline")
+    report.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed p95/p99/throughput change"
+    )
+    report.add_argument("--output", type=Path, default=None, help="Also write results here")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Exa search and OpenAI embedding APIs.
+
+Serves POST /search in Exa's response format and POST /embeddings in
+OpenAI's, so the backend can run offline under load tests. Exa latency
+and failure rates are configurable; embeddings are deterministic hashed
+character bigrams, so queries land near chunks that share their words.
+
+Usage:
+    python stub_services.py [--port 18900] [--exa-latency-ms 150] [--exa-failure-rate 0.02]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+EMBEDDING_DIM = 256
+
+
+def stub_embedding(text: str, dim: int = EMBEDDING_DIM) -> list[float]:
+    """Embed text as a unit vector of signed, hashed character bigrams."""
+    vector = np.zeros(dim, dtype=np.float32)
+    for i in range(max(len(text) - 1, 1)):
+        digest = hashlib.blake2b(text[i : i + 2].encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        vector[value % dim] += 1.0 if value & (1 << 63) else -1.0
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).tolist()
+
+
+class StubConfig:
+    """Latency and failure settings shared by the request handlers."""
+
+    def __init__(
+        self,
+        exa_latency_ms: float = 150.0,
+        exa_jitter_ms: float = 50.0,
+        exa_failure_rate: float = 0.0,
+        exa_timeout_rate: float = 0.0,
+        embedding_latency_ms: float = 20.0,
+        dim: int = EMBEDDING_DIM,
+        seed: Optional[int] = None,
+    ):
+        self.exa_latency_ms = exa_latency_ms
+        self.exa_jitter_ms = exa_jitter_ms
+        self.exa_failure_rate = exa_failure_rate
+        self.exa_timeout_rate = exa_timeout_rate
+        self.embedding_latency_ms = embedding_latency_ms
+        self.dim = dim
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"search": 0, "search_failed": 0, "search_stalled": 0, "embeddings": 0}
+
+    def draw(self) -> tuple[float, float]:
+        """Draw a uniform sample and an Exa latency in seconds."""
+        with self.lock:
+            jitter = self.rng.uniform(-self.exa_jitter_ms, self.exa_jitter_ms)
+            return self.rng.random(), max(0.0, self.exa_latency_ms + jitter) / 1000
+
+
+def make_handler(config: StubConfig) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to config."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            path = self.path.rstrip("/")
+            if path.endswith("/search"):
+                self._search(body)
+            elif path.endswith("/embeddings"):
+                self._embeddings(body)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def _search(self, body: dict) -> None:
+            sample, latency = config.draw()
+            if sample < config.exa_timeout_rate:
+                # Hold the request well past any client deadline
+                self._count("search_stalled")
+                time.sleep(latency + 30)
+            else:
+                time.sleep(latency)
+            if sample < config.exa_timeout_rate + config.exa_failure_rate:
+                self._count("search_failed")
+                self._send(503, {"error": "stub failure"})
+                return
+            self._count("search")
+            query = body.get("query", "")
+            results = [
+                {
+                    "url": f"https://example.com/{hashlib.md5(f'{query}{i}'.encode()).hexdigest()}",
+                    "title": f"{query} - 参考 {i + 1}",
+                    "text": f"{query}についての解説です。" * 20,
+                }
+                for i in range(int(body.get("numResults", 3)))
+            ]
+            self._send(200, {"results": results})
+
+        def _embeddings(self, body: dict) -> None:
+            time.sleep(config.embedding_latency_ms / 1000)
+            self._count("embeddings")
+            texts = body.get("input", [])
+            texts = [texts] if isinstance(texts, str) else texts
+            data = [
+                {"object": "embedding", "index": i, "embedding": stub_embedding(t, config.dim)}
+                for i, t in enumerate(texts)
+            ]
+            self._send(200, {"object": "list", "data": data, "model": body.get("model")})
+
+        def _count(self, name: str) -> None:
+            with config.lock:
+                config.counts[name] += 1
+
+        def _send(self, status: int, payload: dict) -> None:
+            data = json.dumps(payload, ensure_ascii=False).encode()
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client gave up (e.g. its timeout fired)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(config: StubConfig, port: int = 0) -> ThreadingHTTPServer:
+    """Serve the stubs on 127.0.0.1 in a background thread; port 0 picks a free one."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-services", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=18900, help="Port to listen on")
+    parser.add_argument("--exa-latency-ms", type=float, default=150.0, help="Mean Exa latency")
+    parser.add_argument("--exa-jitter-ms", type=float, default=50.0, help="Exa latency +/- jitter")
+    parser.add_argument(
+        "--exa-failure-rate", type=float, default=0.0, help="Fraction of Exa calls that fail"
+    )
+    parser.add_argument(
+        "--exa-timeout-rate", type=float, default=0.0, help="Fraction of Exa calls that hang"
+    )
+    parser.add_argument(
+        "--embedding-latency-ms", type=float, default=20.0, help="Embedding call latency"
+    )
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Embedding dimension")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        exa_latency_ms=args.exa_latency_ms,
+        exa_jitter_ms=args.exa_jitter_ms,
+        exa_failure_rate=args.exa_failure_rate,
+        exa_timeout_rate=args.exa_timeout_rate,
+        embedding_latency_ms=args.embedding_latency_ms,
+        dim=args.dim,
+    )
+    server = start_stub_server(config, args.port)
+    print(f"Stub Exa and embedding APIs on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()